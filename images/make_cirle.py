@@ -1,21 +1,110 @@
+"""
+Crop profile photos to a circle.
+
+Usage:
+    python make_cirle.py                              # profile_light.jpg -> circle_profile.jpg
+    python make_cirle.py photo.jpg -o out.jpg
+    python make_cirle.py "photos/*.jpg" -o cropped/   # batch (directory or glob)
+    python make_cirle.py photos/ -o cropped/ --alpha  # transparent PNG instead of white fill
+"""
+
+import argparse
+import os
+from functools import lru_cache
+from glob import glob
+
 import numpy as np
 import matplotlib.pyplot as plt
-from tqdm import tqdm
 
-img = plt.imread("profile_light.jpg").copy()
-if img.dtype == np.uint8:
-    img = img/255.0
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+CENTER_Y_SHIFT = -20   # move the circle up a bit (pixels)
+RADIUS_FACTOR = 0.9    # radius as a fraction of half the image width
+
+
+@lru_cache(maxsize=16)
+def circle_mask(h, w, center, rad, antialias=False):
+    """Coverage mask in [0, 1] for a circle, cached by (h, w, center, rad)."""
+    yy, xx = np.ogrid[:h, :w]
+    dist2 = (yy - center[0]) ** 2 + (xx - center[1]) ** 2
+    if antialias:
+        # 1px linear ramp across the edge
+        mask = np.clip(rad + 0.5 - np.sqrt(dist2), 0.0, 1.0).astype(np.float32)
+    else:
+        mask = (dist2 <= rad * rad).astype(np.float32)
+    mask.setflags(write=False)
+    return mask
+
+
+def default_circle(h, w):
+    """Center and radius used for the profile picture."""
+    center = (h // 2 + CENTER_Y_SHIFT, w // 2)
+    rad = int(RADIUS_FACTOR * center[1])
+    return center, rad
+
+
+def crop_circle(img, center=None, rad=None, antialias=False, alpha=False):
+    """Crop img to a circle; outside is white, or transparent when alpha=True."""
+    if img.dtype == np.uint8:
+        img = img / 255.0
+    img = img[:, :, :3]
+    h, w = img.shape[:2]
+    if center is None or rad is None:
+        center, rad = default_circle(h, w)
+    mask = circle_mask(h, w, tuple(center), rad, antialias)[:, :, None]
+
+    if alpha:
+        out = np.concatenate([img, mask], axis=2)
+    else:
+        out = img * mask + (1.0 - mask)
+
+    y0, x0 = max(center[0] - rad, 0), max(center[1] - rad, 0)
+    return out[y0:center[0] + rad, x0:center[1] + rad, :]
+
+
+def collect_inputs(src):
+    """Expand a file, directory or glob pattern into a list of image paths."""
+    if os.path.isdir(src):
+        paths = [os.path.join(src, f) for f in os.listdir(src)]
+    else:
+        paths = glob(src)
+    return sorted(p for p in paths if p.lower().endswith(IMAGE_EXTS))
+
+
+def output_path(path, out, batch, alpha):
+    """Where to write the crop of path."""
+    name, ext = os.path.splitext(os.path.basename(path))
+    if alpha:
+        ext = ".png"  # jpg has no alpha channel
+    if not batch and not out.endswith(os.sep) and not os.path.isdir(out):
+        return out if not alpha else os.path.splitext(out)[0] + ".png"
+    return os.path.join(out, f"circle_{name}{ext}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crop images to a circle.")
+    parser.add_argument("src", nargs="?", default="profile_light.jpg",
+                        help="image file, directory or glob pattern")
+    parser.add_argument("-o", "--out", default="circle_profile.jpg",
+                        help="output file (single image) or directory (batch)")
+    parser.add_argument("--antialias", action="store_true", help="smooth the circle edge")
+    parser.add_argument("--alpha", action="store_true", help="write transparent PNG instead of white fill")
+    args = parser.parse_args()
+
+    paths = collect_inputs(args.src)
+    if not paths:
+        print(f"No images found for: {args.src}")
+        return
+    batch = len(paths) > 1 or os.path.isdir(args.src) or any(c in args.src for c in "*?[")
+    if batch:
+        os.makedirs(args.out, exist_ok=True)
 
-h,w,c = img.shape
-center = np.array([h//2 - 20, w//2])
-rad = int(0.9 * center[1])
+    for path in paths:
+        img = plt.imread(path)
+        out = crop_circle(img, antialias=args.antialias, alpha=args.alpha)
+        dst = output_path(path, args.out, batch, args.alpha)
+        plt.imsave(dst, np.clip(out, 0.0, 1.0))
+        print(f"{path} -> {dst}")
 
-for i in tqdm(range(h)):
-    for j in range(w):
-        cur_pos = np.array([i,j])
-        dis = cur_pos - center
-        if np.dot(dis, dis) > rad * rad:
-            img[i,j,:] = 1.0
 
-img = img[center[0]-rad:center[0]+rad,center[1]-rad:center[1]+rad,:]
-plt.imsave("circle_profile.jpg", img)
+if __name__ == "__main__":
+    main()
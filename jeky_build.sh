@@ -1,3 +1,5 @@
 cd template_website
+python3 _make_responsive.py
 jekyll build --incremental
-cp -r _site/* ../
+cd ..
+python3 site_sync.py
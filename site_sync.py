@@ -0,0 +1,175 @@
+"""
+Sync the generated Jekyll site into the published tree, incrementally.
+
+Replaces `cp -r _site/* ../` in jeky_build.sh: every file's SHA-256 is
+compared (hashes are cached in a manifest by size + mtime, so unchanged files
+are not even re-read) and only new or changed files are copied; identical
+files are left alone. Files are never deleted, as with cp.
+
+The published files stay independent copies of _site by default: a hardlink
+would share the inode, so Jekyll rewriting _site in place would change the
+published tree before any sync ran. --link opts into hardlinking files whose
+content already matches, to save disk on trees that are only written by this
+script. Files that an earlier run left hardlinked are copied apart again.
+
+Usage:
+    python3 site_sync.py                                  # template_website/_site -> repo root
+    python3 site_sync.py --dry-run
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SRC = os.path.join(ROOT, "template_website", "_site")
+DEFAULT_DST = ROOT
+DEFAULT_MANIFEST = os.path.join(ROOT, "template_website", ".site_sync_manifest.json")
+CHUNK = 1 << 20
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class HashCache:
+    """SHA-256 per path, reused while the file's size and mtime are unchanged."""
+
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self.hashed_bytes = 0
+
+    def get(self, path):
+        st = os.stat(path)
+        entry = self.entries.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            return entry["sha256"]
+        digest = file_sha256(path)
+        self.hashed_bytes += st.st_size
+        self.entries[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def alias(self, path, source):
+        """path now has source's content (copy2 or hardlink): reuse its hash."""
+        if source in self.entries:
+            self.entries[path] = dict(self.entries[source])
+        else:
+            self.entries.pop(path, None)
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("files", {})
+
+
+def save_manifest(path, entries):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"files": entries}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def walk_files(root):
+    """Relative paths of all files under root."""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def replace_with_link(src, dst):
+    """Atomically make dst a hardlink of src. Returns False if linking is not possible."""
+    tmp = dst + ".sync-link"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, dst)
+    return True
+
+
+def copy_file(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".sync-tmp"
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+
+
+def sync_tree(src_root, dst_root, cache, link=False, dry_run=False):
+    """
+    Bring dst_root up to date with src_root. New and changed files are copied
+    (copy2); identical files are skipped, or with link=True replaced by
+    hardlinks to the source. A destination that is already a hardlink of the
+    source is copied apart unless link=True. Returns counters: copied/linked/
+    skipped files and bytes.
+    """
+    stats = {"copied": 0, "copied_bytes": 0, "linked": 0, "linked_bytes": 0,
+             "skipped": 0, "skipped_bytes": 0}
+    for rel in sorted(walk_files(src_root)):
+        src = os.path.join(src_root, rel)
+        dst = os.path.join(dst_root, rel)
+        size = os.path.getsize(src)
+        exists = os.path.exists(dst)
+        shared = exists and os.path.samefile(src, dst)
+        identical = shared or (exists and os.path.getsize(dst) == size and cache.get(dst) == cache.get(src))
+
+        if identical and (link or not shared):
+            if link and not shared and (dry_run or replace_with_link(src, dst)):
+                kind = "linked"
+            else:
+                kind = "skipped"
+        else:
+            if not dry_run:
+                copy_file(src, dst)
+            kind = "copied"
+            print(f"  copy {rel}{' (was a hardlink of the source)' if shared else ''}")
+        if not dry_run and kind != "skipped":
+            cache.alias(dst, src)
+        stats[kind] += 1
+        stats[f"{kind}_bytes"] += size
+    return stats
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{n} B"
+        n /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally sync the Jekyll _site into the published tree.")
+    parser.add_argument("src", nargs="?", default=DEFAULT_SRC, help="generated site (default: template_website/_site)")
+    parser.add_argument("dst", nargs="?", default=DEFAULT_DST, help="published tree (default: repo root)")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="hash cache file")
+    parser.add_argument("--link", action="store_true",
+                        help="hardlink files whose content already matches (shares inodes with src)")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args()
+
+    src = os.path.abspath(args.src)
+    dst = os.path.abspath(args.dst)
+    cache = HashCache(load_manifest(args.manifest))
+
+    stats = sync_tree(src, dst, cache, link=args.link, dry_run=args.dry_run)
+    print(f"Synced {os.path.relpath(src)} -> {os.path.relpath(dst) or '.'}"
+          f"{' (dry run)' if args.dry_run else ''}:")
+    print(f"  copied  {stats['copied']:4d} files  {format_bytes(stats['copied_bytes'])}")
+    if args.link:
+        print(f"  linked  {stats['linked']:4d} files  {format_bytes(stats['linked_bytes'])} (shared with src, not copied)")
+    print(f"  skipped {stats['skipped']:4d} files  {format_bytes(stats['skipped_bytes'])}")
+
+    print(f"  hashed {format_bytes(cache.hashed_bytes)} (the rest came from the manifest)")
+    if not args.dry_run:
+        save_manifest(args.manifest, cache.entries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Responsive derivatives for the site's images/ directory.
+
+For every PNG/JPEG/GIF in images/, writes downscaled copies at several widths
+to images/responsive/ (WebP, optimized PNG, and AVIF when Pillow supports
+it), plus animated WebP and MP4 versions of GIFs. Images are processed in
+parallel and skipped while their SHA-256 and the settings are unchanged.
+The manifest _data/responsive_images.json is what the layouts read (via
+_includes/responsive_image.html) to emit srcset.
+
+Usage (from template_website/, before `jekyll build`):
+    python3 _make_responsive.py
+    python3 _make_responsive.py --widths 320 640 --formats webp --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageSequence, features
+
+SITE_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGE_DIR = "images"
+OUTPUT_DIR = os.path.join(IMAGE_DIR, "responsive")
+MANIFEST = os.path.join(SITE_DIR, "_data", "responsive_images.json")
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif")
+
+WIDTHS = (320, 640, 1280)
+FORMATS = ("webp", "png") + (("avif",) if features.check("avif") else ())
+QUALITY = {"webp": 80, "avif": 60, "jpeg": 85}
+MP4_CRF = 23
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def settings_key(widths, formats):
+    """Changing any output setting invalidates every cached entry."""
+    return json.dumps({"widths": list(widths), "formats": list(formats),
+                       "quality": QUALITY, "mp4_crf": MP4_CRF}, sort_keys=True)
+
+
+def target_widths(width, widths):
+    """
+    Requested widths smaller than the original. Originals no wider than the
+    largest requested width also get a full-size WebP/AVIF; wider originals are
+    only served as-is by the PNG/JPEG fallback.
+    """
+    return [w for w in widths if w < width]
+
+
+def save_still(im, path, fmt):
+    if fmt == "png":
+        im.save(path, optimize=True)
+    elif fmt == "jpeg":
+        im.convert("RGB").save(path, quality=QUALITY["jpeg"], optimize=True, progressive=True)
+    else:
+        im.save(path, quality=QUALITY[fmt])
+
+
+def resized(im, width):
+    height = max(1, round(im.height * width / im.width))
+    return im.resize((width, height), Image.LANCZOS)
+
+
+def gif_frames(im):
+    """All frames of an animated image as RGBA, with their durations (ms)."""
+    frames, durations = [], []
+    for frame in ImageSequence.Iterator(im):
+        frames.append(frame.convert("RGBA"))
+        durations.append(frame.info.get("duration", im.info.get("duration", 100)))
+    return frames, durations
+
+
+def save_animated_webp(frames, durations, path):
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations,
+                   loop=0, quality=QUALITY["webp"])
+
+
+def gif_to_mp4(src, dst):
+    """H.264 MP4 of a GIF (even dimensions, faststart). Returns False without ffmpeg."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return False
+    cmd = [ffmpeg, "-v", "error", "-i", src, "-movflags", "+faststart", "-pix_fmt", "yuv420p",
+           "-vf", "scale=trunc(iw/2)*2:trunc(ih/2)*2", "-c:v", "libx264", "-crf", str(MP4_CRF),
+           "-an", "-y", dst]
+    return subprocess.run(cmd, capture_output=True).returncode == 0
+
+
+def process_image(rel, sha256, widths, formats):
+    """Write every derivative of one image; runs in a worker process. Returns its manifest entry."""
+    src = os.path.join(SITE_DIR, rel)
+    stem = os.path.splitext(os.path.basename(rel))[0]
+    out_dir = os.path.join(SITE_DIR, OUTPUT_DIR)
+
+    def out(name):
+        return os.path.join(OUTPUT_DIR, name), os.path.join(out_dir, name)
+
+    with Image.open(src) as im:
+        entry = {"sha256": sha256, "width": im.width, "height": im.height, "srcset": {}}
+        animated = getattr(im, "is_animated", False)
+        if animated:
+            frames, durations = gif_frames(im)
+            entry["animated"] = {}
+            for width in target_widths(im.width, widths) + ([im.width] if im.width <= max(widths) else []):
+                name, path = out(f"{stem}-{width}w.webp")
+                scaled = frames if width == im.width else [resized(f, width) for f in frames]
+                save_animated_webp(scaled, durations, path)
+                entry["srcset"].setdefault("webp", []).append({"src": name, "width": width})
+            name, path = out(f"{stem}.mp4")
+            if gif_to_mp4(src, path):
+                entry["animated"]["mp4"] = name
+        else:
+            base = im.convert("RGBA" if im.mode in ("P", "LA", "RGBA") or "transparency" in im.info else "RGB")
+            scaled_widths = target_widths(im.width, widths)
+            for width in scaled_widths + ([im.width] if im.width <= max(widths) else []):
+                scaled = base if width == im.width else resized(base, width)
+                for fmt in formats:
+                    # The original itself is the full-size PNG/JPEG candidate
+                    if width == im.width and fmt in ("png", "jpeg"):
+                        continue
+                    ext = "jpg" if fmt == "jpeg" else fmt
+                    name, path = out(f"{stem}-{width}w.{ext}")
+                    save_still(scaled, path, fmt)
+                    entry["srcset"].setdefault(fmt, []).append({"src": name, "width": width})
+
+    entry["bytes"] = {"original": os.path.getsize(src)}
+    for fmt, items in entry["srcset"].items():
+        entry["bytes"][fmt] = {item["width"]: os.path.getsize(os.path.join(SITE_DIR, item["src"]))
+                               for item in items}
+    return rel, entry
+
+
+def outputs_exist(entry):
+    names = [item["src"] for items in entry.get("srcset", {}).values() for item in items]
+    names += list(entry.get("animated", {}).values())
+    return all(os.path.exists(os.path.join(SITE_DIR, n)) for n in names)
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST):
+        return {}
+    with open(MANIFEST) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST), exist_ok=True)
+    tmp = MANIFEST + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, MANIFEST)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate responsive image derivatives and their manifest.")
+    parser.add_argument("--widths", nargs="+", type=int, default=list(WIDTHS))
+    parser.add_argument("--formats", nargs="+", choices=["webp", "avif", "png", "jpeg"], default=list(FORMATS))
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="regenerate even if the source is unchanged")
+    args = parser.parse_args()
+
+    if "avif" in args.formats and not features.check("avif"):
+        parser.error("this Pillow build has no AVIF support")
+    os.makedirs(os.path.join(SITE_DIR, OUTPUT_DIR), exist_ok=True)
+    manifest = load_manifest()
+    settings = settings_key(args.widths, args.formats)
+    images = manifest.get("images", {}) if manifest.get("settings") == settings else {}
+
+    sources = sorted(os.path.join(IMAGE_DIR, f) for f in os.listdir(os.path.join(SITE_DIR, IMAGE_DIR))
+                     if f.lower().endswith(IMAGE_EXTS))
+    todo = []
+    for rel in sources:
+        sha256 = file_sha256(os.path.join(SITE_DIR, rel))
+        cached = images.get(rel)
+        if not args.force and cached and cached["sha256"] == sha256 and outputs_exist(cached):
+            continue
+        todo.append((rel, sha256))
+    print(f"{len(sources)} images, {len(sources) - len(todo)} up to date, generating {len(todo)}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(process_image, rel, sha256, args.widths, args.formats) for rel, sha256 in todo]
+        for future in futures:
+            rel, entry = future.result()
+            images[rel] = entry
+            smallest = min((b for sizes in entry["bytes"].values() if isinstance(sizes, dict)
+                            for b in sizes.values()), default=entry["bytes"]["original"])
+            print(f"  {rel}: {entry['bytes']['original'] / 1024:.0f} KB -> "
+                  f"{smallest / 1024:.0f} KB smallest variant")
+
+    # Drop entries for images that were removed
+    images = {rel: entry for rel, entry in images.items() if rel in sources}
+    save_manifest({"settings": settings, "images": images})
+    print(f"Manifest: {os.path.relpath(MANIFEST, SITE_DIR)}")
+
+
+if __name__ == "__main__":
+    main()
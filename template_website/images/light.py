@@ -1,7 +1,147 @@
+"""
+Brighten / tone photos with a precomputed 8-bit lookup table.
+
+Gain, gamma and an optional tone curve are folded into one 256-entry uint8
+LUT, applied with a single np.take per image (no float copy of the image).
+Directories are processed in a process pool; outputs newer than their input
+are skipped.
+
+Usage:
+    python light.py                                  # profile.jpg -> profile_light.jpg (gain 1.25)
+    python light.py photo.jpg -o photo_bright.jpg --gain 1.1 --gamma 1.2
+    python light.py photos/ -o toned/ --curve 0:0,64:56,192:208,255:255
+    python light.py "photos/*.png" --workers 8 --force
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from glob import glob
+
 import numpy as np
-import matplotlib.pyplot as plt
+from PIL import Image
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+DEFAULT_GAIN = 1.25
+OUTPUT_SUFFIX = "_light"   # photo.jpg -> photo_light.jpg when no output is given
+JPEG_QUALITY = 95
+
+
+def parse_curve(text):
+    """ "x:y,x:y,..." control points in 0..255 -> (xs, ys) for a piecewise-linear curve."""
+    points = sorted(tuple(float(v) for v in p.split(":")) for p in text.split(","))
+    xs, ys = zip(*points)
+    return np.array(xs) / 255.0, np.array(ys) / 255.0
+
+
+def tone_lut(gain=1.0, gamma=1.0, curve=None):
+    """
+    uint8 LUT for: multiply by gain and clip (as the original light.py did),
+    then gamma (>1 brightens midtones), then the optional (xs, ys) tone curve.
+    """
+    x = np.arange(256) / 255.0
+    y = np.clip(x * gain, 0.0, 1.0) ** (1.0 / gamma)
+    if curve is not None:
+        y = np.interp(y, *curve)
+    return np.round(np.clip(y, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+
+def apply_lut(img, lut):
+    """Map the color channels of a uint8 image through lut; alpha is left as is."""
+    if img.ndim == 3 and img.shape[2] == 4:
+        out = img.copy()
+        np.take(lut, img[:, :, :3], out=out[:, :, :3], mode="wrap")
+        return out
+    return np.take(lut, img, mode="wrap")
+
+
+def load_uint8(path):
+    """Image as a uint8 array (L, RGB or RGBA); other modes are converted to RGB(A)."""
+    with Image.open(path) as im:
+        if im.mode not in ("L", "RGB", "RGBA"):
+            im = im.convert("RGBA" if "A" in im.getbands() or "transparency" in im.info else "RGB")
+        return np.asarray(im)
+
+
+def collect_inputs(src):
+    """Expand a file, directory or glob pattern into a list of image paths."""
+    if os.path.isdir(src):
+        paths = [os.path.join(src, f) for f in os.listdir(src)]
+    else:
+        paths = glob(src)
+    return sorted(p for p in paths if p.lower().endswith(IMAGE_EXTS))
+
+
+def output_path(path, out, batch):
+    """Where to write the toned copy of path."""
+    name, ext = os.path.splitext(os.path.basename(path))
+    if out is None:
+        return os.path.join(os.path.dirname(path), f"{name}{OUTPUT_SUFFIX}{ext}")
+    if not batch and not out.endswith(os.sep) and not os.path.isdir(out):
+        return out
+    return os.path.join(out, os.path.basename(path))
+
+
+def is_up_to_date(src, dst):
+    return os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+
+
+def tone_file(src, dst, lut):
+    """Tone one image; runs in a worker process."""
+    out = apply_lut(load_uint8(src), lut)
+    im = Image.fromarray(out)
+    if dst.lower().endswith((".jpg", ".jpeg")):
+        im.convert("RGB").save(dst, quality=JPEG_QUALITY)
+    else:
+        im.save(dst)
+    return dst
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Brighten/tone images with an 8-bit LUT.")
+    parser.add_argument("src", nargs="?", default="profile.jpg",
+                        help="image file, directory or glob pattern")
+    parser.add_argument("-o", "--out", default=None,
+                        help=f"output file (single image) or directory (batch); "
+                             f"default: <name>{OUTPUT_SUFFIX}.<ext> next to the input")
+    parser.add_argument("--gain", type=float, default=DEFAULT_GAIN, help="brightness multiplier")
+    parser.add_argument("--gamma", type=float, default=1.0, help=">1 lifts midtones, <1 darkens them")
+    parser.add_argument("--curve", type=parse_curve, default=None,
+                        help="tone curve control points x:y in 0..255, e.g. 0:0,64:56,192:208,255:255")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="also redo outputs newer than their input")
+    args = parser.parse_args()
+
+    paths = collect_inputs(args.src)
+    # Don't tone our own outputs again when writing next to the inputs
+    if args.out is None:
+        paths = [p for p in paths if not os.path.splitext(p)[0].endswith(OUTPUT_SUFFIX)]
+    if not paths:
+        print(f"No images found for: {args.src}")
+        return
+    batch = len(paths) > 1 or os.path.isdir(args.src) or any(c in args.src for c in "*?[")
+    if batch and args.out is not None:
+        os.makedirs(args.out, exist_ok=True)
+
+    lut = tone_lut(args.gain, args.gamma, args.curve)
+    jobs = []
+    for path in paths:
+        dst = output_path(path, args.out, batch)
+        if not args.force and is_up_to_date(path, dst):
+            print(f"{path}: up to date")
+            continue
+        jobs.append((path, dst))
+    if not jobs:
+        return
+
+    if len(jobs) == 1:
+        print(f"{jobs[0][0]} -> {tone_file(*jobs[0], lut)}")
+        return
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [(src, pool.submit(tone_file, src, dst, lut)) for src, dst in jobs]
+        for src, future in futures:
+            print(f"{src} -> {future.result()}")
+
 
-img = plt.imread("profile.jpg")/255.0
-img = img * 1.25
-img = np.clip(img, 0.0 ,1.0)
-plt.imsave("profile_light.jpg", img)
+if __name__ == "__main__":
+    main()
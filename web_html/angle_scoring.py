@@ -0,0 +1,69 @@
+"""
+Score candidate turntable start angles (pure NumPy, no bpy).
+
+Two cheap signals for "which azimuth shows the front of the scene":
+- silhouette: fraction of the frame covered by the model's alpha mask in a
+  low-quality render from that azimuth;
+- bbox: area of the scene's points projected onto the image plane of a camera
+  at that azimuth (no rendering at all).
+Higher is better for both; angles use the preview_angles.py convention.
+"""
+
+import numpy as np
+
+SCORING_METHODS = ("silhouette", "bbox")
+
+
+def silhouette_scores(tiles, threshold=127):
+    """Coverage fraction of each RGBA tile's alpha channel: [(angle, tile)] -> [score]."""
+    return [float(np.count_nonzero(tile[:, :, 3] > threshold)) / tile[:, :, 3].size
+            for _, tile in tiles]
+
+
+def view_axes(angles_deg, elevation_deg=15.0):
+    """Image-plane right/up unit vectors, shape (k, 3) each, for cameras orbiting +Z."""
+    a = np.radians(np.asarray(angles_deg, dtype=np.float64))
+    e = np.radians(elevation_deg)
+    right = np.stack([-np.sin(a), np.cos(a), np.zeros_like(a)], axis=1)
+    up = np.stack([-np.cos(a) * np.sin(e), -np.sin(a) * np.sin(e), np.full_like(a, np.cos(e))], axis=1)
+    return right, up
+
+
+def hull_area(u, v):
+    """Area of the 2D convex hull of points (u, v) (monotone chain + shoelace)."""
+    pts = np.unique(np.stack([u, v], axis=1), axis=0)  # sorted by u, then v
+    if len(pts) < 3:
+        return 0.0
+
+    def half(points):
+        chain = []
+        for p in points:
+            while len(chain) >= 2:
+                (ox, oy), (ax, ay) = chain[-2], chain[-1]
+                if (ax - ox) * (p[1] - oy) - (ay - oy) * (p[0] - ox) > 0:
+                    break
+                chain.pop()
+            chain.append(tuple(p))
+        return chain[:-1]
+
+    hull = np.array(half(pts) + half(pts[::-1]))
+    x, y = hull[:, 0], hull[:, 1]
+    return 0.5 * abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def projected_bbox_scores(points, angles_deg, elevation_deg=15.0):
+    """
+    Projected area of the scene's bounding geometry as seen from each azimuth.
+    points: (n, 3) box corners (e.g. 8 per object); the score is the area of the
+    convex hull of their projection onto each camera's image plane.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    right, up = view_axes(angles_deg, elevation_deg)
+    u = points @ right.T  # (n, k)
+    v = points @ up.T
+    return [hull_area(u[:, i], v[:, i]) for i in range(u.shape[1])]
+
+
+def rank_angles(angles, scores):
+    """[(angle, score)] best first; ties keep the smaller angle."""
+    return sorted(zip(angles, scores), key=lambda item: (-item[1], item[0]))
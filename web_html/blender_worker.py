@@ -0,0 +1,384 @@
+"""
+Long-lived headless Blender that takes preview/render jobs over a local socket.
+
+Starting Blender and factory-resetting it costs seconds per invocation; this
+worker pays that once and only clears the scene between jobs. Jobs are
+newline-delimited JSON over TCP on 127.0.0.1:
+
+    -> {"id": 1, "type": "preview", "params": {"glb": "video2/model.glb"}}
+    <- {"id": 1, "ok": true, "result": {...}, "elapsed": 4.2, "reset_s": 0.01}
+
+Job types: ping, preview, render (scene_render_bpyrenderer.py), scene
+(scene_render.py), shutdown. A stub worker (no bpy) speaks the same protocol
+so clients and the protocol can be tested without Blender (tests/test_blender_worker.py).
+
+The worker reports its own startup time (process start to ready, which
+includes Blender's launch and the factory reset) in the ping result; clients
+count that as the cold start each job saves.
+
+Usage:
+    # start the worker (Blender) or a stub (plain Python)
+    blender --background --python blender_worker.py -- --port 8765 serve
+    python blender_worker.py --port 8765 serve --stub
+
+    # submit jobs
+    python blender_worker.py preview video2/model.glb
+    python blender_worker.py render video2 model.glb --param num_frames=60
+    python blender_worker.py scene video1/SceneGen-latest.glb --output video1/scenegen.mp4
+    python blender_worker.py shutdown
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+# -------- CONFIG ----------
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# --------------------------
+
+# Render-script settings a render job may override (param name -> module constant)
+RENDER_OVERRIDES = {
+    "width": "WIDTH",
+    "height": "HEIGHT",
+    "num_frames": "NUM_FRAMES",
+    "elevation": "ELEVATION",
+    "fps": "FPS",
+    "camera_radius": "CAMERA_RADIUS",
+    "camera_path": "CAMERA_PATH",
+}
+# Same for scene_render.py turntables (scene jobs)
+SCENE_OVERRIDES = {
+    "frame_count": "FRAME_COUNT",
+    "fps": "FPS",
+    "start_angle": "START_ANGLE",
+    "camera_path": "CAMERA_PATH",
+    "quality": "QUALITY",
+}
+
+
+# -------- protocol ----------
+def send_message(sock_file, message):
+    sock_file.write((json.dumps(message) + "\n").encode())
+    sock_file.flush()
+
+
+def read_message(sock_file):
+    """Read one JSON message, or None when the peer closed the connection."""
+    line = sock_file.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class WorkerClient:
+    """Submit jobs to a running worker and track how much startup time it saved."""
+
+    def __init__(self, host=HOST, port=DEFAULT_PORT, timeout=None, cold_start_s=None):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile("rwb")
+        self.next_id = 1
+        self.info = self.submit("ping")["result"]
+        # Cost a fresh Blender would pay per job: process startup including the
+        # factory reset, as measured by launch_worker (cold_start_s) or reported
+        # by the worker itself; the factory reset alone if neither is known
+        if cold_start_s is None:
+            cold_start_s = self.info.get("startup_s")
+        if cold_start_s is None:
+            cold_start_s = self.info.get("factory_reset_s", 0.0)
+        self.cold_start_s = cold_start_s
+
+    def submit(self, job_type, **params):
+        """Send one job and wait for its response."""
+        job_id = self.next_id
+        self.next_id += 1
+        send_message(self.file, {"id": job_id, "type": job_type, "params": params})
+        response = read_message(self.file)
+        if response is None:
+            raise ConnectionError("Worker closed the connection")
+        if response.get("id") != job_id:
+            raise RuntimeError(f"Out-of-order response: expected id {job_id}, got {response.get('id')}")
+        return response
+
+    def saved_seconds(self, response):
+        """Estimated latency saved versus launching a fresh Blender for this job."""
+        return max(0.0, self.cold_start_s - response.get("reset_s", 0.0))
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def wait_for_worker(host=HOST, port=DEFAULT_PORT, timeout=60.0):
+    """Block until a worker accepts connections; returns seconds waited."""
+    start = time.time()
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1.0).close()
+            return time.time() - start
+        except OSError:
+            if time.time() - start > timeout:
+                raise TimeoutError(f"No worker on {host}:{port} after {timeout:.0f}s")
+            time.sleep(0.2)
+
+
+def process_age_s():
+    """Seconds since this process was created (Linux /proc), or None elsewhere."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime, clock ticks after boot); comm may contain spaces
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+def launch_worker(worker_cmd, port=DEFAULT_PORT, timeout=120.0):
+    """
+    Start a worker process (e.g. blender_worker_cmd(port) or a stub) and wait until
+    it is ready. Returns (process, startup seconds): the cold start each job saves;
+    pass it to WorkerClient(cold_start_s=...).
+    """
+    import subprocess
+    start = time.time()
+    proc = subprocess.Popen(worker_cmd, cwd=SCRIPT_DIR)
+    wait_for_worker(port=port, timeout=timeout)
+    return proc, time.time() - start
+
+
+def blender_worker_cmd(port=DEFAULT_PORT, blender=None):
+    """Command line that runs this file as a headless Blender worker."""
+    from render_launcher import default_blender
+    return [blender or default_blender(), "--background", "--python", os.path.abspath(__file__),
+            "--", "--port", str(port), "serve"]
+
+
+# -------- server ----------
+class WorkerServer:
+    """Serve jobs one at a time on the calling (main) thread, as bpy requires."""
+
+    def __init__(self, handlers, reset=None, port=DEFAULT_PORT, info=None):
+        self.handlers = dict(handlers)
+        self.reset = reset
+        self.port = port
+        self.info = dict(info or {})
+        self.running = False
+        self.ready = threading.Event()
+
+    def handle(self, message):
+        """Run one job message and build its response."""
+        job_type = message.get("type")
+        response = {"id": message.get("id"), "type": job_type, "ok": False}
+        start = time.perf_counter()
+        try:
+            if job_type == "ping":
+                response["result"] = self.info
+            elif job_type == "shutdown":
+                self.running = False
+                response["result"] = {}
+            elif job_type in self.handlers:
+                reset_start = time.perf_counter()
+                if self.reset is not None:
+                    self.reset()
+                response["reset_s"] = round(time.perf_counter() - reset_start, 4)
+                response["result"] = self.handlers[job_type](**message.get("params", {}))
+            else:
+                raise ValueError(f"Unknown job type: {job_type}")
+            response["ok"] = True
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        response["elapsed"] = round(time.perf_counter() - start, 4)
+        return response
+
+    def serve_forever(self):
+        self.running = True
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind((HOST, self.port))
+            server.listen(1)
+            self.port = server.getsockname()[1]  # the actual port when bound to port 0
+            startup_s = process_age_s()
+            if startup_s is not None:
+                self.info.setdefault("startup_s", round(startup_s, 4))
+            self.ready.set()
+            print(f"Worker ready on {HOST}:{self.port} ({', '.join(sorted(self.handlers))})", flush=True)
+            while self.running:
+                conn, _ = server.accept()
+                with conn, conn.makefile("rwb") as f:
+                    while self.running:
+                        message = read_message(f)
+                        if message is None:
+                            break
+                        response = self.handle(message)
+                        print(f"  job {response['id']} {response['type']}: "
+                              f"{'ok' if response['ok'] else response.get('error')} "
+                              f"({response['elapsed']:.2f}s)", flush=True)
+                        send_message(f, response)
+
+
+def stub_handlers():
+    """Blender-free handlers with the same signatures, for protocol tests."""
+    def preview(glb, **_):
+        return {"grid": os.path.splitext(glb)[0] + "_grid.png"}
+
+    def render(folder, model, **overrides):
+        time.sleep(float(overrides.get("sleep", 0.0)))
+        return {"model": os.path.splitext(model)[0], "overrides": overrides}
+
+    def scene(glb, output=None, **overrides):
+        return {"video": output or os.path.splitext(glb)[0] + ".mp4", "overrides": overrides}
+
+    return {"preview": preview, "render": render, "scene": scene}
+
+
+def _run_with_overrides(module, mapping, overrides, func, *args, **kwargs):
+    """Call func with module constants temporarily replaced by overrides (names via mapping)."""
+    unknown = set(overrides) - set(mapping)
+    if unknown:
+        raise ValueError(f"Unknown params: {sorted(unknown)} (expected {sorted(mapping)})")
+    saved = {key: getattr(module, mapping[key]) for key in overrides}
+    try:
+        for key, value in overrides.items():
+            setattr(module, mapping[key], value)
+        return func(*args, **kwargs)
+    finally:
+        for key, value in saved.items():
+            setattr(module, mapping[key], value)
+
+
+def blender_handlers():
+    """Handlers running preview_angles / scene_render_bpyrenderer inside this Blender."""
+    import preview_angles
+
+    def preview(glb):
+        glb_path = glb if os.path.isabs(glb) else os.path.join(SCRIPT_DIR, glb)
+        video_folder = os.path.relpath(glb_path, SCRIPT_DIR).split(os.sep)[0]
+        # setup_scene's factory reset is replaced by the worker's scene reset
+        grid = preview_angles.create_preview_grid(glb_path, video_folder, factory_reset=False)
+        return {"grid": grid}
+
+    def render(folder, model, **overrides):
+        import scene_render_bpyrenderer as renderer
+        model_path = os.path.join(SCRIPT_DIR, folder, model)
+        output_dir = os.path.join(SCRIPT_DIR, folder, "bpyrenderer_output")
+        os.makedirs(output_dir, exist_ok=True)
+        config_file = os.path.join(SCRIPT_DIR, f"rotation_config_{folder}.json")
+        rotation_config = {}
+        if os.path.exists(config_file):
+            with open(config_file, "r") as f:
+                rotation_config = json.load(f)
+
+        model_name = _run_with_overrides(renderer, RENDER_OVERRIDES, overrides,
+                                         renderer.render_single_model, model_path, output_dir, rotation_config)
+        return {"model": model_name, "output_dir": output_dir}
+
+    def scene(glb, output=None, **overrides):
+        import scene_render
+        glb_path = glb if os.path.isabs(glb) else os.path.join(SCRIPT_DIR, glb)
+        output = output or os.path.splitext(glb_path)[0] + ".mp4"
+        output_path = output if os.path.isabs(output) else os.path.join(SCRIPT_DIR, output)
+        # The worker's scene reset replaces scene_render's factory reset
+        meta_path = _run_with_overrides(scene_render, SCENE_OVERRIDES, overrides,
+                                        scene_render.render_turntable, glb_path, output_path,
+                                        factory_reset=False)
+        return {"video": output_path, "meta": meta_path}
+
+    return {"preview": preview, "render": render, "scene": scene}
+
+
+def blender_reset():
+    import preview_angles
+    preview_angles.clear_scene_data()
+
+
+def serve(port, stub=False):
+    if stub:
+        WorkerServer(stub_handlers(), port=port, info={"stub": True}).serve_forever()
+        return
+    import bpy
+    start = time.perf_counter()
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    factory_reset_s = time.perf_counter() - start
+    info = {"stub": False, "factory_reset_s": round(factory_reset_s, 4)}
+    WorkerServer(blender_handlers(), reset=blender_reset, port=port, info=info).serve_forever()
+
+
+# -------- CLI ----------
+def parse_value(text):
+    """Parse a --param value as JSON when possible (numbers, lists), else keep the string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="blender_worker.py", description="Persistent Blender worker.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="run the worker")
+    p.add_argument("--stub", action="store_true", help="no Blender: stub handlers for protocol tests")
+    p = sub.add_parser("preview", help="render the angle preview grid for a GLB")
+    p.add_argument("glb")
+    p = sub.add_parser("render", help="render a turntable for one model")
+    p.add_argument("folder")
+    p.add_argument("model", help="GLB file name inside the folder")
+    p.add_argument("--param", action="append", default=[], metavar="NAME=VALUE",
+                   help=f"override a render setting ({', '.join(RENDER_OVERRIDES)})")
+    p = sub.add_parser("scene", help="render a scene_render.py turntable for a GLB")
+    p.add_argument("glb")
+    p.add_argument("--output", default=None, help="video path (default: <glb>.mp4)")
+    p.add_argument("--param", action="append", default=[], metavar="NAME=VALUE",
+                   help=f"override a setting ({', '.join(SCENE_OVERRIDES)})")
+    sub.add_parser("shutdown", help="stop the worker")
+    for name in ("preview", "render", "scene", "shutdown"):
+        sub.choices[name].add_argument("--cold-start", type=float, default=None,
+                       help="fresh-Blender startup seconds for the savings report "
+                            "(default: the startup time the worker measured)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.port, args.stub)
+        return
+
+    with WorkerClient(port=args.port, cold_start_s=getattr(args, "cold_start", None)) as client:
+        if args.command == "preview":
+            response = client.submit("preview", glb=args.glb)
+        elif args.command in ("render", "scene"):
+            params = {k: parse_value(v) for k, v in (item.split("=", 1) for item in args.param)}
+            if args.command == "render":
+                response = client.submit("render", folder=args.folder, model=args.model, **params)
+            else:
+                response = client.submit("scene", glb=args.glb, output=args.output, **params)
+        else:
+            response = client.submit("shutdown")
+
+        if not response["ok"]:
+            print(f"ERROR: {response.get('error')}")
+            sys.exit(1)
+        print(json.dumps(response.get("result"), indent=2))
+        if args.command != "shutdown":
+            print(f"Job took {response['elapsed']:.2f}s (scene reset {response.get('reset_s', 0):.3f}s), "
+                  f"~{client.saved_seconds(response):.2f}s saved vs. a fresh Blender")
+
+
+if __name__ == "__main__":
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    main(argv)
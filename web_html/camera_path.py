@@ -0,0 +1,204 @@
+"""
+Orbit camera paths for the turntable renderers, precomputed in NumPy.
+
+All poses of a path (circle, helix or elevation sweep) are computed at once
+as arrays and written to a single camera's fcurves in bulk, instead of one
+keyframe_insert per frame or one camera object per frame. Matrices follow
+Blender's camera convention (looks down -Z, +Y up) and the metadata matches
+the *_meta.json files written by scene_render_bpyrenderer.py.
+
+Everything above the bpy section is pure NumPy. Check a path against an
+existing metadata file (radius/offset as it was rendered with):
+
+    python camera_path.py --compare video1/bpyrenderer_output/X_meta.json --radius 1.5 --azimuth-start 210
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+PATH_KINDS = ("circle", "helix", "sweep")
+
+
+def orbit_angles(kind, num_frames, elevation=15.0, azimuth_start=0.0, turns=1.0,
+                 elevation_end=None, sweep_amplitude=10.0):
+    """
+    Per-frame (elevations, azimuths) in radians, shape (num_frames,) each.
+
+    circle: constant elevation; helix: elevation ramps linearly to elevation_end
+    (default: elevation + 30°); sweep: elevation oscillates by +/- sweep_amplitude
+    once per turn. Azimuths go from azimuth_start (degrees) through `turns` full
+    turns without repeating the first frame, so the clip loops seamlessly.
+    """
+    if kind not in PATH_KINDS:
+        raise ValueError(f"Unknown path kind: {kind} (expected one of {PATH_KINDS})")
+    t = np.arange(num_frames, dtype=np.float64) / num_frames
+    azimuths = np.radians(azimuth_start + 360.0 * turns * t)
+    if kind == "circle":
+        elevations = np.full(num_frames, np.radians(elevation))
+    elif kind == "helix":
+        end = elevation + 30.0 if elevation_end is None else elevation_end
+        ramp = np.arange(num_frames) / max(num_frames - 1, 1)
+        elevations = np.radians(elevation + (end - elevation) * ramp)
+    else:
+        elevations = np.radians(elevation + sweep_amplitude * np.sin(2.0 * np.pi * turns * t))
+    return elevations, azimuths
+
+
+def look_at_matrices(elevations, azimuths, radius, center=(0.0, 0.0, 0.0)):
+    """
+    Camera-to-world matrices (n, 4, 4) for cameras on a sphere looking at center:
+    columns are right, up, back (+Z points from the target to the camera), location.
+    """
+    ce, se = np.cos(elevations), np.sin(elevations)
+    ca, sa = np.cos(azimuths), np.sin(azimuths)
+    back = np.stack([ce * ca, ce * sa, se], axis=1)
+    right = np.stack([-sa, ca, np.zeros_like(sa)], axis=1)
+    up = np.stack([-se * ca, -se * sa, ce], axis=1)
+
+    mats = np.zeros((len(azimuths), 4, 4))
+    mats[:, :3, 0] = right
+    mats[:, :3, 1] = up
+    mats[:, :3, 2] = back
+    mats[:, :3, 3] = np.asarray(center, dtype=np.float64) + radius * back
+    mats[:, 3, 3] = 1.0
+    return mats
+
+
+def orbit_poses(kind, num_frames, radius, elevation=15.0, azimuth_start=0.0,
+                center=(0.0, 0.0, 0.0), **path_options):
+    """
+    All poses of an orbit: {"matrices" (n, 4, 4), "locations" (n, 3),
+    "elevations" (n,), "azimuths" (n,)}. path_options go to orbit_angles.
+    """
+    elevations, azimuths = orbit_angles(kind, num_frames, elevation, azimuth_start, **path_options)
+    matrices = look_at_matrices(elevations, azimuths, radius, center)
+    return {
+        "matrices": matrices,
+        "locations": matrices[:, :3, 3].copy(),
+        "elevations": elevations,
+        "azimuths": azimuths,
+    }
+
+
+def matrices_to_euler(matrices):
+    """
+    XYZ Euler angles (n, 3) of the rotation parts, unwrapped along the path so
+    the interpolated rotation never spins the long way round between frames.
+    """
+    r = matrices[:, :3, :3]
+    x = np.arctan2(r[:, 2, 1], r[:, 2, 2])
+    y = np.arcsin(np.clip(-r[:, 2, 0], -1.0, 1.0))
+    z = np.arctan2(r[:, 1, 0], r[:, 0, 0])
+    return np.unwrap(np.stack([x, y, z], axis=1), axis=0)
+
+
+def camera_metadata(width, height, model_name, poses, camera_info):
+    """
+    The *_meta.json dict: one entry per frame with the camera's projection
+    settings (camera_info: projection_type, ortho_scale, camera_angle_x) and pose.
+    """
+    locations = []
+    for i, (matrix, elevation, azimuth) in enumerate(
+            zip(poses["matrices"], poses["elevations"], poses["azimuths"])):
+        locations.append({
+            "index": "{0:04d}".format(i),
+            "projection_type": camera_info["projection_type"],
+            "ortho_scale": camera_info["ortho_scale"],
+            "camera_angle_x": camera_info["camera_angle_x"],
+            "elevation": float(elevation),
+            "azimuth": float(azimuth),
+            "transform_matrix": matrix.tolist(),
+        })
+    return {"width": width, "height": height, "model": model_name, "locations": locations}
+
+
+def save_metadata(meta_info, path):
+    with open(path, "w") as f:
+        json.dump(meta_info, f, indent=4)
+
+
+# -------- bpy ----------
+def camera_info(cam_obj):
+    """Projection settings of a Blender camera object, as stored in the metadata."""
+    return {
+        "projection_type": cam_obj.data.type,
+        "ortho_scale": cam_obj.data.ortho_scale,
+        "camera_angle_x": cam_obj.data.angle_x,
+    }
+
+
+def _ensure_fcurve(action, obj, data_path, index):
+    if hasattr(action, "fcurve_ensure_for_datablock"):  # layered actions (Blender 4.4+)
+        return action.fcurve_ensure_for_datablock(obj, data_path, index=index)
+    return action.fcurves.new(data_path, index=index)
+
+
+def write_camera_fcurves(cam_obj, poses, frame_start=1):
+    """
+    Key every pose on cam_obj (location + XYZ rotation), one key per frame from
+    frame_start, filling each fcurve with a single foreach_set. Returns the action.
+    """
+    import bpy
+    matrices = poses["matrices"]
+    frames = frame_start + np.arange(len(matrices), dtype=np.float64)
+    channels = {
+        "location": matrices[:, :3, 3],
+        "rotation_euler": matrices_to_euler(matrices),
+    }
+
+    cam_obj.rotation_mode = 'XYZ'
+    cam_obj.animation_data_create()
+    action = bpy.data.actions.new(f"{cam_obj.name}Path")
+    cam_obj.animation_data.action = action
+    for data_path, values in channels.items():
+        for index in range(3):
+            fcurve = _ensure_fcurve(action, cam_obj, data_path, index)
+            fcurve.keyframe_points.add(len(frames))
+            co = np.stack([frames, values[:, index]], axis=1).astype(np.float32)
+            fcurve.keyframe_points.foreach_set("co", co.ravel())
+            fcurve.update()
+
+    # Show the first pose outside of playback too
+    cam_obj.location = channels["location"][0]
+    cam_obj.rotation_euler = channels["rotation_euler"][0]
+    return action
+
+
+# -------- CLI ----------
+def compare_metadata(meta_info, poses):
+    """Largest absolute difference in matrices and azimuths between a meta file and poses."""
+    stored = np.array([loc["transform_matrix"] for loc in meta_info["locations"]])
+    azimuths = np.array([loc["azimuth"] for loc in meta_info["locations"]])
+    wrap = lambda a: np.angle(np.exp(1j * a))
+    return (float(np.abs(stored - poses["matrices"]).max()),
+            float(np.abs(wrap(azimuths - poses["azimuths"])).max()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orbit camera path helper.")
+    parser.add_argument("--kind", choices=PATH_KINDS, default="circle")
+    parser.add_argument("--frames", type=int, default=120)
+    parser.add_argument("--radius", type=float, default=1.8)
+    parser.add_argument("--elevation", type=float, default=15.0, help="degrees")
+    parser.add_argument("--azimuth-start", type=float, default=0.0, help="degrees")
+    parser.add_argument("--compare", metavar="META_JSON", help="check the path against a *_meta.json")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare) as f:
+            meta_info = json.load(f)
+        args.frames = len(meta_info["locations"])
+    poses = orbit_poses(args.kind, args.frames, args.radius, args.elevation, args.azimuth_start)
+    euler = np.degrees(matrices_to_euler(poses["matrices"]))
+    print(f"{args.kind}: {args.frames} poses, first location {np.round(poses['locations'][0], 4)}, "
+          f"first rotation {np.round(euler[0], 2)}°")
+
+    if args.compare:
+        matrix_err, azimuth_err = compare_metadata(meta_info, poses)
+        print(f"vs {args.compare}: max matrix diff {matrix_err:.2e}, max azimuth diff {azimuth_err:.2e} rad")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,100 @@
 """
-Combine multiple videos SIDE BY SIDE with text labels.
-All videos play simultaneously in a horizontal row.
+Combine multiple videos SIDE BY SIDE (or in a grid) with text labels.
+All videos play simultaneously in a horizontal row by default.
 
 Usage:
-    python combine_videos.py
+    python combine_videos.py [video_folder]
+    python combine_videos.py video2 --source lossless            # one H.264 generation
+    python combine_videos.py video2 --source lossless --compare  # vs. the two-stage flow
+    python combine_videos.py video2 --layout 2x3 --sizes 1080p full  # grid, web + archive
+    python combine_videos.py --all --threads 16                      # every folder, in parallel
 
 Configure the VIDEO_CONFIG list below to specify:
 - video_path: path to the video file
 - label: text to display at the bottom
 
-Output: 5 videos side by side = 5120 x 1024 pixels
+Output: 5 videos side by side = 5120 x 1024 pixels (plus label padding).
+--layout auto/RxC arranges them in a grid instead; --sizes scales every tile
+so the whole canvas fits e.g. 1920x1080, and writes each size from one decode.
+
+Sources: by default the per-model *_rgb.mp4 files, which were already
+H.264-encoded by the renderer, so the combined video is a second lossy
+generation. With --source lossless the FFV1 *_rgb_ffv1.mkv files written by
+`scene_render_bpyrenderer.py -- <folder> --outputs lossless` are used
+instead: labels and hstack are applied once and only the final deliverable
+is encoded.
 """
 
+import argparse
+import hashlib
+import json
+import math
 import os
+import re
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+from formatting import format_duration, natural_key
 
 # -------- CONFIG ----------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Get video folder from command line argument (default: video1)
-VIDEO_FOLDER = sys.argv[1] if len(sys.argv) > 1 else "video1"
+# Per-model source videos: H.264 from the renderer, or its lossless FFV1 twin
+SOURCE_SUFFIXES = {
+    "rgb": "_rgb.mp4",
+    "lossless": "_rgb_ffv1.mkv",
+}
+# The renderer's imageio writer encodes *_rgb.mp4 at its default quality 5 (crf 25)
+INTERMEDIATE_CRF = 25
+FINAL_CRF = 18
+
+# Batch mode: libx264 gains little past a few threads per stream, so a
+# thread budget is spread over concurrent jobs of about this many threads
+THREADS_PER_JOB = 4
+X264_PRESET = "medium"
+
+# Output sizes: the whole canvas is scaled down to fit (max_width, max_height);
+# "full" keeps the source tile size. Several sizes are written from one decode.
+OUTPUT_SIZES = {
+    "full": None,
+    "1080p": (1920, 1080),
+    "720p": (1280, 720),
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Combine per-model videos side by side with labels.")
+    parser.add_argument("video_folder", nargs="?", default="video1")
+    parser.add_argument("--source", choices=list(SOURCE_SUFFIXES), default="rgb",
+                        help="rgb: *_rgb.mp4 (default); lossless: FFV1 *_rgb_ffv1.mkv, "
+                             "so only the combined video is lossy")
+    parser.add_argument("--layout", default="row",
+                        help='"row" (default, side by side), "auto" (near-square grid) or ROWSxCOLS, e.g. 2x3')
+    parser.add_argument("--sizes", nargs="+", choices=list(OUTPUT_SIZES), default=["full"],
+                        help="output sizes written in one ffmpeg run, e.g. --sizes 1080p full")
+    parser.add_argument("--font", default=None,
+                        help="label font file (default: first of FONT_FILES, then fc-match)")
+    parser.add_argument("--all", action="store_true",
+                        help="batch mode: combine every video*/bpyrenderer_output folder concurrently")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="concurrent ffmpeg jobs in batch mode (default: threads // THREADS_PER_JOB)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="total encoder thread budget in batch mode (default: all cores)")
+    parser.add_argument("--preset", default=X264_PRESET, help=f"x264 preset (default: {X264_PRESET})")
+    parser.add_argument("--compare", action="store_true",
+                        help="with --source lossless: also run the two-stage flow and report "
+                             "wall-clock time and PSNR/SSIM of both against a lossless reference")
+    return parser.parse_args(argv)
+
+
+SCRIPT_ARGS = parse_args(None if __name__ == "__main__" else [])
+VIDEO_FOLDER = SCRIPT_ARGS.video_folder
 
 INPUT_DIR = os.path.join(SCRIPT_DIR, VIDEO_FOLDER, "bpyrenderer_output")
 OUTPUT_FILE = os.path.join(SCRIPT_DIR, VIDEO_FOLDER, "bpyrenderer_output/combined_sidebyside.mp4")
@@ -40,13 +114,13 @@ VIDEO_LABELS = {
 VIDEO_ORDER = ["PartCrafter", "Gen3DSR", "MIDI", "SceneGen", "nov-04-5block"]
 
 
-def get_video_config(input_dir):
+def get_video_config(input_dir, suffix=SOURCE_SUFFIXES["rgb"]):
     """Auto-detect RGB videos and create config based on VIDEO_LABELS."""
     from glob import glob as globfunc
     
-    rgb_files = globfunc(os.path.join(input_dir, "*_rgb.mp4"))
+    rgb_files = globfunc(os.path.join(input_dir, f"*{suffix}"))
     
-    print(f"\nFound {len(rgb_files)} RGB videos in {input_dir}:")
+    print(f"\nFound {len(rgb_files)} RGB videos ({suffix}) in {input_dir}:")
     for f in rgb_files:
         print(f"  - {os.path.basename(f)}")
     
@@ -63,7 +137,16 @@ def get_video_config(input_dir):
     return config
 
 # Text styling
-FONT_FILE = "/System/Library/Fonts/Supplemental/Times New Roman.ttf"
+# Label font: first existing file, else fontconfig's match for FONT_NAME (Linux)
+FONT_FILES = [
+    "/System/Library/Fonts/Supplemental/Times New Roman.ttf",
+    "/usr/share/fonts/truetype/msttcorefonts/Times_New_Roman.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSerif-Regular.ttf",  # Times metrics
+    "/usr/share/fonts/liberation-serif/LiberationSerif-Regular.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSerif.ttf",
+]
+FONT_NAME = "Times New Roman"
 FONT_SIZE = 64
 FONT_COLOR = "black"
 BORDER_WIDTH = 0
@@ -74,6 +157,9 @@ TEXT_Y_OFFSET = 80  # pixels from bottom
 # 0.1 = 10% of height added at bottom
 BOTTOM_PADDING_PERCENT = 0.15
 PADDING_COLOR = "white"
+
+# Pre-rendered label strips, keyed by labels, font and geometry
+LABEL_CACHE_DIR = os.path.join(SCRIPT_DIR, ".label_cache")
 # --------------------------
 
 
@@ -87,87 +173,412 @@ def check_ffmpeg():
         return False
 
 
-def combine_side_by_side(video_configs, input_dir, output_path):
+def resolve_font(font_file=None):
+    """Label font path: font_file, FONT_FILES, then fc-match; None means PIL's default font."""
+    for path in [font_file] + FONT_FILES:
+        if path and os.path.exists(path):
+            return path
+    if shutil.which("fc-match"):
+        result = subprocess.run(["fc-match", "-f", "%{file}", FONT_NAME], capture_output=True, text=True)
+        if result.returncode == 0 and os.path.exists(result.stdout.strip()):
+            return result.stdout.strip()
+    return None
+
+
+def probe_size(path):
+    """(width, height) of a video's first stream."""
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries",
+         "stream=width,height", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True,
+    )
+    width, height = result.stdout.strip().split(",")[:2]
+    return int(width), int(height)
+
+
+def grid_shape(n, layout="row"):
+    """(rows, cols) for n videos: "row" (1 x n), "auto" (near-square) or "RxC" like "2x3"."""
+    if layout == "row":
+        return 1, n
+    if layout == "auto":
+        cols = math.ceil(math.sqrt(n))
+        return math.ceil(n / cols), cols
+    rows, cols = (int(v) for v in layout.lower().split("x"))
+    if rows * cols < n:
+        raise ValueError(f"Layout {layout} has {rows * cols} cells for {n} videos")
+    return rows, cols
+
+
+def plan_layout(n, tile_width, tile_height, rows, cols, max_size=None):
+    """
+    Geometry of one output: every tile is scaled so the whole canvas (tiles plus
+    their label padding) fits max_size=(width, height), or kept at source size.
+    An incomplete last row is centered.
+    """
+    canvas_width = cols * tile_width
+    canvas_height = rows * tile_height * (1 + BOTTOM_PADDING_PERCENT)
+    scale = 1.0
+    if max_size is not None:
+        scale = min(1.0, max_size[0] / canvas_width, max_size[1] / canvas_height)
+    # Even sizes for yuv420p
+    width = max(2, int(tile_width * scale) // 2 * 2)
+    height = max(2, int(tile_height * scale) // 2 * 2)
+    cell_height = int(height * (1 + BOTTOM_PADDING_PERCENT)) // 2 * 2
+    scale = height / tile_height
+
+    positions = []
+    for i in range(n):
+        row, col = divmod(i, cols)
+        in_row = min(cols, n - row * cols)
+        x = col * width + (cols - in_row) * width // 4 * 2
+        positions.append((x, row * cell_height))
+    return {
+        "tile": (width, height),
+        "cell_height": cell_height,
+        "canvas": (cols * width, rows * cell_height),
+        "positions": positions,
+        "font_size": max(1, round(FONT_SIZE * scale)),
+        "text_offset": round(TEXT_Y_OFFSET * scale),
+    }
+
+
+def label_overlay(labels, plan, font_file):
+    """
+    Transparent PNG with every label centered under its tile, drawn once with PIL
+    and cached by labels, font and geometry. It spans from the first label row
+    to the bottom of the canvas. Returns (path, top y, cache_hit).
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    width, height = plan["tile"]
+    anchors = [(x + width / 2, y + height - plan["text_offset"]) for x, y in plan["positions"]]
+    top = min(y for _, y in anchors)
+    spec = {
+        "labels": list(labels), "anchors": anchors, "canvas": plan["canvas"],
+        "font": font_file, "size": plan["font_size"], "color": FONT_COLOR,
+        "border": [BORDER_WIDTH, BORDER_COLOR],
+    }
+    key = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+    path = os.path.join(LABEL_CACHE_DIR, f"labels_{key}.png")
+    if os.path.exists(path):
+        return path, top, True
+
+    if font_file:
+        font = ImageFont.truetype(font_file, plan["font_size"])
+    else:
+        font = ImageFont.load_default(plan["font_size"])
+    strip = Image.new("RGBA", (plan["canvas"][0], plan["canvas"][1] - top), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(strip)
+    border = max(0, round(BORDER_WIDTH * plan["font_size"] / FONT_SIZE))
+    for label, (x, y) in zip(labels, anchors):
+        # "ma": centered, top of the ascender at y, like drawtext's x=(w-text_w)/2
+        draw.text((x, y - top), label, font=font, fill=FONT_COLOR,
+                  anchor="ma", stroke_width=border, stroke_fill=BORDER_COLOR)
+
+    os.makedirs(LABEL_CACHE_DIR, exist_ok=True)
+    tmp = path + ".tmp.png"
+    strip.save(tmp)
+    os.replace(tmp, path)
+    return path, top, False
+
+
+def output_paths(base_path, sizes, layout="row", rows=1, cols=1):
+    """{size: path}: combined_sidebyside.mp4 for a full-size row, suffixed otherwise."""
+    root, ext = os.path.splitext(base_path)
+    if layout != "row":
+        root = os.path.join(os.path.dirname(root), f"combined_grid_{rows}x{cols}")
+    return {size: root + ("" if size == "full" else f"_{size}") + ext for size in sizes}
+
+
+def combine_layout(video_configs, input_dir, outputs, layout="row", codec_args=None,
+                   preset=None, threads=None, on_progress=None):
     """
-    Combine videos side by side with text labels.
-    Uses ffmpeg's hstack filter with drawtext.
+    Combine videos into a labelled row or grid, writing every size in outputs
+    ({size name in OUTPUT_SIZES: path}) from a single decode of the inputs.
+    Each input is split per output, scaled to that output's tile size and padded
+    for its label; xstack places the tiles and one overlay adds the labels.
+    codec_args replaces the default libx264 crf 18 output settings. preset and
+    threads (the job's budget, shared by filters and the outputs' encoders) go
+    to libx264. on_progress(stats) receives ffmpeg's -progress blocks.
     """
     n = len(video_configs)
+    input_paths = [os.path.join(input_dir, filename) for filename, _ in video_configs]
+    labels = [label for _, label in video_configs]
+    tile_width, tile_height = probe_size(input_paths[0])
+    rows, cols = grid_shape(n, layout)
+    font_file = resolve_font(SCRIPT_ARGS.font)
     
     # Build ffmpeg command
     cmd = ["ffmpeg"]
+    encoder_args = ["-preset", preset] if preset else []
+    if threads:
+        cmd.extend(["-filter_complex_threads", str(threads)])
+        encoder_args.extend(["-threads", str(max(1, threads // len(outputs)))])
     
-    # Add all input files
-    for filename, _ in video_configs:
-        input_path = os.path.join(input_dir, filename)
+    # Add all input files, then one label image (a single still) per output
+    for input_path in input_paths:
         cmd.extend(["-i", input_path])
+    plans = {}
+    for size in outputs:
+        plan = plan_layout(n, tile_width, tile_height, rows, cols, OUTPUT_SIZES[size])
+        plan["labels"], plan["label_top"], cached = label_overlay(labels, plan, font_file)
+        print(f"  {size}: {plan['canvas'][0]}x{plan['canvas'][1]}, labels "
+              f"{os.path.basename(plan['labels'])}{' (cached)' if cached else ''}")
+        cmd.extend(["-i", plan["labels"]])
+        plans[size] = plan
     
     # Build filter complex
-    # First add text to each video, then stack them horizontally
     filter_parts = []
+    k = len(outputs)
+    for i in range(n):
+        if k > 1:
+            branches = "".join(f"[in{i}_{j}]" for j in range(k))
+            filter_parts.append(f"[{i}:v]split={k}{branches}")
+        else:
+            filter_parts.append(f"[{i}:v]null[in{i}_0]")
     
-    # Add text labels to each video
-    for i, (_, label) in enumerate(video_configs):
-        # Escape parentheses for ffmpeg
-        escaped_label = label.replace("(", "\\(").replace(")", "\\)")
-        drawtext = (
-            f"[{i}:v]drawtext=text='{escaped_label}':"
-            f"fontfile='{FONT_FILE}':"
-            f"fontsize={FONT_SIZE}:"
-            f"fontcolor={FONT_COLOR}:"
-            f"borderw={BORDER_WIDTH}:"
-            f"bordercolor={BORDER_COLOR}:"
-            f"x=(w-text_w)/2:"
-            f"y=h-{TEXT_Y_OFFSET}[v{i}]"
-        )
-        filter_parts.append(drawtext)
-    
-    # Stack all videos horizontally
-    inputs = "".join([f"[v{i}]" for i in range(n)])
-    
-    if BOTTOM_PADDING_PERCENT > 0:
-        # hstack then add bottom padding only
-        filter_parts.append(f"{inputs}hstack=inputs={n}[stacked]")
-        # Add padding at bottom only: pad=width:height+padding:x:y
-        # y=0 means video at top, padding at bottom
-        pad_expr = f"[stacked]pad=iw:ih*(1+{BOTTOM_PADDING_PERCENT}):0:0:color={PADDING_COLOR}[out]"
-        filter_parts.append(pad_expr)
-    else:
-        filter_parts.append(f"{inputs}hstack=inputs={n}[out]")
+    for j, (size, plan) in enumerate(plans.items()):
+        width, height = plan["tile"]
+        for i in range(n):
+            # Scale the tile for this output, then pad the bottom for the label
+            chain = []
+            if (width, height) != (tile_width, tile_height):
+                chain.append(f"scale={width}:{height}:flags=lanczos")
+            if plan["cell_height"] > height:
+                chain.append(f"pad=iw:{plan['cell_height']}:0:0:color={PADDING_COLOR}")
+            filter_parts.append(f"[in{i}_{j}]{','.join(chain) or 'null'}[t{i}_{j}]")
+        
+        tiles = "".join(f"[t{i}_{j}]" for i in range(n))
+        if n == 1:
+            filter_parts.append(f"{tiles}null[grid{j}]")
+        else:
+            grid = "|".join(f"{x}_{y}" for x, y in plan["positions"])
+            fill = f":fill={PADDING_COLOR}" if n < rows * cols else ""
+            filter_parts.append(f"{tiles}xstack=inputs={n}:layout={grid}{fill}[grid{j}]")
+        # The label image is one frame; overlay repeats it for the whole video
+        filter_parts.append(f"[grid{j}][{n + j}:v]overlay=0:{plan['label_top']}[out{j}]")
     
     filter_complex = ";".join(filter_parts)
+    cmd.extend(["-filter_complex", filter_complex])
+    for j, path in enumerate(outputs.values()):
+        cmd.extend([
+            "-map", f"[out{j}]",
+            *(codec_args or ["-c:v", "libx264", "-crf", str(FINAL_CRF)]),
+            *encoder_args,
+            "-y", path,
+        ])
     
-    cmd.extend([
-        "-filter_complex", filter_complex,
-        "-map", "[out]",
-        "-c:v", "libx264",
-        "-crf", "18",
-        "-y", output_path
-    ])
-    
-    print(f"  Running ffmpeg with {n} videos side by side...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    print(f"  Running ffmpeg with {n} videos in a {rows}x{cols} layout, {k} output(s)...")
+    if on_progress is None:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode, stderr = result.returncode, result.stderr
+    else:
+        returncode, stderr = run_with_progress(cmd, on_progress)
     
-    if result.returncode != 0:
-        print(f"ERROR: {result.stderr}")
+    if returncode != 0:
+        print(f"ERROR: {stderr}")
         return False
     return True
 
 
+def run_with_progress(cmd, on_progress):
+    """
+    Run an ffmpeg command with `-progress pipe:1`, calling on_progress(stats) for
+    every progress block (frame, fps, out_time, progress=continue/end).
+    Returns (returncode, stderr).
+    """
+    cmd = [cmd[0], "-hide_banner", "-nostats", "-loglevel", "error", "-progress", "pipe:1", *cmd[1:]]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # Drain stderr on the side so a chatty ffmpeg cannot block on a full pipe
+    stderr = []
+    drain = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+    drain.start()
+    stats = {}
+    for line in proc.stdout:
+        key, _, value = line.strip().partition("=")
+        stats[key] = value
+        if key == "progress":
+            on_progress(dict(stats))
+    returncode = proc.wait()
+    drain.join()
+    return returncode, "".join(stderr)
+
+
+def combine_side_by_side(video_configs, input_dir, output_path, codec_args=None):
+    """Combine videos side by side with text labels, at full size (one output)."""
+    return combine_layout(video_configs, input_dir, {"full": output_path}, "row", codec_args)
+
+
+def run_ffmpeg(args):
+    """Run ffmpeg quietly; returns stderr, raises on failure."""
+    result = subprocess.run(["ffmpeg", "-hide_banner", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return result.stderr
+
+
+def measure_quality(distorted, reference):
+    """(PSNR dB, SSIM) of a video against a reference of the same size."""
+    log = run_ffmpeg([
+        "-i", distorted, "-i", reference,
+        "-lavfi", "[0:v]split[d0][d1];[1:v]split[r0][r1];[d0][r0]psnr;[d1][r1]ssim",
+        "-f", "null", "-",
+    ])
+    psnr = re.search(r"PSNR .*average:([\d.]+|inf)", log)
+    ssim = re.search(r"SSIM .*All:([\d.]+)", log)
+    return float(psnr.group(1)) if psnr else float("nan"), float(ssim.group(1)) if ssim else float("nan")
+
+
+def compare_flows(lossless_configs, input_dir):
+    """
+    Time and score the two-stage flow (per-model H.264, then combine) against the
+    single-encode flow (combine straight from FFV1), both measured against a
+    lossless combine of the same sources.
+    """
+    work_dir = tempfile.mkdtemp(prefix="combine_compare_")
+    try:
+        reference = os.path.join(work_dir, "reference.mkv")
+        if not combine_side_by_side(lossless_configs, input_dir, reference,
+                                    codec_args=["-c:v", "ffv1", "-pix_fmt", "bgr0"]):
+            return
+
+        # Two-stage: what the renderer's imageio writer does per model, then the combine
+        start = time.time()
+        h264_configs = []
+        for filename, label in lossless_configs:
+            name = filename[:-len(SOURCE_SUFFIXES["lossless"])] + SOURCE_SUFFIXES["rgb"]
+            run_ffmpeg(["-i", os.path.join(input_dir, filename), "-c:v", "libx264",
+                        "-crf", str(INTERMEDIATE_CRF), "-pix_fmt", "yuv420p",
+                        "-y", os.path.join(work_dir, name)])
+            h264_configs.append((name, label))
+        two_stage = os.path.join(work_dir, "two_stage.mp4")
+        if not combine_side_by_side(h264_configs, work_dir, two_stage):
+            return
+        two_stage_s = time.time() - start
+
+        start = time.time()
+        single = os.path.join(work_dir, "single.mp4")
+        if not combine_side_by_side(lossless_configs, input_dir, single):
+            return
+        single_s = time.time() - start
+
+        print(f"\n  {'flow':12s} {'wall':>8s} {'PSNR':>8s} {'SSIM':>8s}")
+        for name, path, seconds in (("two-stage", two_stage, two_stage_s),
+                                    ("single", single, single_s)):
+            psnr, ssim = measure_quality(path, reference)
+            print(f"  {name:12s} {seconds:7.1f}s {psnr:7.2f}  {ssim:.5f}")
+        print(f"  (two-stage time includes the {len(lossless_configs)} per-model encodes "
+              f"the renderer would otherwise do)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def thread_budget(num_jobs, total_threads=None, max_jobs=None):
+    """(concurrent jobs, encoder threads per job) for num_jobs folders."""
+    total_threads = max(1, total_threads or os.cpu_count() or 1)
+    jobs = max_jobs or max(1, total_threads // THREADS_PER_JOB)
+    jobs = max(1, min(jobs, num_jobs))
+    return jobs, max(1, total_threads // jobs)
+
+
+def find_video_folders():
+    """Every videoN folder with a bpyrenderer_output directory, in natural order."""
+    folders = [os.path.basename(os.path.dirname(d))
+               for d in glob(os.path.join(SCRIPT_DIR, "video*", "bpyrenderer_output"))]
+    return sorted(folders, key=natural_key)
+
+
+def combine_all(folders, layout="row", sizes=("full",), source="rgb",
+                jobs=None, threads=None, preset=X264_PRESET):
+    """
+    Combine every folder concurrently. Each ffmpeg job gets an equal share of
+    the thread budget (-threads, -filter_complex_threads); progress and fps per
+    job are printed from ffmpeg's -progress output.
+    """
+    num_jobs, job_threads = thread_budget(len(folders), threads, jobs)
+    print(f"\n{len(folders)} folders, {num_jobs} concurrent jobs x {job_threads} threads, preset {preset}")
+    lock = threading.Lock()
+    results = {}
+    
+    def combine_folder(folder):
+        input_dir = os.path.join(SCRIPT_DIR, folder, "bpyrenderer_output")
+        configs = get_video_config(input_dir, SOURCE_SUFFIXES[source])
+        if not configs:
+            return folder, False, 0, 0.0
+        rows, cols = grid_shape(len(configs), layout)
+        outputs = output_paths(os.path.join(input_dir, "combined_sidebyside.mp4"), sizes, layout, rows, cols)
+        last_print = [0.0]
+        frames = [0]
+        
+        def on_progress(stats):
+            frames[0] = int(stats.get("frame", 0) or 0)
+            now = time.time()
+            if stats.get("progress") == "end" or now - last_print[0] >= 5.0:
+                last_print[0] = now
+                with lock:
+                    print(f"  [{folder}] frame {frames[0]}, {float(stats.get('fps', 0) or 0):.1f} fps, "
+                          f"{stats.get('out_time', '')[:8]} {'done' if stats.get('progress') == 'end' else ''}",
+                          flush=True)
+        
+        start = time.time()
+        ok = combine_layout(configs, input_dir, outputs, layout, preset=preset,
+                            threads=job_threads, on_progress=on_progress)
+        return folder, ok, frames[0], time.time() - start
+    
+    def run(folder):
+        # One broken folder must not abort the others (pool.map would re-raise)
+        try:
+            return combine_folder(folder)
+        except Exception as e:
+            with lock:
+                print(f"  [{folder}] FAILED: {type(e).__name__}: {e}", flush=True)
+            return folder, False, 0, 0.0
+    
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=num_jobs) as pool:
+        for folder, ok, frames, seconds in pool.map(run, folders):
+            results[folder] = (ok, frames, seconds)
+    wall = time.time() - start
+    
+    print(f"\n{'folder':10s} {'status':8s} {'frames':>7s} {'time':>9s} {'fps':>7s}")
+    total_frames = 0
+    for folder in folders:
+        ok, frames, seconds = results[folder]
+        total_frames += frames
+        fps = frames / seconds if seconds > 0 else 0.0
+        print(f"{folder:10s} {'ok' if ok else 'FAILED':8s} {frames:7d} {format_duration(seconds):>9s} {fps:7.1f}")
+    print(f"Total: {total_frames} frames in {format_duration(wall)} "
+          f"({total_frames / wall if wall > 0 else 0:.1f} fps aggregate)")
+    return all(ok for ok, _, _ in results.values())
+
+
 def main():
     if not check_ffmpeg():
         return
     
+    if SCRIPT_ARGS.all:
+        print("=" * 60)
+        print("Video Combiner - batch mode")
+        print("=" * 60)
+        folders = find_video_folders()
+        if not combine_all(folders, SCRIPT_ARGS.layout, SCRIPT_ARGS.sizes, SCRIPT_ARGS.source,
+                           SCRIPT_ARGS.jobs, SCRIPT_ARGS.threads, SCRIPT_ARGS.preset):
+            sys.exit(1)
+        return
+    
     print("=" * 60)
     print(f"Video Combiner - Side by Side with Labels")
     print(f"Folder: {VIDEO_FOLDER}")
     print("=" * 60)
     
     # Auto-detect videos
-    VIDEO_CONFIG = get_video_config(INPUT_DIR)
+    suffix = SOURCE_SUFFIXES[SCRIPT_ARGS.source]
+    VIDEO_CONFIG = get_video_config(INPUT_DIR, suffix)
     
     if not VIDEO_CONFIG:
-        print(f"\nERROR: No *_rgb.mp4 files found in {INPUT_DIR}")
+        print(f"\nERROR: No *{suffix} files found in {INPUT_DIR}")
+        if SCRIPT_ARGS.source == "lossless":
+            print(f"  Render them with: scene_render_bpyrenderer.py -- {VIDEO_FOLDER} --outputs lossless")
         return
     
     # Validate input files
@@ -185,33 +596,44 @@ def main():
         print("\nERROR: Some input files not found. Exiting.")
         return
     
-    # Combine videos side by side
-    print("\nCombining videos side by side...")
-    if combine_side_by_side(VIDEO_CONFIG, INPUT_DIR, OUTPUT_FILE):
-        print(f"\n✓ Combined video saved to:")
-        print(f"  {OUTPUT_FILE}")
-        
-        # Get video info
-        result = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", 
-             "stream=width,height", "-of", "csv=p=0",
-             OUTPUT_FILE],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            info = result.stdout.strip().split(',')
-            if len(info) >= 2:
-                print(f"  Resolution: {info[0]} x {info[1]}")
+    if SCRIPT_ARGS.compare:
+        if SCRIPT_ARGS.source != "lossless":
+            print("\nERROR: --compare needs --source lossless (the lossless files are the reference)")
+            return
+        print("\nComparing two-stage and single-encode flows...")
+        compare_flows(VIDEO_CONFIG, INPUT_DIR)
+        return
+    
+    # Combine videos side by side (or in a grid), every requested size in one run
+    rows, cols = grid_shape(len(VIDEO_CONFIG), SCRIPT_ARGS.layout)
+    outputs = output_paths(OUTPUT_FILE, SCRIPT_ARGS.sizes, SCRIPT_ARGS.layout, rows, cols)
+    print(f"\nCombining videos ({SCRIPT_ARGS.layout} layout, sizes: {', '.join(outputs)})...")
+    if combine_layout(VIDEO_CONFIG, INPUT_DIR, outputs, SCRIPT_ARGS.layout, preset=SCRIPT_ARGS.preset):
+        for output_file in outputs.values():
+            print(f"\n✓ Combined video saved to:")
+            print(f"  {output_file}")
             
-        result = subprocess.run(
-            ["ffprobe", "-v", "error", "-show_entries", 
-             "format=duration", "-of", "default=noprint_wrappers=1:nokey=1",
-             OUTPUT_FILE],
-            capture_output=True, text=True
-        )
-        if result.returncode == 0:
-            duration = float(result.stdout.strip())
-            print(f"  Duration: {duration:.1f} seconds")
+            # Get video info
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", 
+                 "stream=width,height", "-of", "csv=p=0",
+                 output_file],
+                capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                info = result.stdout.strip().split(',')
+                if len(info) >= 2:
+                    print(f"  Resolution: {info[0]} x {info[1]}")
+                
+            result = subprocess.run(
+                ["ffprobe", "-v", "error", "-show_entries", 
+                 "format=duration", "-of", "default=noprint_wrappers=1:nokey=1",
+                 output_file],
+                capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                duration = float(result.stdout.strip())
+                print(f"  Duration: {duration:.1f} seconds")
     else:
         print("Failed to combine videos")
     
@@ -0,0 +1,53 @@
+"""
+Stand-in render worker for render_launcher.py: takes the render script's
+arguments (after an optional "--"), renders nothing, and prints the same
+progress, error and summary lines, so sharding and log parsing can be
+exercised without Blender.
+
+Models whose name contains "fail" are reported as failed; one containing
+"crash" makes the worker exit before its summary line, like a Blender crash.
+
+    python render_launcher.py video2 --worker-cmd "python3 fake_worker.py --"
+"""
+
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CRASH_EXIT_CODE = 3
+
+
+def main(argv):
+    if "--" in argv:
+        argv = argv[argv.index("--") + 1:]
+    parser = argparse.ArgumentParser(prog="fake_worker.py")
+    parser.add_argument("video_folder", nargs="?", default="video1")
+    parser.add_argument("--models", nargs="+", default=[])
+    parser.add_argument("--temp-dir", default=None)
+    parser.add_argument("--sleep", type=float, default=0.0, help="seconds per model")
+    args, _ = parser.parse_known_args(argv)
+
+    input_dir = os.path.join(SCRIPT_DIR, args.video_folder)
+    print(f"Fake worker: {len(args.models)} models from {input_dir} (temp dir {args.temp_dir})", flush=True)
+    processed = []
+    for model in args.models:
+        model_path = os.path.join(input_dir, model)
+        print(f"\nProcessing: {model_path}", flush=True)
+        time.sleep(args.sleep)
+        if "crash" in model:
+            print("Segmentation fault", flush=True)
+            sys.exit(CRASH_EXIT_CODE)
+        if "fail" in model:
+            print(f"ERROR processing {model_path}: fake failure")
+            continue
+        processed.append(os.path.splitext(model)[0])
+
+    print(f"\n{'='*60}")
+    print(f"Done! Processed {len(processed)}/{len(args.models)} models.")
+    print(f"{'='*60}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
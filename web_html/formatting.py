@@ -0,0 +1,20 @@
+"""
+Small naming/formatting helpers shared by the batch scripts.
+
+Pure Python with no bpy or subprocess imports, so scripts running inside
+Blender (suggest_angles.py) and plain-Python ones (combine_videos.py,
+web_delivery.py, render_scheduler.py) can all use them.
+"""
+
+import re
+
+
+def natural_key(name):
+    """Sort video2 before video10."""
+    return [int(t) if t.isdigit() else t for t in re.split(r"(\d+)", name)]
+
+
+def format_duration(seconds):
+    """Format seconds as h:mm:ss."""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
@@ -0,0 +1,207 @@
+"""
+Grab rendered frames straight from Blender's memory instead of PNG files.
+
+A compositor Viewer node receives every render; its float pixels are read
+with foreach_get into a preallocated buffer and converted to straight-alpha
+sRGB uint8 RGBA, the same layout imageio returns for render_NNNN.png.
+Frames can be handed directly to the compositor/encoder ("memory"), or
+spilled to raw .npy files that are memory-mapped back ("spill") when they
+must hit disk.
+
+The Viewer pixels are scene-linear, before the view transform, so by default
+the capture switches the scene to the "Standard" view (no look, exposure 0,
+gamma 1), whose display transform is exactly the sRGB curve applied here.
+check_against_png renders one frame both ways and reports the largest
+difference. With standard_view=False the scene's colour management is left
+alone and each frame is read back through Blender's own writer instead
+(save_render to a scratch PNG), which is slower but keeps the scene's view.
+
+bpy is imported lazily so the conversion helpers work outside Blender.
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+CAPTURE_MODES = ("png", "memory", "spill")
+VIEWER_IMAGE = "Viewer Node"
+RENDER_RESULT = "Render Result"
+# Colour management whose display transform is the plain sRGB OETF
+STANDARD_VIEW = {"view_transform": "Standard", "look": "None", "exposure": 0.0, "gamma": 1.0}
+PNG_CHECK_TOLERANCE = 2  # uint8 levels; LUT vs OCIO rounding
+
+# scene-linear [0, 1] -> sRGB uint8, sampled finely enough for 8-bit output
+_LUT_SIZE = 4096
+
+
+def _srgb_lut(size=_LUT_SIZE):
+    lin = np.linspace(0.0, 1.0, size)
+    srgb = np.where(lin <= 0.0031308, lin * 12.92, 1.055 * np.power(lin, 1 / 2.4) - 0.055)
+    return np.round(255.0 * srgb).astype(np.uint8)
+
+
+_SRGB_LUT = _srgb_lut()
+
+
+class LinearToSRGB:
+    """Convert premultiplied scene-linear float RGBA to straight sRGB uint8 RGBA, reusing buffers."""
+
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.pixels = np.empty(height * width * 4, dtype=np.float32)
+        self._rgb = np.empty((height, width, 3), dtype=np.float32)
+        self._alpha = np.empty((height, width, 1), dtype=np.float32)
+        self._index = np.empty((height, width, 3), dtype=np.intp)
+
+    def convert(self, out=None):
+        """Convert self.pixels (bottom-up rows, as Blender stores them) into out (top-down)."""
+        if out is None:
+            out = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        src = self.pixels.reshape(self.height, self.width, 4)[::-1]
+        rgb, alpha, index = self._rgb, self._alpha, self._index
+
+        np.clip(src[:, :, 3:4], 0.0, 1.0, out=alpha)
+        # Unpremultiply where there is coverage; fully transparent pixels stay 0
+        rgb.fill(0.0)
+        np.divide(src[:, :, :3], alpha, out=rgb, where=alpha > 0)
+        np.clip(rgb, 0.0, 1.0, out=rgb)
+
+        np.multiply(rgb, _LUT_SIZE - 1, out=rgb)
+        np.rint(rgb, out=rgb)
+        np.copyto(index, rgb, casting="unsafe")
+        np.take(_SRGB_LUT, index, out=out[:, :, :3])
+        np.multiply(alpha, 255.0, out=alpha)
+        np.rint(alpha, out=alpha)
+        np.copyto(out[:, :, 3:4], alpha, casting="unsafe")
+        return out
+
+
+def use_standard_view(view_settings):
+    """Set view_settings to STANDARD_VIEW; returns the previous values of whatever changed."""
+    previous = {}
+    for name, value in STANDARD_VIEW.items():
+        if getattr(view_settings, name) != value:
+            previous[name] = getattr(view_settings, name)
+            setattr(view_settings, name, value)
+    return previous
+
+
+def frame_difference(captured, reference):
+    """Largest per-channel difference between two RGBA uint8 frames, ignoring colour where both are transparent."""
+    diff = np.abs(captured.astype(np.int16) - reference.astype(np.int16))
+    covered = (captured[:, :, 3] > 0) | (reference[:, :, 3] > 0)
+    return int(max(diff[:, :, 3].max(), diff[:, :, :3][covered].max(initial=0)))
+
+
+def load_raw_frame(path):
+    """Decode function for spilled frames: memory-map the .npy instead of decoding a PNG."""
+    return np.load(path, mmap_mode="r")
+
+
+class BlenderFrameCapture:
+    """Render frames one by one and read them back from the compositor Viewer node."""
+
+    def __init__(self, width, height, standard_view=True):
+        import bpy
+        self.bpy = bpy
+        self.width = width
+        self.height = height
+        self.standard_view = standard_view
+        self.converter = LinearToSRGB(height, width)
+        self._scratch_dir = None
+        self._setup(bpy.context.scene)
+
+    def _setup(self, scene):
+        scene.render.resolution_x = self.width
+        scene.render.resolution_y = self.height
+        scene.render.resolution_percentage = 100
+        scene.render.film_transparent = True
+        if not self.standard_view:
+            return
+        changed = use_standard_view(scene.view_settings)
+        if changed:
+            print(f"  Capture: colour management set to the Standard view (was "
+                  f"{', '.join(f'{k}={v}' for k, v in changed.items())}) so frames match a PNG render")
+
+        scene.use_nodes = True
+        tree = scene.node_tree
+        layers = next((n for n in tree.nodes if n.type == "R_LAYERS"), None)
+        if layers is None:
+            layers = tree.nodes.new("CompositorNodeRLayers")
+        viewer = next((n for n in tree.nodes if n.type == "VIEWER"), None)
+        if viewer is None:
+            viewer = tree.nodes.new("CompositorNodeViewer")
+        viewer.use_alpha = True
+        tree.links.new(layers.outputs["Image"], viewer.inputs["Image"])
+
+    def render_frame(self, index, out=None):
+        """Render camera `index` (relative to frame_start) and return its RGBA uint8 frame."""
+        scene = self.bpy.context.scene
+        scene.frame_set(scene.frame_start + index)
+        self.bpy.ops.render.render()
+        if not self.standard_view:
+            return self._read_render_result(out)
+        image = self.bpy.data.images[VIEWER_IMAGE]
+        image.pixels.foreach_get(self.converter.pixels)
+        return self.converter.convert(out)
+
+    def _save_render_result(self, path):
+        """Write the last render as 8-bit RGBA PNG with the scene's view transform applied."""
+        settings = self.bpy.context.scene.render.image_settings
+        settings.file_format = "PNG"
+        settings.color_mode = "RGBA"
+        settings.color_depth = "8"
+        self.bpy.data.images[RENDER_RESULT].save_render(path)
+
+    def _read_render_result(self, out=None):
+        import imageio
+        if self._scratch_dir is None:
+            self._scratch_dir = tempfile.mkdtemp(prefix="frame_capture_")
+        path = os.path.join(self._scratch_dir, "frame.png")
+        self._save_render_result(path)
+        frame = imageio.imread(path)
+        if out is None:
+            return frame
+        np.copyto(out, frame)
+        return out
+
+    def close(self):
+        """Remove the scratch directory used with standard_view=False."""
+        if self._scratch_dir is not None:
+            shutil.rmtree(self._scratch_dir, ignore_errors=True)
+            self._scratch_dir = None
+
+    def check_against_png(self, frame_dir, index=0):
+        """
+        Render camera `index`, take it through the capture conversion and also
+        save it the way the PNG path would (Blender's own view transform and
+        PNG writer); returns the largest difference in uint8 levels.
+        """
+        import imageio
+        captured = self.render_frame(index).copy()
+        os.makedirs(frame_dir, exist_ok=True)
+        path = os.path.join(frame_dir, "capture_check.png")
+        self._save_render_result(path)
+        try:
+            return frame_difference(captured, imageio.imread(path))
+        finally:
+            os.remove(path)
+
+    def frames(self, num_frames):
+        """Yield RGBA frames for cameras 0..num_frames-1; the yielded array is reused."""
+        frame = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        for i in range(num_frames):
+            yield self.render_frame(i, out=frame)
+
+    def spill(self, frame_dir, num_frames):
+        """Render every frame to a raw render_NNNN.npy file and return the sorted paths."""
+        os.makedirs(frame_dir, exist_ok=True)
+        paths = []
+        for i, frame in enumerate(self.frames(num_frames)):
+            path = os.path.join(frame_dir, f"render_{i:04d}.npy")
+            np.save(path, frame)
+            paths.append(path)
+        return paths
@@ -0,0 +1,309 @@
+"""
+Pipelined frame assembly: decode -> composite -> encode.
+
+A thread pool decodes rendered frames ahead of time into a bounded window,
+a compositing thread blends them into a small ring of reusable output
+buffers, and the caller's thread feeds the video writer in frame order.
+PNG decode and H.264 encode therefore overlap instead of alternating.
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import imageio
+import numpy as np
+
+_DONE = object()
+OUTPUT_KINDS = ("rgb", "mask", "webm", "lossless")
+OUTPUT_SUFFIXES = {
+    "rgb": "_rgb.mp4",            # composited over white
+    "mask": "_mask.mp4",          # alpha as grayscale
+    "webm": "_rgba.webm",         # transparent VP9 for the website
+    "lossless": "_rgb_ffv1.mkv",  # composited, FFV1: source for combine_videos.py --source lossless
+}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_FRAME_RE = re.compile(r"render_(\d+)\.png$")
+
+
+def is_complete_png(path):
+    """True if path looks like a fully written PNG (signature + trailing IEND chunk)."""
+    try:
+        with open(path, "rb") as f:
+            if f.read(8) != _PNG_SIGNATURE:
+                return False
+            f.seek(0, os.SEEK_END)
+            if f.tell() < 8 + 12 * 2:
+                return False
+            f.seek(-12, os.SEEK_END)
+            return f.read(12)[4:8] == b"IEND"
+    except OSError:
+        return False
+
+
+def completed_frames(frame_dir, first_frame=0):
+    """
+    Map camera index -> path for render_NNNN.png files in frame_dir that are complete.
+    Truncated frames (e.g. from a crash mid-write) are deleted so they get re-rendered.
+    """
+    done = {}
+    if not os.path.isdir(frame_dir):
+        return done
+    for name in os.listdir(frame_dir):
+        m = _FRAME_RE.match(name)
+        if not m:
+            continue
+        path = os.path.join(frame_dir, name)
+        if is_complete_png(path):
+            done[int(m.group(1)) - first_frame] = path
+        else:
+            os.remove(path)
+    return done
+
+
+def missing_ranges(done, num_frames):
+    """Contiguous (start, end) index ranges, inclusive, of frames not in done."""
+    ranges = []
+    start = None
+    for i in range(num_frames):
+        if i not in done and start is None:
+            start = i
+        elif i in done and start is not None:
+            ranges.append((start, i - 1))
+            start = None
+    if start is not None:
+        ranges.append((start, num_frames - 1))
+    return ranges
+
+
+class StageTimer:
+    """Accumulate busy time per pipeline stage (thread-safe)."""
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.totals = {name: 0.0 for name in self.stages}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.totals[stage] += seconds
+
+    def report(self, num_frames, wall):
+        """Print the per-stage timing breakdown."""
+        print(f"  Frame pipeline: {num_frames} frames in {wall:.2f}s "
+              f"({num_frames / wall if wall > 0 else 0:.1f} fps)")
+        for name in self.stages:
+            total = self.totals[name]
+            per_frame = total / num_frames * 1000 if num_frames else 0.0
+            print(f"    {name:10s} {total:7.2f}s total  {per_frame:6.1f} ms/frame")
+
+
+def assemble_video(frame_files, writer, compositor, decode=imageio.imread,
+                   decode_workers=4, queue_depth=8, remove_files=True, on_frame=None):
+    """
+    Decode frame_files, composite each one and append it to writer (may be None), in order.
+
+    decode_workers: threads decoding frames ahead of the compositor.
+    queue_depth:    max frames in flight between stages (bounds memory).
+    remove_files:   delete each frame file once it has been written.
+    on_frame:       optional callback(index, rgba, rgb) run on the writer thread,
+                    e.g. FrameOutputs.write_extra for mask/alpha videos.
+    Returns the StageTimer with the per-stage breakdown.
+    """
+    timer = StageTimer(["decode", "composite", "encode"])
+    queue_depth = max(1, queue_depth)
+    composited = queue.Queue(maxsize=queue_depth)
+    free_frames = queue.Queue()
+    for _ in range(queue_depth + 1):
+        free_frames.put(compositor.new_frame())
+    errors = []
+    stop = threading.Event()
+
+    def timed_decode(path):
+        start = time.perf_counter()
+        image = decode(path)
+        timer.add("decode", time.perf_counter() - start)
+        return image
+
+    def composite_stage():
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, decode_workers)) as pool:
+                pending = deque()
+                files = iter(frame_files)
+                while True:
+                    # Keep up to queue_depth decodes in flight ahead of the compositor
+                    while len(pending) < queue_depth:
+                        path = next(files, None)
+                        if path is None:
+                            break
+                        pending.append(pool.submit(timed_decode, path))
+                    if not pending or stop.is_set():
+                        break
+                    image = pending.popleft().result()
+                    out = free_frames.get()
+                    start = time.perf_counter()
+                    compositor.composite(image, out=out)
+                    timer.add("composite", time.perf_counter() - start)
+                    composited.put((image, out))
+                for future in pending:
+                    future.cancel()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            composited.put(_DONE)
+
+    wall_start = time.perf_counter()
+    worker = threading.Thread(target=composite_stage, daemon=True)
+    worker.start()
+
+    count = 0
+    try:
+        while True:
+            item = composited.get()
+            if item is _DONE:
+                break
+            image, rgb = item
+            start = time.perf_counter()
+            if writer is not None:
+                writer.append_data(rgb)
+            if on_frame is not None:
+                on_frame(count, image, rgb)
+            timer.add("encode", time.perf_counter() - start)
+            if remove_files:
+                os.remove(frame_files[count])
+            free_frames.put(rgb)
+            count += 1
+    finally:
+        stop.set()
+        # Unblock the compositor if it is waiting on a buffer or a full queue
+        free_frames.put(compositor.new_frame())
+        while worker.is_alive():
+            try:
+                composited.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        worker.join()
+
+    if errors:
+        raise errors[0]
+
+    timer.report(count, time.perf_counter() - wall_start)
+    return timer
+
+
+def encode_frames(frames, writer, compositor, on_frame=None):
+    """
+    Composite and append frames from an in-memory iterator (e.g. direct capture).
+    Runs on the caller's thread, since Blender rendering must stay on the main
+    thread; the writer's ffmpeg process still encodes concurrently.
+    """
+    timer = StageTimer(["capture", "composite", "encode"])
+    out = compositor.new_frame()
+    wall_start = time.perf_counter()
+    count = 0
+    frames = iter(frames)
+    while True:
+        start = time.perf_counter()
+        image = next(frames, None)
+        timer.add("capture", time.perf_counter() - start)
+        if image is None:
+            break
+        start = time.perf_counter()
+        compositor.composite(image, out=out)
+        timer.add("composite", time.perf_counter() - start)
+        start = time.perf_counter()
+        if writer is not None:
+            writer.append_data(out)
+        if on_frame is not None:
+            on_frame(count, image, out)
+        timer.add("encode", time.perf_counter() - start)
+        count += 1
+
+    timer.report(count, time.perf_counter() - wall_start)
+    return timer
+
+
+def chain_frames(*callbacks):
+    """One on_frame callback calling each non-None callback in turn; None if there are none."""
+    callbacks = [cb for cb in callbacks if cb is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    def on_frame(index, rgba, rgb):
+        for cb in callbacks:
+            cb(index, rgba, rgb)
+    return on_frame
+
+
+class FrameOutputs:
+    """
+    All videos produced from one pass over the frames.
+    `rgb` is the composited writer fed by the pipeline; mask/webm/lossless are
+    written by write_extra from the same frame, so nothing is decoded twice.
+    """
+
+    def __init__(self, paths, fps, height, width):
+        self.paths = dict(paths)
+        unknown = set(self.paths) - set(OUTPUT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown output kinds: {sorted(unknown)} (expected {OUTPUT_KINDS})")
+        self.rgb = None
+        self.mask = None
+        self.webm = None
+        self.lossless = None
+        self._mask_frame = np.empty((height, width), dtype=np.uint8)
+        try:
+            if "rgb" in self.paths:
+                self.rgb = imageio.get_writer(self.paths["rgb"], fps=fps)
+            if "mask" in self.paths:
+                self.mask = imageio.get_writer(self.paths["mask"], fps=fps)
+            if "webm" in self.paths:
+                self.webm = imageio.get_writer(
+                    self.paths["webm"], fps=fps, codec="libvpx-vp9",
+                    pixelformat="yuva420p", macro_block_size=1,
+                    output_params=["-b:v", "0", "-crf", "32", "-row-mt", "1"],
+                )
+            if "lossless" in self.paths:
+                # Planar RGB keeps the composited frames bit-exact (no chroma subsampling)
+                self.lossless = imageio.get_writer(
+                    self.paths["lossless"], fps=fps, codec="ffv1",
+                    pixelformat="bgr0", macro_block_size=1,
+                    output_params=["-level", "3", "-slices", "16"],
+                )
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def has_extra(self):
+        return self.mask is not None or self.webm is not None or self.lossless is not None
+
+    def write_extra(self, index, rgba, rgb):
+        """on_frame callback: write the mask, transparent and lossless frames for this frame."""
+        if self.mask is not None:
+            if rgba.ndim == 3 and rgba.shape[2] == 4:
+                np.copyto(self._mask_frame, rgba[:, :, 3])
+            else:
+                self._mask_frame.fill(255)
+            self.mask.append_data(self._mask_frame)
+        if self.webm is not None:
+            self.webm.append_data(rgba)
+        if self.lossless is not None:
+            self.lossless.append_data(rgb)
+
+    def close(self):
+        for writer in (self.rgb, self.mask, self.webm, self.lossless):
+            if writer is not None:
+                writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
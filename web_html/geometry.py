@@ -0,0 +1,103 @@
+"""
+Scene bounds from mesh vertices, vectorized.
+
+Vertex coordinates of the evaluated meshes (after modifiers) are pulled in
+bulk with foreach_get and moved to world space with one matmul per object,
+giving tight axis-aligned bounds (the object bound_box corners used before
+are only an upper bound once rotated) and an optional bounding sphere. The
+NumPy core has no bpy dependency.
+"""
+
+import numpy as np
+
+
+def transform_points(points, matrix):
+    """Apply a 4x4 affine matrix to points of shape (n, 3)."""
+    matrix = np.asarray(matrix, dtype=np.float64)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def aabb(points):
+    """(min_corner, max_corner) of points (n, 3)."""
+    return points.min(axis=0), points.max(axis=0)
+
+
+def merge_aabbs(boxes):
+    """Union of [(min_corner, max_corner)] boxes."""
+    mins, maxs = zip(*boxes)
+    return np.min(mins, axis=0), np.max(maxs, axis=0)
+
+
+def aabb_corners(min_corner, max_corner):
+    """The 8 corners of a box, shape (8, 3)."""
+    return np.array([[x, y, z]
+                     for x in (min_corner[0], max_corner[0])
+                     for y in (min_corner[1], max_corner[1])
+                     for z in (min_corner[2], max_corner[2])])
+
+
+def center_radius(min_corner, max_corner):
+    """Box center and half its diagonal (the radius the orbit cameras are framed with)."""
+    return (min_corner + max_corner) / 2.0, float(np.linalg.norm(max_corner - min_corner)) / 2.0
+
+
+def bounding_sphere(points, center=None):
+    """Sphere around center (default: the AABB center) enclosing all points: (center, radius)."""
+    if center is None:
+        center, _ = center_radius(*aabb(points))
+    radius = float(np.sqrt(((points - center) ** 2).sum(axis=1).max()))
+    return center, radius
+
+
+# -------- bpy ----------
+def object_world_vertices(obj, depsgraph=None):
+    """
+    World-space vertex positions of a mesh object, shape (n, 3), via foreach_get.
+    Uses the evaluated mesh (modifiers, shape keys, armature deformation applied),
+    i.e. what gets rendered; depsgraph defaults to the context's evaluated one.
+    """
+    import bpy
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    try:
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+    finally:
+        evaluated.to_mesh_clear()
+    return transform_points(co.reshape(-1, 3).astype(np.float64), evaluated.matrix_world)
+
+
+def mesh_world_vertices(objects, depsgraph=None):
+    """World-space vertices (n, 3) of each mesh object whose evaluated mesh has any."""
+    vertex_sets = []
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        points = object_world_vertices(obj, depsgraph)
+        if len(points):
+            vertex_sets.append(points)
+    return vertex_sets
+
+
+def object_aabbs(objects, depsgraph=None):
+    """Tight world-space (min_corner, max_corner) per mesh object with vertices."""
+    return [aabb(points) for points in mesh_world_vertices(objects, depsgraph)]
+
+
+def scene_bounds(objects, sphere=False, depsgraph=None):
+    """
+    Tight bounds of all mesh objects: {"min", "max", "center", "radius"} as NumPy
+    arrays/floats, where radius is half the AABB diagonal. With sphere=True also
+    "sphere_radius": the tight bounding-sphere radius around the same center.
+    """
+    vertex_sets = mesh_world_vertices(objects, depsgraph)
+    if not vertex_sets:
+        raise RuntimeError("No meshes found.")
+    min_corner, max_corner = merge_aabbs([aabb(points) for points in vertex_sets])
+    center, radius = center_radius(min_corner, max_corner)
+    bounds = {"min": min_corner, "max": max_corner, "center": center, "radius": radius}
+    if sphere:
+        bounds["sphere_radius"] = max(bounding_sphere(points, center)[1] for points in vertex_sets)
+    return bounds
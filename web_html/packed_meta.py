@@ -0,0 +1,226 @@
+"""
+Packed camera metadata: a compact binary twin of the verbose *_meta.json.
+
+Layout of <model>_meta.bin (little-endian):
+    8 bytes   magic b"CAMMETA1"
+    uint32    header length in bytes
+    header    UTF-8 JSON: width, height, model, count, the shared camera
+              settings (projection_type, ortho_scale, camera_angle_x),
+              render_width/render_height when present, and data_offset,
+              zero-padded so the data starts 64-byte aligned
+    float32   transform matrices, shape (count, 4, 4)
+    float32   (elevation, azimuth) per camera, shape (count, 2)
+
+The float block can be memory-mapped directly (or viewed as a Float32Array
+in the browser), so loading all transforms is one mmap instead of parsing
+~120 KB of nested JSON lists.
+
+Usage:
+    python packed_meta.py convert                 # every video*/bpyrenderer_output*/ folder
+    python packed_meta.py convert video2 video5 --force
+    python packed_meta.py benchmark --repeat 20
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from glob import glob
+
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+MAGIC = b"CAMMETA1"
+ALIGN = 64
+PACKED_SUFFIX = "_meta.bin"
+CAMERA_FIELDS = ("projection_type", "ortho_scale", "camera_angle_x")
+RENDER_SIZE_FIELDS = ("render_width", "render_height")
+
+
+def packed_path(meta_path):
+    """<model>_meta.json -> <model>_meta.bin"""
+    return meta_path[:-len("_meta.json")] + PACKED_SUFFIX if meta_path.endswith("_meta.json") \
+        else os.path.splitext(meta_path)[0] + ".bin"
+
+
+def save_packed(meta_info, path):
+    """Write a metadata dict (the *_meta.json structure) in the packed format."""
+    locations = meta_info["locations"]
+    camera = {field: locations[0][field] for field in CAMERA_FIELDS} if locations else {}
+    for loc in locations:
+        if any(loc[field] != camera[field] for field in CAMERA_FIELDS):
+            raise ValueError(f"Camera settings differ between frames (index {loc['index']}); "
+                             "the packed format stores them once")
+    if [loc["index"] for loc in locations] != ["{0:04d}".format(i) for i in range(len(locations))]:
+        raise ValueError("Packed metadata expects consecutive indices starting at 0000")
+
+    transforms = np.array([loc["transform_matrix"] for loc in locations], dtype="<f4").reshape(-1, 4, 4)
+    angles = np.array([[loc["elevation"], loc["azimuth"]] for loc in locations], dtype="<f4").reshape(-1, 2)
+
+    header = {
+        "width": meta_info["width"],
+        "height": meta_info["height"],
+        "model": meta_info["model"],
+        "count": len(locations),
+        **camera,
+    }
+    # Draft renders delivered upscaled also record the rendered size
+    header.update({key: meta_info[key] for key in RENDER_SIZE_FIELDS if key in meta_info})
+    # data_offset depends on the header length, which depends on data_offset
+    header["data_offset"] = 0
+    while True:
+        encoded = json.dumps(header).encode()
+        offset = -(-(len(MAGIC) + 4 + len(encoded)) // ALIGN) * ALIGN
+        if offset == header["data_offset"]:
+            break
+        header["data_offset"] = offset
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        f.write(b"\0" * (offset - f.tell()))
+        f.write(transforms.tobytes())
+        f.write(angles.tobytes())
+    os.replace(tmp, path)
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a packed metadata file: {path}")
+        (length,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(length))
+
+
+def load_packed(path):
+    """
+    Memory-map a packed file. Returns {"header": dict, "transforms": (N, 4, 4),
+    "elevations": (N,), "azimuths": (N,)}; the arrays are read-only float32 views.
+    """
+    header = read_header(path)
+    count = header["count"]
+    data = np.memmap(path, dtype="<f4", mode="r", offset=header["data_offset"], shape=(count * 18,))
+    angles = data[count * 16:].reshape(count, 2)
+    return {
+        "header": header,
+        "transforms": data[:count * 16].reshape(count, 4, 4),
+        "elevations": angles[:, 0],
+        "azimuths": angles[:, 1],
+    }
+
+
+def to_metadata(packed):
+    """Rebuild the *_meta.json dict from a loaded packed file (values rounded to float32)."""
+    header = packed["header"]
+    locations = [{
+        "index": "{0:04d}".format(i),
+        **{field: header[field] for field in CAMERA_FIELDS},
+        "elevation": float(packed["elevations"][i]),
+        "azimuth": float(packed["azimuths"][i]),
+        "transform_matrix": packed["transforms"][i].tolist(),
+    } for i in range(header["count"])]
+    meta_info = {"width": header["width"], "height": header["height"], "model": header["model"],
+                 "locations": locations}
+    meta_info.update({key: header[key] for key in RENDER_SIZE_FIELDS if key in header})
+    return meta_info
+
+
+def load_json_transforms(meta_path):
+    """The JSON path to the same array, for comparison: parse everything, stack the matrices."""
+    with open(meta_path) as f:
+        meta_info = json.load(f)
+    return np.array([loc["transform_matrix"] for loc in meta_info["locations"]], dtype=np.float32)
+
+
+# -------- folders ----------
+def find_meta_files(folders=None):
+    """All *_meta.json under <folder>/bpyrenderer_output*/ (default: every video* folder)."""
+    if not folders:
+        folders = [d for d in glob(os.path.join(SCRIPT_DIR, "video*")) if os.path.isdir(d)]
+    files = []
+    for folder in folders:
+        folder = folder if os.path.isabs(folder) else os.path.join(SCRIPT_DIR, folder)
+        files.extend(glob(os.path.join(folder, "bpyrenderer_output*", "*_meta.json")))
+    return sorted(files)
+
+
+def convert_all(meta_files, force=False):
+    """Pack every JSON whose .bin is missing or older. Returns (converted, skipped, json bytes, bin bytes)."""
+    converted = skipped = json_bytes = bin_bytes = 0
+    for meta_path in meta_files:
+        out = packed_path(meta_path)
+        if not force and os.path.exists(out) and os.path.getmtime(out) >= os.path.getmtime(meta_path):
+            skipped += 1
+            continue
+        with open(meta_path) as f:
+            meta_info = json.load(f)
+        try:
+            save_packed(meta_info, out)
+        except ValueError as e:
+            print(f"  SKIP {os.path.relpath(meta_path, SCRIPT_DIR)}: {e}")
+            continue
+        converted += 1
+        json_bytes += os.path.getsize(meta_path)
+        bin_bytes += os.path.getsize(out)
+    return converted, skipped, json_bytes, bin_bytes
+
+
+def benchmark(meta_files, repeat=10):
+    """Time loading all transforms from JSON versus the packed files."""
+    pairs = [(m, packed_path(m)) for m in meta_files if os.path.exists(packed_path(m))]
+    if not pairs:
+        print("No packed files yet; run `convert` first.")
+        return
+
+    def run(load, paths):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for path in paths:
+                load(path)
+        return (time.perf_counter() - start) / (repeat * len(paths))
+
+    json_paths, bin_paths = zip(*pairs)
+    # Touch every element so lazy mmap pages are actually read
+    json_s = run(lambda p: load_json_transforms(p).sum(), json_paths)
+    bin_s = run(lambda p: np.asarray(load_packed(p)["transforms"]).sum(), bin_paths)
+    max_diff = max(float(np.abs(load_json_transforms(j) - load_packed(b)["transforms"]).max())
+                   for j, b in pairs)
+
+    json_size = sum(os.path.getsize(p) for p in json_paths) / len(pairs)
+    bin_size = sum(os.path.getsize(p) for p in bin_paths) / len(pairs)
+    print(f"{len(pairs)} files, {repeat} repeats")
+    print(f"  json:   {json_s * 1000:7.3f} ms/file, {json_size / 1024:6.1f} KB")
+    print(f"  packed: {bin_s * 1000:7.3f} ms/file, {bin_size / 1024:6.1f} KB")
+    print(f"  speedup {json_s / bin_s:.1f}x, max |diff| {max_diff:.1e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packed camera metadata tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("convert", help="write <model>_meta.bin next to every <model>_meta.json")
+    p.add_argument("folders", nargs="*", help="video folders (default: all video* folders)")
+    p.add_argument("--force", action="store_true", help="rewrite up-to-date .bin files too")
+    p = sub.add_parser("benchmark", help="compare load time of JSON and packed metadata")
+    p.add_argument("folders", nargs="*")
+    p.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    meta_files = find_meta_files(args.folders)
+    if args.command == "convert":
+        converted, skipped, json_bytes, bin_bytes = convert_all(meta_files, args.force)
+        print(f"Converted {converted}, up to date {skipped} (of {len(meta_files)} metadata files)")
+        if converted:
+            print(f"  {json_bytes / 1024:.0f} KB JSON -> {bin_bytes / 1024:.0f} KB packed")
+    else:
+        benchmark(meta_files, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
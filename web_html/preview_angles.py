@@ -4,6 +4,8 @@ Saves your choice to a config file for use with scene_render_bpyrenderer.py
 
 Usage:
   blender --background --python preview_angles.py -- <glb_file>
+  blender --background --python preview_angles.py -- <glb_file> --num-angles 16 --cols 4 --workers 4
+  blender --background --python preview_angles.py -- <glb_file> --quality draft
 
 Example:
   /Applications/Blender.app/Contents/MacOS/Blender --background --python preview_angles.py -- video1/PartCrafter-latest.glb
@@ -20,12 +22,27 @@ if user_site not in sys.path:
 import json
 import bpy
 import math
+from functools import lru_cache
 from mathutils import Vector
 
+# Make sibling helper modules importable when run via `blender --python`
+if os.path.dirname(os.path.abspath(__file__)) not in sys.path:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from geometry import scene_bounds
+from render_quality import QUALITY_TIERS, apply_quality, scaled_size
+
 # -------- CONFIG ----------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PREVIEW_SIZE = 512
 NUM_ANGLES = 12  # Preview at 0°, 30°, 60°, ... 330°
+LOG_TAIL_LINES = 40  # worker log lines printed when a parallel preview worker fails
+LABEL_FONTS = [
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/System/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+]
 # --------------------------
 
 
@@ -62,34 +79,33 @@ def get_model_name(model_path):
     return name
 
 
-def setup_scene(model_path):
+def clear_scene_data():
+    """Remove all scene content without a factory reset (fast path for a long-lived Blender)."""
+    for objects in (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.cameras,
+                    bpy.data.lights, bpy.data.textures, bpy.data.worlds, bpy.data.node_groups,
+                    bpy.data.actions):
+        for block in list(objects):
+            objects.remove(block)
+    for image in list(bpy.data.images):
+        if image.type == 'IMAGE':  # keep Render Result / Viewer Node
+            bpy.data.images.remove(image)
+
+
+def setup_scene(model_path, factory_reset=True, quality="final"):
     """Setup scene with model, camera, and lighting."""
     # Clear scene
-    bpy.ops.wm.read_factory_settings(use_empty=True)
+    if factory_reset:
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+    else:
+        clear_scene_data()
     
     # Import model
     bpy.ops.import_scene.gltf(filepath=model_path)
     
-    # Calculate bounding box
-    mesh_objs = [o for o in bpy.context.scene.objects if o.type == 'MESH']
-    if not mesh_objs:
-        raise RuntimeError("No meshes found")
-    
-    min_corner = Vector((1e9, 1e9, 1e9))
-    max_corner = Vector((-1e9, -1e9, -1e9))
-    
-    for obj in mesh_objs:
-        for v in obj.bound_box:
-            w = obj.matrix_world @ Vector(v)
-            min_corner.x = min(min_corner.x, w.x)
-            min_corner.y = min(min_corner.y, w.y)
-            min_corner.z = min(min_corner.z, w.z)
-            max_corner.x = max(max_corner.x, w.x)
-            max_corner.y = max(max_corner.y, w.y)
-            max_corner.z = max(max_corner.z, w.z)
-    
-    center = (min_corner + max_corner) / 2.0
-    radius = (max_corner - min_corner).length / 2.0
+    # Calculate bounding box (tight, from vertices)
+    bounds = scene_bounds(bpy.context.scene.objects)
+    center = Vector(bounds["center"])
+    radius = bounds["radius"]
     
     # Add camera
     cam_data = bpy.data.cameras.new("PreviewCam")
@@ -106,8 +122,9 @@ def setup_scene(model_path):
     
     # Setup render settings
     bpy.context.scene.render.engine = 'BLENDER_EEVEE_NEXT'
-    bpy.context.scene.render.resolution_x = PREVIEW_SIZE
-    bpy.context.scene.render.resolution_y = PREVIEW_SIZE
+    size = preview_size(quality)
+    bpy.context.scene.render.resolution_x = size
+    bpy.context.scene.render.resolution_y = size
     bpy.context.scene.render.film_transparent = True
     
     # White background
@@ -119,37 +136,176 @@ def setup_scene(model_path):
         bg_node.inputs["Color"].default_value = (1, 1, 1, 1)
         bg_node.inputs["Strength"].default_value = 0.5
     
+    apply_quality(bpy.context.scene, quality)
+    
     return center, radius, cam_obj
 
 
-def render_at_angle(center, radius, cam_obj, angle_deg, output_path):
-    """Render the scene from a specific angle."""
+def camera_pose(center, radius, angle_deg):
+    """Camera location and rotation looking at center from angle_deg around Z."""
     angle_rad = math.radians(angle_deg)
     distance = radius * 2.5
     height = radius * 0.6
     
-    x = center.x + distance * math.cos(angle_rad)
-    y = center.y + distance * math.sin(angle_rad)
-    z = center.z + height
-    
-    cam_obj.location = (x, y, z)
+    location = Vector((
+        center.x + distance * math.cos(angle_rad),
+        center.y + distance * math.sin(angle_rad),
+        center.z + height,
+    ))
     
     # Point camera at center
-    direction = center - cam_obj.location
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    cam_obj.rotation_euler = rot_quat.to_euler()
-    
-    # Render
-    bpy.context.scene.render.filepath = output_path
-    bpy.ops.render.render(write_still=True)
+    direction = center - location
+    rotation = direction.to_track_quat('-Z', 'Y').to_euler()
+    return location, rotation
 
 
-def create_preview_grid(model_path, video_folder):
-    """Create a grid of preview images at different angles."""
+def keyframe_angles(center, radius, cam_obj, angles):
+    """One frame per angle on a single camera, so all angles render in one pass."""
+    scene = bpy.context.scene
+    scene.frame_start = 0
+    scene.frame_end = len(angles) - 1
+    for frame, angle in enumerate(angles):
+        location, rotation = camera_pose(center, radius, angle)
+        cam_obj.location = location
+        cam_obj.rotation_euler = rotation
+        cam_obj.keyframe_insert("location", frame=frame)
+        cam_obj.keyframe_insert("rotation_euler", frame=frame)
+
+
+def preview_angle_list(num_angles=NUM_ANGLES):
+    """Evenly spaced azimuths in whole degrees, e.g. 0, 30, ... 330 for 12."""
+    return [round(i * 360 / num_angles) for i in range(num_angles)]
+
+
+def grid_shape(num_tiles, cols=None):
+    """(cols, rows) for the preview grid; near-square by default (12 -> 4x3)."""
+    cols = cols or math.ceil(math.sqrt(num_tiles))
+    return cols, math.ceil(num_tiles / cols)
+
+
+@lru_cache(maxsize=4)
+def load_label_font(size=36):
+    """Load a label font once; macOS and common Linux fonts, else PIL's default."""
+    from PIL import ImageFont
+    for path in LABEL_FONTS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+def compose_grid(tiles, cols=None):
+    """
+    Build the labelled grid image from in-memory tiles: [(angle, RGBA uint8 array)].
+    Tiles are copied into one preallocated buffer; labels use a single ImageDraw.
+    """
+    import numpy as np
+    from PIL import Image, ImageDraw
+    
+    size = tiles[0][1].shape[0]
+    cols, rows = grid_shape(len(tiles), cols)
+    grid = np.full((rows * size, cols * size, 4), 255, dtype=np.uint8)
+    for i, (_, tile) in enumerate(tiles):
+        y, x = (i // cols) * size, (i % cols) * size
+        grid[y:y + size, x:x + size] = tile
+    
+    image = Image.fromarray(grid, "RGBA")
+    draw = ImageDraw.Draw(image)
+    font = load_label_font(36)
+    for i, (angle, _) in enumerate(tiles):
+        y, x = (i // cols) * size, (i % cols) * size
+        # Larger label background
+        draw.rectangle([x, y, x + 80, y + 50], fill=(0, 0, 0, 220))
+        draw.text((x + 10, y + 8), f"{angle}°", fill=(255, 255, 0), font=font)  # Yellow text
+    return image
+
+
+def preview_size(quality="final"):
+    """Tile size for a quality tier (draft tiles are smaller)."""
+    return scaled_size(PREVIEW_SIZE, PREVIEW_SIZE, quality)[0]
+
+
+def render_tiles(model_path, angles, factory_reset=True, quality="final"):
+    """Render the given angles in one pass and return [(angle, RGBA uint8 array)]."""
+    from frame_capture import BlenderFrameCapture
+    
+    center, radius, cam_obj = setup_scene(model_path, factory_reset=factory_reset, quality=quality)
+    keyframe_angles(center, radius, cam_obj, angles)
+    size = preview_size(quality)
+    # Tiles keep the scene's own view transform, like the turntables rendered via PNG
+    capture = BlenderFrameCapture(size, size, standard_view=False)
+    tiles = []
     try:
-        import numpy as np
-        from PIL import Image
-    except ImportError:
+        for angle, frame in zip(angles, capture.frames(len(angles))):
+            print(f"  Rendered angle {angle}°")
+            tiles.append((angle, frame.copy()))
+    finally:
+        capture.close()
+    return tiles
+
+
+def render_tiles_parallel(model_path, angles, workers, tile_dir, quality="final"):
+    """
+    Split angles across several Blender processes; tiles come back as raw .npy files.
+    Each worker's output goes to tile_dir/worker_N.log, which is printed (last
+    LOG_TAIL_LINES lines) and kept if the worker fails or leaves tiles missing.
+    """
+    import subprocess
+    import numpy as np
+    
+    os.makedirs(tile_dir, exist_ok=True)
+    shards = [angles[i::workers] for i in range(workers) if angles[i::workers]]
+    procs = []
+    for i, shard in enumerate(shards):
+        cmd = [bpy.app.binary_path, "--background", "--python", os.path.abspath(__file__), "--",
+               model_path, "--tiles-out", tile_dir, "--quality", quality,
+               "--angles"] + [str(a) for a in shard]
+        log_path = os.path.join(tile_dir, f"worker_{i}.log")
+        with open(log_path, "w") as log:
+            procs.append((shard, log_path, subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)))
+    
+    failures = []
+    for shard, log_path, proc in procs:
+        returncode = proc.wait()
+        missing = [a for a in shard if not os.path.exists(os.path.join(tile_dir, f"tile_{a:03d}.npy"))]
+        if returncode == 0 and not missing:
+            os.remove(log_path)
+            continue
+        failures.append(f"exit code {returncode}, missing angles {missing} (log: {log_path})")
+        print(f"  Preview worker for angles {shard} failed: exit code {returncode}, "
+              f"{len(missing)} tile(s) missing. Last lines of {log_path}:")
+        print_log_tail(log_path)
+    if failures:
+        raise RuntimeError("Preview workers failed: " + "; ".join(failures))
+    
+    tiles = []
+    for angle in angles:
+        path = os.path.join(tile_dir, f"tile_{angle:03d}.npy")
+        tiles.append((angle, np.load(path)))
+        os.remove(path)
+    return tiles
+
+
+def print_log_tail(log_path, num_lines=LOG_TAIL_LINES):
+    with open(log_path, "r", errors="replace") as f:
+        for line in f.readlines()[-num_lines:]:
+            print(f"    | {line.rstrip()}")
+
+
+def save_tiles(tiles, tile_dir):
+    """Worker side of render_tiles_parallel."""
+    import numpy as np
+    os.makedirs(tile_dir, exist_ok=True)
+    for angle, tile in tiles:
+        np.save(os.path.join(tile_dir, f"tile_{angle:03d}.npy"), tile)
+
+
+def create_preview_grid(model_path, video_folder, factory_reset=True,
+                        num_angles=NUM_ANGLES, cols=None, workers=1, quality="final"):
+    """Create a grid of preview images at different angles."""
+    import importlib.util
+    if importlib.util.find_spec("numpy") is None or importlib.util.find_spec("PIL") is None:
         print("ERROR: numpy and PIL required. Install with:")
         print("  pip install numpy pillow")
         return None
@@ -161,69 +317,46 @@ def create_preview_grid(model_path, video_folder):
     print(f"\nGenerating angle previews for: {model_name}")
     print("=" * 50)
     
-    # Setup scene
-    center, radius, cam_obj = setup_scene(model_path)
-    
-    # Render at each angle
-    preview_images = []
-    angles = [i * (360 // NUM_ANGLES) for i in range(NUM_ANGLES)]
-    
-    for angle in angles:
-        output_path = os.path.join(preview_dir, f"{model_name}_{angle:03d}.png")
-        print(f"  Rendering angle {angle}°...")
-        render_at_angle(center, radius, cam_obj, angle, output_path)
-        preview_images.append((angle, output_path))
-    
-    # Create grid image
-    images = [Image.open(path) for _, path in preview_images]
-    
-    # 4x3 grid for 12 angles
-    cols, rows = 4, 3
-    grid_width = cols * PREVIEW_SIZE
-    grid_height = rows * PREVIEW_SIZE
-    grid = Image.new('RGBA', (grid_width, grid_height), (255, 255, 255, 255))
+    # Render every angle, keeping the tiles in memory
+    angles = preview_angle_list(num_angles)
+    if workers > 1:
+        tile_dir = os.path.join(preview_dir, f"{model_name}_tiles")
+        tiles = render_tiles_parallel(model_path, angles, workers, tile_dir, quality)
+        try:
+            os.rmdir(tile_dir)
+        except OSError:
+            pass
+    else:
+        tiles = render_tiles(model_path, angles, factory_reset=factory_reset, quality=quality)
     
-    from PIL import ImageDraw, ImageFont
     print("  Creating preview grid...")
-    
-    for i, (angle, img) in enumerate(zip(angles, images)):
-        row = i // cols
-        col = i % cols
-        x = col * PREVIEW_SIZE
-        y = row * PREVIEW_SIZE
-        
-        # Paste image
-        grid.paste(img, (x, y))
-        
-        # Add angle label with larger text
-        draw = ImageDraw.Draw(grid)
-        label = f"{angle}°"
-        
-        # Try to use a larger font
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-        except:
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 36)
-            except:
-                font = ImageFont.load_default()
-        
-        # Larger label background
-        draw.rectangle([x, y, x + 80, y + 50], fill=(0, 0, 0, 220))
-        draw.text((x + 10, y + 8), label, fill=(255, 255, 0), font=font)  # Yellow text
+    grid = compose_grid(tiles, cols)
     
     grid_path = os.path.join(preview_dir, f"{model_name}_grid.png")
     grid.save(grid_path)
     print(f"\n✓ Preview grid saved: {grid_path}")
     print(f"  Open this image to pick the best starting angle!")
     
-    # Clean up individual images
-    for _, path in preview_images:
-        os.remove(path)
-    
     return grid_path
 
 
+def parse_args(argv):
+    """GLB path, optional angle to save, and grid options."""
+    import argparse
+    parser = argparse.ArgumentParser(prog="preview_angles.py")
+    parser.add_argument("glb")
+    parser.add_argument("angle", nargs="?", default=None)
+    parser.add_argument("--num-angles", type=int, default=NUM_ANGLES)
+    parser.add_argument("--cols", type=int, default=None, help="grid columns (default: near-square)")
+    parser.add_argument("--workers", type=int, default=1, help="Blender processes to render angles with")
+    parser.add_argument("--quality", choices=list(QUALITY_TIERS), default="final",
+                        help="draft: fewer samples, smaller tiles, no shadows")
+    # Internal: used by render_tiles_parallel for its worker processes
+    parser.add_argument("--tiles-out", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--angles", type=int, nargs="+", default=None, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
 def main():
     # Get GLB path from command line args (after --)
     argv = sys.argv
@@ -242,7 +375,8 @@ def main():
         print("ERROR: Please provide a GLB file path")
         return
     
-    glb_path = argv[0]
+    args = parse_args(argv)
+    glb_path = args.glb
     if not os.path.isabs(glb_path):
         glb_path = os.path.join(SCRIPT_DIR, glb_path)
     
@@ -258,10 +392,15 @@ def main():
     config_file = get_config_file(video_folder)
     preview_dir = get_preview_dir(video_folder)
     
+    # Worker process of a parallel preview: render our angles and exit
+    if args.tiles_out:
+        save_tiles(render_tiles(glb_path, args.angles, quality=args.quality), args.tiles_out)
+        return
+    
     # If angle is provided, save it directly
-    if len(argv) >= 2:
+    if args.angle is not None:
         try:
-            angle = int(argv[1])
+            angle = int(args.angle)
             config = load_config(config_file)
             config[model_name] = angle
             save_config(config, config_file)
@@ -271,7 +410,8 @@ def main():
             pass
     
     # Generate preview grid
-    create_preview_grid(glb_path, video_folder)
+    create_preview_grid(glb_path, video_folder, num_angles=args.num_angles,
+                        cols=args.cols, workers=args.workers, quality=args.quality)
     
     print("\n" + "=" * 50)
     print("NEXT STEPS:")
@@ -0,0 +1,210 @@
+"""
+Content-addressed cache of turntable renders.
+
+A render is keyed by the SHA-256 of the GLB file plus the render parameters
+(resolution, frame count, camera, fps, azimuth offset, ...). Outputs are
+copied into the cache under their key; a later run with the same key copies
+them back instead of starting Blender's renderer. An index file tracks
+sizes and last use so the cache can be kept under a size limit (LRU).
+Several renderer processes may share the cache: every index update takes a
+file lock and re-reads the index, so concurrent stores merge instead of
+overwriting each other.
+
+Inspect / trim the cache:
+    python render_cache.py --list
+    python render_cache.py --max-size-mb 2000
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+# -------- CONFIG ----------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".render_cache")
+MAX_CACHE_MB = 5000
+# --------------------------
+
+INDEX_NAME = "index.json"
+LOCK_NAME = "index.lock"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """SHA-256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(model_path, params):
+    """Key for a render: GLB content hash + JSON-normalized render params."""
+    h = hashlib.sha256()
+    h.update(file_sha256(model_path).encode())
+    h.update(json.dumps(params, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _same_file(src, dst):
+    """Cheap identity check for files we copied with copy2 (size + mtime)."""
+    if not os.path.exists(dst):
+        return False
+    a, b = os.stat(src), os.stat(dst)
+    return a.st_size == b.st_size and int(a.st_mtime) == int(b.st_mtime)
+
+
+class RenderCache:
+    """Cache directory of <key>/<output files> plus an index.json."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_size_mb=MAX_CACHE_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.index_path = os.path.join(cache_dir, INDEX_NAME)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        return {}
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    @contextmanager
+    def _locked(self):
+        """Hold the cache lock with a freshly read index; the index is saved on exit."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, LOCK_NAME), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.index = self._load_index()
+                yield
+                self._save_index()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def lookup(self, key):
+        """Index entry for key if all its files are still present, else None."""
+        # Another process may have stored it since; os.replace keeps the file whole
+        self.index = self._load_index()
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        for name in entry["files"].values():
+            if not os.path.exists(os.path.join(self.cache_dir, key, name)):
+                return None
+        return entry
+
+    def restore(self, key, output_dir):
+        """Copy cached outputs for key into output_dir. Returns the restored paths, or None on miss."""
+        with self._locked():
+            entry = self.lookup(key)
+            if entry is None:
+                return None
+            restored = []
+            for name in entry["files"].values():
+                src = os.path.join(self.cache_dir, key, name)
+                dst = os.path.join(output_dir, name)
+                if not _same_file(src, dst):
+                    shutil.copy2(src, dst)
+                restored.append(dst)
+            entry["last_used"] = time.time()
+        return restored
+
+    def store(self, key, model_name, params, output_paths, since=None):
+        """
+        Copy freshly rendered outputs ({kind: path}) into the cache and evict old
+        entries. Refuses (returns False) if an output is missing or, with since
+        (a time.time() taken before rendering), older than since: a stale video
+        left from an earlier run must not be cached under the new key.
+        """
+        stale = [path for path in output_paths.values()
+                 if not os.path.exists(path) or (since is not None and os.path.getmtime(path) < since)]
+        if stale:
+            print(f"  Cache: not storing {model_name}, missing or stale outputs: "
+                  f"{', '.join(os.path.basename(p) for p in stale)}")
+            return False
+
+        with self._locked():
+            entry_dir = os.path.join(self.cache_dir, key)
+            os.makedirs(entry_dir, exist_ok=True)
+            files, size = {}, 0
+            for kind, path in output_paths.items():
+                name = os.path.basename(path)
+                shutil.copy2(path, os.path.join(entry_dir, name))
+                files[kind] = name
+                size += os.path.getsize(path)
+            now = time.time()
+            self.index[key] = {
+                "model": model_name,
+                "params": params,
+                "files": files,
+                "size": size,
+                "created": now,
+                "last_used": now,
+            }
+            self._evict(self.max_bytes)
+        return True
+
+    def total_size(self):
+        return sum(entry["size"] for entry in self.index.values())
+
+    def evict(self, max_bytes=None):
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        with self._locked():
+            return self._evict(self.max_bytes if max_bytes is None else max_bytes)
+
+    def _evict(self, max_bytes):
+        # Entry directories missing from the index (e.g. lost by an older,
+        # unlocked writer) are never looked up again: remove them first
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path) and name not in self.index:
+                shutil.rmtree(path, ignore_errors=True)
+        evicted = []
+        for key in sorted(self.index, key=lambda k: self.index[k]["last_used"]):
+            if self.total_size() <= max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            evicted.append(self.index.pop(key)["model"])
+        for model in evicted:
+            print(f"  Cache: evicted {model}")
+        return evicted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the render cache.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--list", action="store_true", help="list cached renders")
+    parser.add_argument("--max-size-mb", type=float, default=None, help="evict down to this size")
+    args = parser.parse_args()
+
+    cache = RenderCache(args.cache_dir)
+    if args.max_size_mb is not None:
+        cache.evict(int(args.max_size_mb * 1024 * 1024))
+    if args.list or args.max_size_mb is None:
+        for key, entry in sorted(cache.index.items(), key=lambda kv: -kv[1]["last_used"]):
+            used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))
+            print(f"  {key[:12]}  {entry['size'] / 1e6:8.1f} MB  {used}  {entry['model']}")
+        print(f"{len(cache.index)} entries, {cache.total_size() / 1e6:.1f} MB in {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Render all GLBs of a video folder in parallel headless Blender processes.
+
+The GLB list is sharded across N workers; each worker runs
+scene_render_bpyrenderer.py on its shard with its own temp dir and log,
+and the launcher sums the processed/failed counts the workers print.
+
+Usage:
+    python render_launcher.py video2 --workers 3
+    python render_launcher.py video2 --workers 3 --blender /path/to/blender
+
+A stand-in worker (anything accepting the same args as the render script)
+can replace Blender, e.g. to test scheduling:
+    python render_launcher.py video2 --worker-cmd "python3 fake_worker.py --"
+"""
+
+import argparse
+import os
+import re
+import shlex
+import subprocess
+import sys
+import time
+from glob import glob
+
+# -------- CONFIG ----------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RENDER_SCRIPT = os.path.join(SCRIPT_DIR, "scene_render_bpyrenderer.py")
+MAC_BLENDER = "/Applications/Blender.app/Contents/MacOS/Blender"
+DEFAULT_WORKERS = 2
+# --------------------------
+
+DONE_RE = re.compile(r"Done! Processed (\d+)/(\d+) models\.")
+ERROR_RE = re.compile(r"ERROR processing (.+?): ")
+
+
+def default_blender():
+    """Blender executable: $BLENDER, the macOS app bundle, or `blender` on PATH."""
+    if os.environ.get("BLENDER"):
+        return os.environ["BLENDER"]
+    if os.path.exists(MAC_BLENDER):
+        return MAC_BLENDER
+    return "blender"
+
+
+def blender_worker_cmd(blender=None):
+    """Command prefix that runs the render script headless; script args follow."""
+    return [blender or default_blender(), "--background", "--python", RENDER_SCRIPT, "--"]
+
+
+def shard_files(paths, num_workers):
+    """
+    Split paths into at most num_workers shards of roughly equal total size.
+    Largest files are placed first, each into the currently lightest shard.
+    """
+    num_workers = max(1, min(num_workers, len(paths)))
+    shards = [[] for _ in range(num_workers)]
+    loads = [0] * num_workers
+    for path in sorted(paths, key=lambda p: (-os.path.getsize(p), p)):
+        i = loads.index(min(loads))
+        shards[i].append(path)
+        loads[i] += os.path.getsize(path)
+    return [shard for shard in shards if shard]
+
+
+def parse_worker_log(log_path):
+    """Return (processed, total, failed_paths) from a worker log; None counts if it never finished."""
+    processed = total = None
+    failed = []
+    if not os.path.exists(log_path):
+        return processed, total, failed
+    with open(log_path, "r", errors="replace") as f:
+        for line in f:
+            m = ERROR_RE.search(line)
+            if m:
+                failed.append(m.group(1))
+            m = DONE_RE.search(line)
+            if m:
+                processed, total = int(m.group(1)), int(m.group(2))
+    return processed, total, failed
+
+
+def start_worker(worker_cmd, video_folder, models, temp_dir, log_path):
+    """Launch one worker on a shard, with stdout/stderr going to log_path."""
+    os.makedirs(temp_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    cmd = list(worker_cmd) + [video_folder, "--models"] + [os.path.basename(m) for m in models]
+    cmd += ["--temp-dir", temp_dir]
+    log = open(log_path, "w")
+    proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, cwd=SCRIPT_DIR)
+    proc.log_file = log
+    return proc
+
+
+def run_parallel(video_folder, num_workers=DEFAULT_WORKERS, worker_cmd=None):
+    """Render every GLB in video_folder across num_workers processes; returns summary dict."""
+    input_dir = os.path.join(SCRIPT_DIR, video_folder)
+    output_dir = os.path.join(input_dir, "bpyrenderer_output")
+    glb_files = sorted(glob(os.path.join(input_dir, "*.glb")))
+    if not glb_files:
+        print(f"No GLB files found in {input_dir}")
+        return None
+
+    worker_cmd = worker_cmd or blender_worker_cmd()
+    shards = shard_files(glb_files, num_workers)
+    print(f"Rendering {len(glb_files)} models from {video_folder} with {len(shards)} workers")
+
+    start = time.time()
+    workers = []
+    for i, shard in enumerate(shards):
+        temp_dir = os.path.join(output_dir, f"worker_{i}_tmp")
+        log_path = os.path.join(output_dir, "worker_logs", f"worker_{i}.log")
+        print(f"  worker {i}: {', '.join(os.path.basename(m) for m in shard)}")
+        print(f"    log: {log_path}")
+        workers.append((i, shard, temp_dir, log_path,
+                        start_worker(worker_cmd, video_folder, shard, temp_dir, log_path)))
+
+    processed = 0
+    failed = []
+    for i, shard, temp_dir, log_path, proc in workers:
+        returncode = proc.wait()
+        proc.log_file.close()
+        done, total, errors = parse_worker_log(log_path)
+        if done is None:
+            # Crashed before the summary line: treat the whole shard as failed
+            print(f"  worker {i}: exited with code {returncode} before finishing (see {log_path})")
+            failed.extend(shard)
+        else:
+            processed += done
+            failed.extend(errors)
+            print(f"  worker {i}: processed {done}/{total} (exit code {returncode})")
+        try:
+            os.rmdir(temp_dir)
+        except OSError:
+            pass
+
+    elapsed = time.time() - start
+    print(f"\n{'='*60}")
+    print(f"Done! Processed {processed}/{len(glb_files)} models "
+          f"with {len(workers)} workers in {elapsed:.1f}s.")
+    for path in failed:
+        print(f"  FAILED: {os.path.basename(path)}")
+    print(f"Output directory: {output_dir}")
+    print(f"{'='*60}")
+    return {"processed": processed, "total": len(glb_files), "failed": failed, "elapsed": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel turntable rendering of a video folder.")
+    parser.add_argument("video_folder", nargs="?", default="video1")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"number of Blender processes (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--blender", default=None, help="Blender executable")
+    parser.add_argument("--worker-cmd", default=None,
+                        help="stand-in worker command prefix, receives the render script's args")
+    args = parser.parse_args()
+
+    worker_cmd = shlex.split(args.worker_cmd) if args.worker_cmd else blender_worker_cmd(args.blender)
+    summary = run_parallel(args.video_folder, args.workers, worker_cmd)
+    if summary is None or summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
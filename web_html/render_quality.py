@@ -0,0 +1,91 @@
+"""
+Render quality tiers shared by the preview and turntable scripts.
+
+"final" keeps the current look (EEVEE defaults: 64 samples, shadows on,
+full resolution). "draft" is for angle picking and layout mockups: fewer
+samples, half resolution, no shadows, so proxies render several times faster.
+A draft turntable can be upscaled afterwards for quick website mockups:
+
+    python render_quality.py upscale draft_rgb.mp4 mockup_rgb.mp4 --size 1024
+"""
+
+import argparse
+import subprocess
+import sys
+
+QUALITY_TIERS = {
+    "final": {"samples": 64, "scale": 1.0, "shadows": True},
+    "draft": {"samples": 8, "scale": 0.5, "shadows": False},
+}
+
+
+def get_tier(quality):
+    if quality not in QUALITY_TIERS:
+        raise ValueError(f"Unknown quality tier: {quality} (expected one of {list(QUALITY_TIERS)})")
+    return QUALITY_TIERS[quality]
+
+
+def scaled_size(width, height, quality):
+    """Render resolution for a tier, rounded to even sizes for H.264."""
+    scale = get_tier(quality)["scale"]
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+def apply_quality(scene, quality):
+    """Set EEVEE samples and shadows on a bpy scene (resolution is left to the caller)."""
+    import bpy
+    tier = get_tier(quality)
+    eevee = scene.eevee
+    eevee.taa_render_samples = tier["samples"]
+    if hasattr(eevee, "use_shadows"):  # EEVEE Next (4.2+)
+        eevee.use_shadows = tier["shadows"]
+    if not tier["shadows"]:
+        if hasattr(eevee, "use_raytracing"):
+            eevee.use_raytracing = False
+        for light in bpy.data.lights:
+            light.use_shadow = False
+
+
+def quality_from_argv(argv=None, default="final"):
+    """Read `--quality <tier>` from the args after "--" (for scripts without an arg parser)."""
+    argv = sys.argv if argv is None else argv
+    args = argv[argv.index("--") + 1:] if "--" in argv else []
+    if "--quality" in args and args.index("--quality") + 1 < len(args):
+        return args[args.index("--quality") + 1]
+    return default
+
+
+def upscale_video(src, dst, width, height=None, crf=18):
+    """Upscale a draft video with ffmpeg's lanczos scaler. Returns True on success."""
+    height = height or width
+    cmd = [
+        "ffmpeg", "-i", src,
+        "-vf", f"scale={width}:{height}:flags=lanczos",
+        "-c:v", "libx264", "-crf", str(crf), "-pix_fmt", "yuv420p",
+        "-y", dst,
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"ERROR: {result.stderr}")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quality tier helpers.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("upscale", help="upscale a draft turntable video")
+    p.add_argument("src")
+    p.add_argument("dst")
+    p.add_argument("--size", type=int, default=1024, help="output width (and height unless --height)")
+    p.add_argument("--height", type=int, default=None)
+    args = parser.parse_args()
+
+    if upscale_video(args.src, args.dst, args.size, args.height):
+        print(f"Upscaled: {args.dst}")
+    else:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Render every videoN folder in one run, with a job queue and resume.
+
+Discovers web_html/video* folders (and their rotation_config_videoN.json),
+builds one (folder, model) job per GLB and dispatches the jobs to a pool of
+headless Blender workers. Finished jobs are recorded in a state file, so an
+interrupted run picks up where it stopped.
+
+Usage:
+    python render_scheduler.py --workers 3
+    python render_scheduler.py --workers 3 --folders video2 video5
+    python render_scheduler.py --retry-failed      # also re-run jobs that failed last time
+    python render_scheduler.py --reset             # forget previous progress
+"""
+
+import argparse
+import json
+import os
+import shlex
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from glob import glob
+
+from formatting import format_duration, natural_key
+from render_launcher import blender_worker_cmd, parse_worker_log, start_worker
+
+# -------- CONFIG ----------
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = os.path.join(SCRIPT_DIR, "render_jobs_state.json")
+DEFAULT_WORKERS = 2
+# --------------------------
+
+
+def discover_jobs(folders=None):
+    """Return the global job list: one dict per (video folder, GLB)."""
+    if not folders:
+        folders = [os.path.basename(d) for d in glob(os.path.join(SCRIPT_DIR, "video*"))
+                   if os.path.isdir(d)]
+    jobs = []
+    for folder in sorted(folders, key=natural_key):
+        config_file = os.path.join(SCRIPT_DIR, f"rotation_config_{folder}.json")
+        glb_files = sorted(glob(os.path.join(SCRIPT_DIR, folder, "*.glb")))
+        if glb_files and not os.path.exists(config_file):
+            print(f"  WARNING: {folder} has no {os.path.basename(config_file)}, default angles will be used")
+        for path in glb_files:
+            model = os.path.basename(path)
+            jobs.append({
+                "id": f"{folder}/{model}",
+                "folder": folder,
+                "model": model,
+                "rotation_config": config_file if os.path.exists(config_file) else None,
+            })
+    return jobs
+
+
+def load_state(state_file=STATE_FILE):
+    """Load {job_id: record} from the state file."""
+    if os.path.exists(state_file):
+        with open(state_file, "r") as f:
+            return json.load(f)
+    return {}
+
+
+def save_state(state, state_file=STATE_FILE):
+    """Write the state file atomically so a crash never leaves it half-written."""
+    tmp = state_file + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, state_file)
+
+
+class WorkerRegistry:
+    """Worker processes currently running, so an interrupted schedule can stop them."""
+
+    def __init__(self):
+        self.procs = set()
+        self.stopped = False
+        self._lock = threading.Lock()
+
+    def start(self, *args):
+        """start_worker(*args), unless stop() was called; returns the process or None."""
+        with self._lock:
+            if self.stopped:
+                return None
+            proc = start_worker(*args)
+            self.procs.add(proc)
+            return proc
+
+    def finished(self, proc):
+        with self._lock:
+            self.procs.discard(proc)
+
+    def stop(self):
+        """Refuse new workers and terminate the running ones."""
+        with self._lock:
+            self.stopped = True
+            procs = list(self.procs)
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+
+
+def run_job(job, worker_cmd, registry=None):
+    """Render one model in its own worker process; returns (ok, elapsed, log_path)."""
+    output_dir = os.path.join(SCRIPT_DIR, job["folder"], "bpyrenderer_output")
+    name = os.path.splitext(job["model"])[0]
+    temp_dir = os.path.join(output_dir, f"job_{name}_tmp")
+    log_path = os.path.join(output_dir, "worker_logs", f"{name}.log")
+
+    start = time.time()
+    args = (worker_cmd, job["folder"], [job["model"]], temp_dir, log_path)
+    proc = registry.start(*args) if registry is not None else start_worker(*args)
+    if proc is None:
+        raise RuntimeError("schedule stopped")
+    proc.wait()
+    proc.log_file.close()
+    if registry is not None:
+        registry.finished(proc)
+    processed, _, _ = parse_worker_log(log_path)
+    try:
+        os.rmdir(temp_dir)
+    except OSError:
+        pass
+    return processed == 1, time.time() - start, log_path
+
+
+def run_schedule(jobs, num_workers=DEFAULT_WORKERS, worker_cmd=None,
+                 state_file=STATE_FILE, retry_failed=False):
+    """
+    Dispatch pending jobs to the worker pool, updating the state file as they finish.
+    On Ctrl-C (or any other exception) queued jobs are cancelled, running workers
+    are terminated and the state is saved before re-raising; the interrupted jobs
+    stay pending for the next run.
+    """
+    worker_cmd = worker_cmd or blender_worker_cmd()
+    state = load_state(state_file)
+    skip = {"done", "failed"} if not retry_failed else {"done"}
+    pending = [job for job in jobs if state.get(job["id"], {}).get("status") not in skip]
+
+    print(f"{len(jobs)} jobs total, {len(jobs) - len(pending)} already finished, "
+          f"{len(pending)} to run with {num_workers} workers")
+    if not pending:
+        return state
+
+    start = time.time()
+    finished = 0
+    registry = WorkerRegistry()
+    pool = ThreadPoolExecutor(max_workers=max(1, num_workers))
+    try:
+        futures = {pool.submit(run_job, job, worker_cmd, registry): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                ok, elapsed, log_path = future.result()
+            except Exception as e:
+                ok, elapsed, log_path = False, 0.0, None
+                print(f"ERROR launching {job['id']}: {e}")
+            state[job["id"]] = {
+                "status": "done" if ok else "failed",
+                "elapsed": round(elapsed, 1),
+                "log": log_path,
+                "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            save_state(state, state_file)
+
+            finished += 1
+            wall = time.time() - start
+            jobs_per_hour = finished / wall * 3600 if wall > 0 else 0.0
+            eta = (len(pending) - finished) * wall / finished
+            status = "done" if ok else "FAILED"
+            print(f"[{finished}/{len(pending)}] {status} {job['id']} ({elapsed:.0f}s) | "
+                  f"{jobs_per_hour:.1f} jobs/h | ETA {format_duration(eta)}")
+    except BaseException:
+        # Don't start the queued jobs, stop the running ones, keep what finished
+        pool.shutdown(wait=False, cancel_futures=True)
+        registry.stop()
+        pool.shutdown(wait=True)
+        save_state(state, state_file)
+        print(f"\nInterrupted after {finished}/{len(pending)} jobs; state saved to {state_file}. "
+              f"Re-run to resume.")
+        raise
+    pool.shutdown(wait=True)
+
+    done = sum(1 for job in jobs if state.get(job["id"], {}).get("status") == "done")
+    failed = [job["id"] for job in jobs if state.get(job["id"], {}).get("status") == "failed"]
+    print(f"\n{'='*60}")
+    print(f"Done! {done}/{len(jobs)} jobs complete in {format_duration(time.time() - start)}.")
+    for job_id in failed:
+        print(f"  FAILED: {job_id}")
+    print(f"State file: {state_file}")
+    print(f"{'='*60}")
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all video folders with resume.")
+    parser.add_argument("--folders", nargs="+", default=None,
+                        help="only these video folders (default: every video* folder)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"concurrent Blender processes (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--blender", default=None, help="Blender executable")
+    parser.add_argument("--worker-cmd", default=None,
+                        help="stand-in worker command prefix, receives the render script's args")
+    parser.add_argument("--state-file", default=STATE_FILE)
+    parser.add_argument("--retry-failed", action="store_true", help="re-run jobs that failed before")
+    parser.add_argument("--reset", action="store_true", help="discard the state file first")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(args.state_file):
+        os.remove(args.state_file)
+
+    jobs = discover_jobs(args.folders)
+    if not jobs:
+        print(f"No GLB files found in any video folder under {SCRIPT_DIR}")
+        sys.exit(1)
+
+    worker_cmd = shlex.split(args.worker_cmd) if args.worker_cmd else blender_worker_cmd(args.blender)
+    state = run_schedule(jobs, args.workers, worker_cmd, args.state_file, args.retry_failed)
+    if any(state.get(job["id"], {}).get("status") != "done" for job in jobs):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
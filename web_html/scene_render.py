@@ -1,18 +1,28 @@
 import bpy
 import math
 import os
+import sys
 from mathutils import Vector
 
+# Make sibling helper modules importable when run via `blender --python`
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from camera_path import camera_info, camera_metadata, orbit_poses, save_metadata, write_camera_fcurves
+from geometry import scene_bounds
+from render_quality import apply_quality, get_tier, quality_from_argv
+
 # -------- CONFIG (change per GLB) ----------
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 GLB_PATH = os.path.join(SCRIPT_DIR, "video1/SceneGen-latest.glb")
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, "video1/scenegen.mp4")
+META_PATH = os.path.splitext(OUTPUT_PATH)[0] + "_meta.json"
 FRAME_COUNT = 240    # 10s @24fps
 FPS = 24
 
 CAMERA_DISTANCE_FACTOR = 2.5
 CAMERA_HEIGHT_FACTOR = 0.6
 START_ANGLE = 0.0    # radians; 0 means starting on -Y axis
+CAMERA_PATH = "circle"  # "circle", "helix" or "sweep" (see camera_path.py)
+QUALITY = quality_from_argv()  # "final" or "draft": blender --python scene_render.py -- --quality draft
 # ------------------------------------------
 
 def clear_scene():
@@ -23,33 +33,10 @@ def import_glb(path):
     return bpy.context.scene
 
 def compute_bbox_center_radius(scene):
-    mesh_objs = [o for o in scene.objects if o.type == 'MESH']
-    if not mesh_objs:
-        raise RuntimeError("No meshes found.")
-
-    min_corner = Vector((1e9, 1e9, 1e9))
-    max_corner = Vector((-1e9, -1e9, -1e9))
-
-    for obj in mesh_objs:
-        for v in obj.bound_box:
-            w = obj.matrix_world @ Vector(v)
-            min_corner.x = min(min_corner.x, w.x)
-            min_corner.y = min(min_corner.y, w.y)
-            min_corner.z = min(min_corner.z, w.z)
-            max_corner.x = max(max_corner.x, w.x)
-            max_corner.y = max(max_corner.y, w.y)
-            max_corner.z = max(max_corner.z, w.z)
-
-    center = (min_corner + max_corner) / 2.0
-    radius = (max_corner - min_corner).length / 2.0
-    return center, radius
+    bounds = scene_bounds(scene.objects)
+    return Vector(bounds["center"]), bounds["radius"]
 
 def setup_orbit_camera(scene, center, radius):
-    # target empty
-    target = bpy.data.objects.new("TurntableTarget", None)
-    scene.collection.objects.link(target)
-    target.location = center
-
     # camera
     cam_data = bpy.data.cameras.new("TurntableCam")
     cam_obj = bpy.data.objects.new("TurntableCam", cam_data)
@@ -64,41 +51,49 @@ def setup_orbit_camera(scene, center, radius):
     scene.frame_end   = FRAME_COUNT
     scene.render.fps  = FPS
 
-    # Track-to so camera always looks at target
-    track = cam_obj.constraints.new(type='TRACK_TO')
-    track.target = target
-    track.track_axis = 'TRACK_NEGATIVE_Z'
-    track.up_axis = 'UP_Y'
-
-    # Animate camera position on a circle
-    for f in range(scene.frame_start, scene.frame_end + 1):
-        t = (f - scene.frame_start) / (scene.frame_end - scene.frame_start)
-        angle = START_ANGLE + 2.0 * math.pi * t  # 0..2π
-
-        x = center.x + distance * math.cos(angle)
-        y = center.y + distance * math.sin(angle)
-        z = center.z + height
-
-        cam_obj.location = (x, y, z)
-        cam_obj.keyframe_insert("location", frame=f)
-
-    return cam_obj
-
-def setup_render(scene):
-    scene.render.filepath = OUTPUT_PATH
+    # All poses at once, looking at the center, keyed in bulk
+    poses = orbit_poses(
+        CAMERA_PATH,
+        FRAME_COUNT,
+        radius=math.hypot(distance, height),
+        elevation=math.degrees(math.atan2(height, distance)),
+        azimuth_start=math.degrees(START_ANGLE),
+        center=tuple(center),
+    )
+    write_camera_fcurves(cam_obj, poses, frame_start=scene.frame_start)
+
+    return cam_obj, poses
+
+def setup_render(scene, output_path=None):
+    scene.render.filepath = output_path or OUTPUT_PATH
     scene.render.engine = 'BLENDER_EEVEE_NEXT'
     scene.render.image_settings.file_format = 'FFMPEG'
     scene.render.ffmpeg.format = 'MPEG4'
     scene.render.ffmpeg.codec = 'H264'
     scene.render.ffmpeg.constant_rate_factor = 'HIGH'
     scene.render.ffmpeg.ffmpeg_preset = 'GOOD'
+    scene.render.resolution_percentage = int(get_tier(QUALITY)["scale"] * 100)
+    apply_quality(scene, QUALITY)
+
+def render_turntable(glb_path=GLB_PATH, output_path=OUTPUT_PATH, factory_reset=True):
+    """Render one GLB's turntable to output_path (+ <output>_meta.json). Returns the metadata path."""
+    if factory_reset:
+        clear_scene()
+    scene = import_glb(glb_path)
+    center, radius = compute_bbox_center_radius(scene)
+    cam_obj, poses = setup_orbit_camera(scene, center, radius)
+    setup_render(scene, output_path)
+    pct = scene.render.resolution_percentage / 100
+    model_name = os.path.splitext(os.path.basename(glb_path))[0]
+    meta_path = os.path.splitext(output_path)[0] + "_meta.json"
+    save_metadata(camera_metadata(int(scene.render.resolution_x * pct), int(scene.render.resolution_y * pct),
+                                  model_name, poses, camera_info(cam_obj)), meta_path)
+
+    # Render the animation
+    bpy.ops.render.render(animation=True)
+    return meta_path
 
 # ---------- run for this GLB ----------
-clear_scene()
-scene = import_glb(GLB_PATH)
-center, radius = compute_bbox_center_radius(scene)
-setup_orbit_camera(scene, center, radius)
-setup_render(scene)
-
-# Render the animation
-bpy.ops.render.render(animation=True)
+# (blender_worker.py imports this module and calls render_turntable per job)
+if __name__ == "__main__":
+    render_turntable()
@@ -6,41 +6,117 @@ user_site = os.path.expanduser("~/.local/lib/python3.11/site-packages")
 if user_site not in sys.path:
     sys.path.insert(0, user_site)
 
+# Make sibling helper modules importable when run via `blender --python`
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
 import json
+import time
 from glob import glob
 
-import imageio
-import numpy as np
-
 import bpy
 from bpyrenderer import SceneManager
 from bpyrenderer.camera import add_camera
-from bpyrenderer.camera.layout import get_camera_positions_on_sphere
 from bpyrenderer.environment import set_background_color
 from bpyrenderer.importer import load_file
 from bpyrenderer.render_output import enable_color_output
 
+from camera_path import camera_info, camera_metadata, orbit_poses, save_metadata, write_camera_fcurves
+from compositor import WhiteCompositor, peak_rss_mb
+from frame_capture import (
+    CAPTURE_MODES,
+    PNG_CHECK_TOLERANCE,
+    STANDARD_VIEW,
+    BlenderFrameCapture,
+    load_raw_frame,
+)
+from frame_pipeline import (
+    OUTPUT_KINDS,
+    OUTPUT_SUFFIXES,
+    FrameOutputs,
+    assemble_video,
+    chain_frames,
+    completed_frames,
+    encode_frames,
+    missing_ranges,
+)
+from packed_meta import PACKED_SUFFIX, save_packed
+from render_cache import RenderCache, cache_key
+from render_quality import QUALITY_TIERS, apply_quality, scaled_size, upscale_video
+from sprite_atlas import ATLAS_FORMATS, INDEX_SUFFIX, AtlasWriter, atlas_files
+
 # -------- CONFIG ----------
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+def parse_script_args(args_after=None):
+    """
+    Parse args after "--":
+      blender --python script.py -- video2
+      blender --python script.py -- video2 --models a.glb b.glb --temp-dir /tmp/w0
+    """
+    import argparse
+    if args_after is None:
+        args_after = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="scene_render_bpyrenderer.py")
+    parser.add_argument("video_folder", nargs="?", default="video1")
+    parser.add_argument("--models", nargs="+", default=None,
+                        help="only render these GLB files (basenames), e.g. one launcher shard")
+    parser.add_argument("--temp-dir", default=None,
+                        help="where per-model temp frame folders go (default: output dir)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render even if the render cache has a matching entry")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report which models would be rendered or reused from cache")
+    parser.add_argument("--capture", choices=CAPTURE_MODES, default="png",
+                        help="png: frames via PNG files (default); memory: hand rendered pixels "
+                             "straight to the encoder; spill: raw .npy frames on disk. memory and "
+                             "spill switch colour management to the Standard view, so their colours "
+                             "differ from png renders under Blender's default view")
+    parser.add_argument("--quality", choices=list(QUALITY_TIERS), default="final",
+                        help="draft: fewer samples, half resolution, no shadows "
+                             "(written to bpyrenderer_output_draft)")
+    parser.add_argument("--upscale", action="store_true",
+                        help="with --quality draft, upscale the RGB video to full size for mockups")
+    parser.add_argument("--outputs", nargs="+", choices=OUTPUT_KINDS, default=["rgb"],
+                        help="videos to write in the same frame pass: rgb (_rgb.mp4), "
+                             "mask (_mask.mp4), webm (transparent _rgba.webm), lossless "
+                             "(FFV1 _rgb_ffv1.mkv for combine_videos.py --source lossless)")
+    parser.add_argument("--resume", action="store_true",
+                        help="keep complete frames left in temp_<model> by an interrupted run "
+                             "and only render the missing cameras")
+    parser.add_argument("--packed-meta", action="store_true",
+                        help="also write <model>_meta.bin (memory-mappable float32 cameras, "
+                             "see packed_meta.py) next to the _meta.json")
+    parser.add_argument("--atlas", action="store_true",
+                        help="also pack the composited frames into sprite-sheet pages "
+                             "<model>_atlas_N.jpg + <model>_atlas.json (see sprite_atlas.py)")
+    parser.add_argument("--atlas-size", type=int, default=256, help="atlas tile width in px")
+    parser.add_argument("--atlas-stride", type=int, default=1, help="pack every Nth frame into the atlas")
+    parser.add_argument("--atlas-format", choices=list(ATLAS_FORMATS), default="jpeg")
+    return parser.parse_args(args_after)
+
 
-# Get video folder from command line: blender --python script.py -- video2
-VIDEO_FOLDER = "video1"  # default
-if "--" in sys.argv:
-    args_after = sys.argv[sys.argv.index("--") + 1:]
-    if args_after:
-        VIDEO_FOLDER = args_after[0]
+# Imported as a module (e.g. by blender_worker.py): use defaults, not the host's argv
+SCRIPT_ARGS = parse_script_args(None if __name__ == "__main__" else [])
+VIDEO_FOLDER = SCRIPT_ARGS.video_folder
 
 INPUT_DIR = os.path.join(SCRIPT_DIR, VIDEO_FOLDER)
-OUTPUT_DIR = os.path.join(SCRIPT_DIR, VIDEO_FOLDER, "bpyrenderer_output")
-TEMP_RENDER_DIR = os.path.join(OUTPUT_DIR, "temp_frames")
+QUALITY = SCRIPT_ARGS.quality
+OUTPUT_DIR = os.path.join(SCRIPT_DIR, VIDEO_FOLDER,
+                          "bpyrenderer_output" if QUALITY == "final" else f"bpyrenderer_output_{QUALITY}")
+TEMP_RENDER_DIR = SCRIPT_ARGS.temp_dir or OUTPUT_DIR
 ROTATION_CONFIG_FILE = os.path.join(SCRIPT_DIR, f"rotation_config_{VIDEO_FOLDER}.json")
 
-WIDTH, HEIGHT = 1024, 1024
+FULL_WIDTH, FULL_HEIGHT = 1024, 1024
+WIDTH, HEIGHT = scaled_size(FULL_WIDTH, FULL_HEIGHT, QUALITY)
 
 NUM_FRAMES = 120  # frames for 360° rotation
 ELEVATION = 15    # camera elevation angle in degrees
 FPS = 24
 CAMERA_RADIUS = 1.8  # Distance from center (1.5 = close, 2.0 = far, gives more "padding")
+CAMERA_PATH = "circle"  # "circle", "helix" or "sweep" (see camera_path.py)
+COMPOSITE_MODE = "fixed"  # "fixed" (integer, reused buffers) or "float" (reference)
+DECODE_WORKERS = 4        # threads decoding PNGs ahead of the encoder
+FRAME_QUEUE_DEPTH = 8     # max frames buffered between decode/composite/encode
 # --------------------------
 
 
@@ -110,7 +186,140 @@ def setup_vertex_color_materials():
             obj.data.materials.append(mat)
 
 
-def render_single_model(model_path, output_dir, rotation_config):
+def render_params(azimuth_offset):
+    """Everything besides the GLB itself that changes the rendered outputs (cache key)."""
+    params = {
+        "width": WIDTH,
+        "height": HEIGHT,
+        "num_frames": NUM_FRAMES,
+        "elevation": ELEVATION,
+        "camera_radius": CAMERA_RADIUS,
+        "camera_path": CAMERA_PATH,
+        "fps": FPS,
+        "azimuth_offset": azimuth_offset,
+        "outputs": sorted(SCRIPT_ARGS.outputs),
+        "quality": QUALITY,
+        "upscale": SCRIPT_ARGS.upscale and QUALITY != "final",
+        "packed_meta": SCRIPT_ARGS.packed_meta,
+        "atlas": [SCRIPT_ARGS.atlas_size, SCRIPT_ARGS.atlas_stride, SCRIPT_ARGS.atlas_format]
+                 if SCRIPT_ARGS.atlas else None,
+    }
+    # memory/spill render with the Standard view; png keeps the scene's own (and its keys)
+    if SCRIPT_ARGS.capture != "png":
+        params["view"] = STANDARD_VIEW
+    return params
+
+
+def output_paths(output_dir, model_name):
+    """Requested video outputs for a model: {kind: path}."""
+    return {
+        kind: os.path.join(output_dir, f"{model_name}{OUTPUT_SUFFIXES[kind]}")
+        for kind in SCRIPT_ARGS.outputs
+    }
+
+
+def frame_callback(outputs, atlas=None):
+    """on_frame for the pipeline: extra videos and/or atlas packing from the same frame."""
+    return chain_frames(outputs.write_extra if outputs.has_extra else None,
+                        atlas.add if atlas is not None else None)
+
+
+def render_missing_frames(scene_manager, temp_dir, num_frames):
+    """Render only cameras whose render_NNNN.png is missing or truncated in temp_dir."""
+    scene = bpy.context.scene
+    frame_start, frame_end = scene.frame_start, scene.frame_end
+    done = completed_frames(temp_dir, first_frame=frame_start)
+    ranges = missing_ranges(done, num_frames)
+    
+    if not ranges:
+        print(f"  Resume: all {num_frames} frames already rendered")
+        return
+    todo = sum(end - start + 1 for start, end in ranges)
+    print(f"  Resume: {len(done)}/{num_frames} frames on disk, rendering {todo} missing")
+    
+    # The camera path is keyed per frame, so rendering sub-ranges
+    # produces the same render_NNNN.png files as a full pass would
+    try:
+        for start, end in ranges:
+            scene.frame_start = frame_start + start
+            scene.frame_end = frame_start + end
+            scene_manager.render()
+    finally:
+        scene.frame_start, scene.frame_end = frame_start, frame_end
+
+
+def render_via_png(scene_manager, temp_dir, num_frames, video_paths, compositor, atlas=None):
+    """Render frames to render_NNNN.png, then decode/composite/encode them. Returns False if none."""
+    # 6. Set render outputs
+    enable_color_output(
+        WIDTH,
+        HEIGHT,
+        temp_dir,
+        mode="PNG",
+        film_transparent=True,
+    )
+    
+    # 7. Render all frames (or, when resuming, only the ones not on disk yet)
+    if SCRIPT_ARGS.resume:
+        render_missing_frames(scene_manager, temp_dir, num_frames)
+    else:
+        scene_manager.render()
+    
+    # 8. Convert rendered PNGs to the requested videos
+    render_files = sorted(glob(os.path.join(temp_dir, "render_*.png")))
+    if not render_files:
+        return False
+    
+    # Decode PNGs ahead on a thread pool while the writers encode in order
+    with FrameOutputs(video_paths, FPS, HEIGHT, WIDTH) as outputs:
+        assemble_video(
+            render_files,
+            outputs.rgb,
+            compositor,
+            decode_workers=DECODE_WORKERS,
+            queue_depth=FRAME_QUEUE_DEPTH,
+            on_frame=frame_callback(outputs, atlas),
+        )
+    return True
+
+
+def render_via_capture(temp_dir, num_frames, video_paths, compositor, atlas=None):
+    """Render frames into memory (or raw .npy spill files) without any PNG round-trip."""
+    capture = BlenderFrameCapture(WIDTH, HEIGHT)
+    
+    # One frame through both paths: the in-memory conversion must match a PNG render
+    diff = capture.check_against_png(temp_dir)
+    print(f"  Capture check vs PNG: max difference {diff} levels"
+          f"{'' if diff <= PNG_CHECK_TOLERANCE else ' -- WARNING: colours differ, use --capture png'}")
+    
+    if SCRIPT_ARGS.capture == "memory":
+        with FrameOutputs(video_paths, FPS, HEIGHT, WIDTH) as outputs:
+            encode_frames(
+                capture.frames(num_frames),
+                outputs.rgb,
+                compositor,
+                on_frame=frame_callback(outputs, atlas),
+            )
+        return num_frames > 0
+    
+    # Spill: raw frames hit the disk but are memory-mapped back, not decoded
+    spill_files = capture.spill(temp_dir, num_frames)
+    if not spill_files:
+        return False
+    with FrameOutputs(video_paths, FPS, HEIGHT, WIDTH) as outputs:
+        assemble_video(
+            spill_files,
+            outputs.rgb,
+            compositor,
+            decode=load_raw_frame,
+            decode_workers=DECODE_WORKERS,
+            queue_depth=FRAME_QUEUE_DEPTH,
+            on_frame=frame_callback(outputs, atlas),
+        )
+    return True
+
+
+def render_single_model(model_path, output_dir, rotation_config, temp_root=None):
     """Render a single GLB model and output rgb/mask videos + metadata."""
     
     model_name = get_model_name(model_path)
@@ -122,7 +331,7 @@ def render_single_model(model_path, output_dir, rotation_config):
     print(f"{'='*60}")
     
     # Create temp directory for frames
-    temp_dir = os.path.join(output_dir, f"temp_{model_name}")
+    temp_dir = os.path.join(temp_root or output_dir, f"temp_{model_name}")
     os.makedirs(temp_dir, exist_ok=True)
     
     # 1. Init engine and scene manager
@@ -160,55 +369,48 @@ def render_single_model(model_path, output_dir, rotation_config):
     if bg_node:
         bg_node.inputs["Strength"].default_value = 0.5  # Ambient light strength
     
-    # 5. Prepare cameras on sphere (with per-model rotation offset)
+    # 4c. Samples / shadows for the selected quality tier
+    apply_quality(bpy.context.scene, QUALITY)
+    
+    # 5. Prepare the orbit camera path (with per-model rotation offset)
     # Use the user's selected angle directly as the starting azimuth
     total_azimuth_offset = azimuth_offset
     print(f"  Using azimuth offset: {azimuth_offset}°")
     
-    cam_pos, cam_mats, elevations, azimuths = get_camera_positions_on_sphere(
-        center=(0, 0, 0),
+    # bpyrenderer's sphere layout started 90° before the offset; keep that so
+    # existing rotation configs still pick the same first view
+    poses = orbit_poses(
+        CAMERA_PATH,
+        NUM_FRAMES,
         radius=CAMERA_RADIUS,
-        elevations=[ELEVATION],
-        num_camera_per_layer=NUM_FRAMES,
-        azimuth_offset=total_azimuth_offset,
+        elevation=ELEVATION,
+        azimuth_start=total_azimuth_offset - 90,
     )
+    num_cameras = len(poses["matrices"])
     
-    cameras = []
-    for i, camera_mat in enumerate(cam_mats):
-        camera = add_camera(camera_mat, add_frame=i < len(cam_mats) - 1)
-        cameras.append(camera)
+    # One camera animated along the whole path instead of a camera per frame
+    scene = bpy.context.scene
+    camera = add_camera(poses["matrices"][0], add_frame=False)
+    scene.camera = camera
+    scene.frame_end = scene.frame_start + num_cameras - 1
+    write_camera_fcurves(camera, poses, frame_start=scene.frame_start)
     
-    # 6. Set render outputs
-    enable_color_output(
-        WIDTH,
-        HEIGHT,
-        temp_dir,
-        mode="PNG",
-        film_transparent=True,
-    )
-    
-    # 7. Render all frames
-    scene_manager.render()
+    # 6-8. Render frames and encode the requested videos in one pass
+    video_paths = output_paths(output_dir, model_name)
+    compositor = WhiteCompositor(HEIGHT, WIDTH, mode=COMPOSITE_MODE)
+    atlas = None
+    if SCRIPT_ARGS.atlas:
+        atlas = AtlasWriter(os.path.join(output_dir, model_name), num_cameras, WIDTH, HEIGHT,
+                            SCRIPT_ARGS.atlas_size, SCRIPT_ARGS.atlas_stride, SCRIPT_ARGS.atlas_format,
+                            fps=FPS, model=model_name)
+    if SCRIPT_ARGS.capture == "png":
+        rendered = render_via_png(scene_manager, temp_dir, num_cameras, video_paths, compositor, atlas)
+    else:
+        rendered = render_via_capture(temp_dir, num_cameras, video_paths, compositor, atlas)
     
-    # 8. Convert rendered PNGs to RGB video
-    render_files = sorted(glob(os.path.join(temp_dir, "render_*.png")))
-    if render_files:
-        rgb_video_path = os.path.join(output_dir, f"{model_name}_rgb.mp4")
-        
-        with imageio.get_writer(rgb_video_path, fps=FPS) as rgb_writer:
-            for file in render_files:
-                # Read RGBA image
-                image = imageio.imread(file)
-                
-                # Composite onto white background
-                white_bg = np.ones((HEIGHT, WIDTH, 3), dtype=np.uint8) * 255
-                alpha = image[:, :, 3:4] / 255.0
-                rgb_image = image[:, :, :3] * alpha + white_bg * (1 - alpha)
-                
-                rgb_writer.append_data(rgb_image.astype(np.uint8))
-                
-                # Remove intermediate PNG
-                os.remove(file)
+    delivered_size = (WIDTH, HEIGHT)
+    if rendered:
+        print(f"  Compositing mode: {COMPOSITE_MODE}, peak RSS {peak_rss_mb():.0f} MB")
         
         # Remove temp directory
         try:
@@ -216,26 +418,31 @@ def render_single_model(model_path, output_dir, rotation_config):
         except:
             pass
         
-        print(f"  RGB video: {rgb_video_path}")
-    
-    # 9. Save camera metadata
-    meta_info = {"width": WIDTH, "height": HEIGHT, "model": model_name, "locations": []}
-    for i in range(len(cam_pos)):
-        index = "{0:04d}".format(i)
-        meta_info["locations"].append({
-            "index": index,
-            "projection_type": cameras[i].data.type,
-            "ortho_scale": cameras[i].data.ortho_scale,
-            "camera_angle_x": cameras[i].data.angle_x,
-            "elevation": elevations[i],
-            "azimuth": azimuths[i],
-            "transform_matrix": cam_mats[i].tolist(),
-        })
+        # Draft mockups: bring the RGB video back to full size in place
+        if SCRIPT_ARGS.upscale and QUALITY != "final" and "rgb" in video_paths:
+            upscaled = video_paths["rgb"] + ".upscaled.mp4"
+            if upscale_video(video_paths["rgb"], upscaled, FULL_WIDTH, FULL_HEIGHT):
+                os.replace(upscaled, video_paths["rgb"])
+                delivered_size = (FULL_WIDTH, FULL_HEIGHT)
+                print(f"  Upscaled to {FULL_WIDTH}x{FULL_HEIGHT}")
+        
+        for kind, path in video_paths.items():
+            print(f"  {kind} video: {path}")
+        if atlas is not None:
+            print(f"  Atlas: {atlas.close()} ({len(atlas.pages)} page(s))")
     
+    # 9. Save camera metadata: width/height are the delivered RGB video's size,
+    # render_width/render_height what Blender rendered (they differ after --upscale)
+    meta_info = camera_metadata(*delivered_size, model_name, poses, camera_info(camera))
+    if delivered_size != (WIDTH, HEIGHT):
+        meta_info["render_width"], meta_info["render_height"] = WIDTH, HEIGHT
     meta_path = os.path.join(output_dir, f"{model_name}_meta.json")
-    with open(meta_path, "w") as f:
-        json.dump(meta_info, f, indent=4)
+    save_metadata(meta_info, meta_path)
     print(f"  Metadata: {meta_path}")
+    if SCRIPT_ARGS.packed_meta:
+        packed = os.path.join(output_dir, f"{model_name}{PACKED_SUFFIX}")
+        save_packed(meta_info, packed)
+        print(f"  Packed metadata: {packed}")
     
     return model_name
 
@@ -244,6 +451,9 @@ def render_single_model(model_path, output_dir, rotation_config):
 if __name__ == "__main__":
     # Find all GLB files
     glb_files = glob(os.path.join(INPUT_DIR, "*.glb"))
+    if SCRIPT_ARGS.models:
+        wanted = set(SCRIPT_ARGS.models)
+        glb_files = [f for f in glb_files if os.path.basename(f) in wanted]
     
     if not glb_files:
         print(f"No GLB files found in {INPUT_DIR}")
@@ -266,11 +476,36 @@ if __name__ == "__main__":
         print(f"\nNo rotation config found. Using default angles.")
         print(f"  (Create {ROTATION_CONFIG_FILE} or use preview_angles.py to set offsets)")
     
-    # Process each model
+    # Process each model (reusing cached outputs when GLB and params are unchanged)
+    cache = RenderCache()
     processed = []
     for model_path in sorted(glb_files):
         try:
-            name = render_single_model(model_path, OUTPUT_DIR, rotation_config)
+            name = get_model_name(model_path)
+            params = render_params(rotation_config.get(name, 0))
+            key = cache_key(model_path, params)
+            if not SCRIPT_ARGS.force and cache.lookup(key):
+                if SCRIPT_ARGS.dry_run:
+                    print(f"  [dry-run] cached: {name}")
+                else:
+                    cache.restore(key, OUTPUT_DIR)
+                    print(f"  Cache hit, reused outputs for: {name}")
+                processed.append(name)
+                continue
+            if SCRIPT_ARGS.dry_run:
+                print(f"  [dry-run] would render: {name}")
+                continue
+            
+            started = time.time()
+            name = render_single_model(model_path, OUTPUT_DIR, rotation_config, TEMP_RENDER_DIR)
+            cached_files = output_paths(OUTPUT_DIR, name)
+            cached_files["meta"] = os.path.join(OUTPUT_DIR, f"{name}_meta.json")
+            if SCRIPT_ARGS.packed_meta:
+                cached_files["meta_packed"] = os.path.join(OUTPUT_DIR, f"{name}{PACKED_SUFFIX}")
+            if SCRIPT_ARGS.atlas and os.path.exists(os.path.join(OUTPUT_DIR, f"{name}{INDEX_SUFFIX}")):
+                cached_files.update(atlas_files(os.path.join(OUTPUT_DIR, f"{name}{INDEX_SUFFIX}")))
+            # Only outputs written by this render go into the cache
+            cache.store(key, name, params, cached_files, since=started)
             processed.append(name)
         except Exception as e:
             print(f"ERROR processing {model_path}: {e}")
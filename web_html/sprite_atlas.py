@@ -0,0 +1,201 @@
+"""
+Turntable sprite sheets: frames packed into tiled JPEG/WebP atlases.
+
+Seeking inside an H.264 turntable is slow and imprecise for drag-to-rotate;
+with every frame (or every `stride`-th) laid out in a few texture pages the
+page can show any angle instantly by drawing one tile. Writes next to the
+videos:
+
+    <model>_atlas_0.jpg ...   pages of at most MAX_PAGE_SIZE px per side
+    <model>_atlas.json        index
+
+Kept frame k (source frame k * stride) is on page k // frames_per_page, at
+column j % columns and row j // columns with j = k % frames_per_page, i.e.
+pixel (column * tile_width, row * tile_height).
+
+AtlasWriter.add has the frame_pipeline on_frame signature, so
+scene_render_bpyrenderer.py (--atlas) packs the frames it has already
+decoded and composited. Existing renders can be packed from their videos:
+
+    python sprite_atlas.py video2 --size 256 --stride 2 --format webp
+"""
+
+import argparse
+import json
+import os
+import sys
+from glob import glob
+
+import numpy as np
+from PIL import Image
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+ATLAS_FORMATS = {"jpeg": ".jpg", "webp": ".webp"}
+ATLAS_QUALITY = {"jpeg": 85, "webp": 80}
+MAX_PAGE_SIZE = 4096  # px; the texture size every WebGL implementation handles
+INDEX_SUFFIX = "_atlas.json"
+BACKGROUND = 255      # frames are composited over white
+
+
+def atlas_layout(num_frames, frame_width, frame_height, tile_width, stride=1, max_page=MAX_PAGE_SIZE):
+    """Tile size, grid and page count for num_frames frames scaled to tile_width."""
+    tile_width = min(tile_width, max_page)
+    tile_height = max(1, round(frame_height * tile_width / frame_width))
+    frames = len(range(0, num_frames, stride))
+    columns = max(1, min(frames, max_page // tile_width))
+    rows_per_page = max(1, max_page // tile_height)
+    frames_per_page = columns * rows_per_page
+    return {
+        "source_frames": num_frames,
+        "stride": stride,
+        "frames": frames,
+        "tile_width": tile_width,
+        "tile_height": tile_height,
+        "columns": columns,
+        "rows_per_page": rows_per_page,
+        "frames_per_page": frames_per_page,
+        "num_pages": -(-frames // frames_per_page),
+    }
+
+
+class AtlasWriter:
+    """
+    Packs frames into atlas pages as they arrive; one page is in memory at a
+    time and is encoded as soon as it is full. close() writes the last page
+    and the JSON index.
+    """
+
+    def __init__(self, prefix, num_frames, frame_width, frame_height, tile_width=256,
+                 stride=1, fmt="jpeg", fps=None, model=None, max_page=MAX_PAGE_SIZE):
+        if fmt not in ATLAS_FORMATS:
+            raise ValueError(f"Unknown atlas format: {fmt} (expected one of {list(ATLAS_FORMATS)})")
+        self.prefix = prefix
+        self.fmt = fmt
+        self.layout = atlas_layout(num_frames, frame_width, frame_height, tile_width, stride, max_page)
+        self.fps = fps
+        self.model = model or os.path.basename(prefix)
+        self.pages = []
+        self._page = None
+        self._page_index = -1
+        self._page_frames = 0
+
+    @property
+    def index_path(self):
+        return self.prefix + INDEX_SUFFIX
+
+    def page_path(self, page):
+        return f"{self.prefix}_atlas_{page}{ATLAS_FORMATS[self.fmt]}"
+
+    def _page_shape(self, page):
+        layout = self.layout
+        frames = min(layout["frames_per_page"], layout["frames"] - page * layout["frames_per_page"])
+        rows = -(-frames // layout["columns"])
+        return rows * layout["tile_height"], layout["columns"] * layout["tile_width"]
+
+    def add(self, index, rgba, rgb):
+        """on_frame callback: place frame `index` (composited rgb) if it falls on the stride."""
+        layout = self.layout
+        if index % layout["stride"] or index >= layout["source_frames"]:
+            return
+        k = index // layout["stride"]
+        page, j = divmod(k, layout["frames_per_page"])
+        if page != self._page_index:
+            self._flush()
+            self._page = np.full(self._page_shape(page) + (3,), BACKGROUND, dtype=np.uint8)
+            self._page_index = page
+            self._page_frames = 0
+
+        # The pipeline reuses its rgb buffers, so the tile is resized out of it right away
+        tile = Image.fromarray(np.ascontiguousarray(rgb[:, :, :3])).resize(
+            (layout["tile_width"], layout["tile_height"]), Image.LANCZOS, reducing_gap=2.0)
+        row, col = divmod(j, layout["columns"])
+        y, x = row * layout["tile_height"], col * layout["tile_width"]
+        self._page[y:y + layout["tile_height"], x:x + layout["tile_width"]] = np.asarray(tile)
+        self._page_frames += 1
+
+    def _flush(self):
+        if self._page is None:
+            return
+        path = self.page_path(self._page_index)
+        Image.fromarray(self._page).save(path, quality=ATLAS_QUALITY[self.fmt])
+        self.pages.append({
+            "src": os.path.basename(path),
+            "width": self._page.shape[1],
+            "height": self._page.shape[0],
+            "frames": self._page_frames,
+        })
+        self._page = None
+
+    def close(self):
+        """Write the last page and the index. Returns the index path."""
+        self._flush()
+        layout = {k: v for k, v in self.layout.items() if k != "num_pages"}
+        index = {"model": self.model, "format": self.fmt, "fps": self.fps, **layout, "pages": self.pages}
+        with open(self.index_path, "w") as f:
+            json.dump(index, f, indent=2)
+        return self.index_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+
+
+def atlas_files(index_path):
+    """{kind: path} of an atlas (index + pages), e.g. for the render cache."""
+    with open(index_path) as f:
+        index = json.load(f)
+    folder = os.path.dirname(index_path)
+    files = {"atlas": index_path}
+    for i, page in enumerate(index["pages"]):
+        files[f"atlas_{i}"] = os.path.join(folder, page["src"])
+    return files
+
+
+def atlas_from_video(video_path, prefix, tile_width=256, stride=1, fmt="jpeg"):
+    """Pack an existing turntable video. Returns the index path."""
+    import imageio
+    reader = imageio.get_reader(video_path)
+    try:
+        meta = reader.get_meta_data()
+        width, height = meta["size"]
+        num_frames = reader.count_frames()
+        with AtlasWriter(prefix, num_frames, width, height, tile_width, stride, fmt,
+                         fps=meta.get("fps")) as atlas:
+            for i, frame in enumerate(reader):
+                atlas.add(i, None, frame)
+    finally:
+        reader.close()
+    return atlas.index_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack turntable videos into sprite-sheet atlases.")
+    parser.add_argument("video_folder", nargs="?", default="video1")
+    parser.add_argument("--size", type=int, default=256, help="tile width in px (height keeps the aspect)")
+    parser.add_argument("--stride", type=int, default=1, help="keep every Nth frame")
+    parser.add_argument("--format", choices=list(ATLAS_FORMATS), default="jpeg")
+    args = parser.parse_args()
+
+    output_dir = os.path.join(SCRIPT_DIR, args.video_folder, "bpyrenderer_output")
+    videos = sorted(glob(os.path.join(output_dir, "*_rgb.mp4")))
+    if not videos:
+        print(f"No *_rgb.mp4 files in {output_dir}")
+        return
+    for video in videos:
+        prefix = video[:-len("_rgb.mp4")]
+        index_path = atlas_from_video(video, prefix, args.size, args.stride, args.format)
+        with open(index_path) as f:
+            index = json.load(f)
+        total = sum(os.path.getsize(os.path.join(output_dir, p["src"])) for p in index["pages"])
+        print(f"  {os.path.basename(prefix)}: {index['frames']} frames, {len(index['pages'])} page(s) "
+              f"of {index['columns']} columns, {total / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
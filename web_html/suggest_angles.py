@@ -0,0 +1,121 @@
+"""
+Pick each model's starting angle automatically instead of eyeballing preview grids.
+
+For every GLB in the given video folders, candidate azimuths are scored either
+from cheap draft renders (silhouette area of the alpha mask) or straight from
+the geometry (projected bounding-box area), and the best angle is written to
+rotation_config_<folder>.json. One Blender run covers all folders.
+
+Usage:
+  blender --background --python suggest_angles.py --                  # all video* folders
+  blender --background --python suggest_angles.py -- video2 video5 --method bbox
+  blender --background --python suggest_angles.py -- video2 --overwrite --dry-run
+"""
+
+import sys
+import os
+
+# Add user site-packages
+user_site = os.path.expanduser("~/.local/lib/python3.11/site-packages")
+if user_site not in sys.path:
+    sys.path.insert(0, user_site)
+
+# Make sibling helper modules importable when run via `blender --python`
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+import argparse
+from glob import glob
+
+import numpy as np
+import bpy
+
+import preview_angles
+from angle_scoring import (
+    SCORING_METHODS,
+    projected_bbox_scores,
+    rank_angles,
+    silhouette_scores,
+)
+from geometry import aabb_corners, object_aabbs
+from formatting import natural_key
+
+# -------- CONFIG ----------
+DEFAULT_NUM_ANGLES = 12
+ELEVATION = 15  # degrees, as in scene_render_bpyrenderer.py
+# --------------------------
+
+
+def scene_bbox_corners():
+    """Corners of every mesh object's tight world-space box, shape (8 * n, 3)."""
+    boxes = object_aabbs(bpy.context.scene.objects)
+    if not boxes:
+        raise RuntimeError("No meshes found")
+    return np.concatenate([aabb_corners(mn, mx) for mn, mx in boxes])
+
+
+def score_model(model_path, angles, method, first):
+    """Score every candidate angle for one model; returns [(angle, score)] best first."""
+    if method == "silhouette":
+        tiles = preview_angles.render_tiles(model_path, angles, factory_reset=first, quality="draft")
+        scores = silhouette_scores(tiles)
+    else:
+        preview_angles.setup_scene(model_path, factory_reset=first, quality="draft")
+        scores = projected_bbox_scores(scene_bbox_corners(), angles, ELEVATION)
+    return rank_angles(angles, scores)
+
+
+def suggest_folder(video_folder, angles, method, overwrite=False, dry_run=False, first=True):
+    """Score all GLBs in a folder and write the winners to its rotation config."""
+    glb_files = sorted(glob(os.path.join(SCRIPT_DIR, video_folder, "*.glb")))
+    config_file = preview_angles.get_config_file(video_folder)
+    config = preview_angles.load_config(config_file)
+    changed = False
+
+    print(f"\n{video_folder}: {len(glb_files)} models")
+    for model_path in glb_files:
+        model_name = preview_angles.get_model_name(model_path)
+        if model_name in config and not overwrite:
+            print(f"  {model_name}: keeping {config[model_name]}° (use --overwrite to re-score)")
+            continue
+        try:
+            ranking = score_model(model_path, angles, method, first)
+        except Exception as e:
+            print(f"  ERROR scoring {model_name}: {e}")
+            continue
+        first = False
+        best = ranking[0][0]
+        runners_up = ", ".join(f"{a}° ({s:.3f})" for a, s in ranking[1:4])
+        print(f"  {model_name}: {best}° (score {ranking[0][1]:.3f}; next: {runners_up})")
+        config[model_name] = best
+        changed = True
+
+    if changed and not dry_run:
+        preview_angles.save_config(config, config_file)
+    return first
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="suggest_angles.py")
+    parser.add_argument("folders", nargs="*", help="video folders (default: all video* folders)")
+    parser.add_argument("--method", choices=SCORING_METHODS, default="silhouette")
+    parser.add_argument("--num-angles", type=int, default=DEFAULT_NUM_ANGLES)
+    parser.add_argument("--overwrite", action="store_true", help="re-score models that already have an angle")
+    parser.add_argument("--dry-run", action="store_true", help="print suggestions without saving")
+    args = parser.parse_args(argv)
+
+    folders = args.folders or sorted(
+        (os.path.basename(d) for d in glob(os.path.join(SCRIPT_DIR, "video*")) if os.path.isdir(d)),
+        key=natural_key,
+    )
+    angles = preview_angles.preview_angle_list(args.num_angles)
+
+    first = True
+    for folder in folders:
+        first = suggest_folder(folder, angles, args.method, args.overwrite, args.dry_run, first)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The web_html scripts are flat modules run from their own folder
+WEB_HTML_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if WEB_HTML_DIR not in sys.path:
+    sys.path.insert(0, WEB_HTML_DIR)
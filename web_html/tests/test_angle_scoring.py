@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from angle_scoring import hull_area, projected_bbox_scores, rank_angles, silhouette_scores, view_axes
+from camera_path import orbit_poses
+from formatting import natural_key
+from geometry import aabb_corners
+
+
+def mask_tile(width, height=40, size=100):
+    """RGBA tile with an opaque width x height rectangle centered on a transparent background."""
+    tile = np.zeros((size, size, 4), dtype=np.uint8)
+    top, left = (size - height) // 2, (size - width) // 2
+    tile[top:top + height, left:left + width] = 255
+    return tile
+
+
+def test_wider_silhouette_scores_higher():
+    tiles = [(0, mask_tile(20)), (30, mask_tile(60)), (60, mask_tile(40))]
+    scores = silhouette_scores(tiles)
+    assert scores == pytest.approx([0.08, 0.24, 0.16])
+    assert [angle for angle, _ in rank_angles([0, 30, 60], scores)] == [30, 60, 0]
+
+
+def test_silhouette_threshold():
+    tile = mask_tile(50)
+    tile[:, :50, 3] //= 2  # left half of the silhouette semi-transparent (127)
+    assert silhouette_scores([(0, tile)]) == pytest.approx([0.1])
+    assert silhouette_scores([(0, tile)], threshold=100) == pytest.approx([0.2])
+    assert silhouette_scores([(0, np.zeros((8, 8, 4), dtype=np.uint8))]) == [0.0]
+
+
+def test_hull_area():
+    square = np.array([[0, 0], [2, 0], [2, 2], [0, 2], [1, 1], [0.5, 1.5]], dtype=float)
+    assert hull_area(square[:, 0], square[:, 1]) == pytest.approx(4.0)
+    triangle = np.array([[0, 0], [4, 0], [0, 3]], dtype=float)
+    assert hull_area(triangle[:, 0], triangle[:, 1]) == pytest.approx(6.0)
+    line = np.array([[0, 0], [1, 1], [2, 2]], dtype=float)
+    assert hull_area(line[:, 0], line[:, 1]) == 0.0
+
+
+def test_view_axes_match_the_orbit_camera():
+    angles = [0, 45, 130, 270]
+    right, up = view_axes(angles, elevation_deg=15.0)
+    poses = orbit_poses("circle", 8, radius=1.0, elevation=15.0)
+    mats = poses["matrices"][[0, 1]]
+    np.testing.assert_allclose(right[:2], mats[:, :3, 0], atol=1e-12)
+    np.testing.assert_allclose(up[:2], mats[:, :3, 1], atol=1e-12)
+    np.testing.assert_allclose(np.einsum("ij,ij->i", right, up), 0.0, atol=1e-12)
+
+
+def test_long_side_faces_the_best_bbox_angle():
+    # A box 4 long in X, 1 deep in Y: seen side-on (camera on the Y axis) it is widest
+    corners = aabb_corners(np.array([-2.0, -0.5, 0.0]), np.array([2.0, 0.5, 1.0]))
+    angles = [0, 90, 180, 270]
+    scores = projected_bbox_scores(corners, angles, elevation_deg=0.0)
+    assert scores == pytest.approx([1.0, 4.0, 1.0, 4.0])
+    assert rank_angles(angles, scores)[0] == (90, pytest.approx(4.0))
+
+
+def test_rank_ties_keep_smaller_angle():
+    assert rank_angles([90, 0, 180], [0.5, 0.5, 0.2]) == [(0, 0.5), (90, 0.5), (180, 0.2)]
+
+
+def test_natural_key():
+    assert sorted(["video10", "video2", "video1", "video"], key=natural_key) == \
+        ["video", "video1", "video2", "video10"]
@@ -0,0 +1,110 @@
+import socket
+import sys
+import threading
+
+import pytest
+
+import blender_worker
+from blender_worker import WorkerClient, WorkerServer, launch_worker, stub_handlers
+
+
+@pytest.fixture
+def stub_server():
+    """Stub WorkerServer on a free port in a thread; its reset counts calls."""
+    resets = []
+    server = WorkerServer(stub_handlers(), reset=lambda: resets.append(1), port=0,
+                          info={"stub": True, "startup_s": 2.5})
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    assert server.ready.wait(5)
+    yield server, resets
+    if server.running:
+        with WorkerClient(port=server.port, timeout=5) as client:
+            client.submit("shutdown")
+    thread.join(5)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_ping_reports_info(stub_server):
+    server, resets = stub_server
+    with WorkerClient(port=server.port, timeout=5) as client:
+        response = client.submit("ping")
+    assert response["ok"] and response["id"] == 2
+    assert response["result"] == {"stub": True, "startup_s": 2.5}
+    assert not resets
+
+
+def test_jobs_reset_before_each(stub_server):
+    server, resets = stub_server
+    with WorkerClient(port=server.port, timeout=5) as client:
+        preview = client.submit("preview", glb="a/model.glb")
+        render = client.submit("render", folder="video2", model="m.glb", num_frames=60)
+        scene = client.submit("scene", glb="video1/s.glb")
+    assert preview["ok"] and preview["result"] == {"grid": "a/model_grid.png"}
+    assert render["ok"] and render["result"] == {"model": "m", "overrides": {"num_frames": 60}}
+    assert scene["ok"] and scene["result"]["video"] == "video1/s.mp4"
+    assert [r["id"] for r in (preview, render, scene)] == [2, 3, 4]
+    assert len(resets) == 3
+    assert all("reset_s" in r for r in (preview, render, scene))
+
+
+def test_error_responses_keep_the_worker_alive(stub_server):
+    server, _ = stub_server
+    with WorkerClient(port=server.port, timeout=5) as client:
+        unknown = client.submit("bake")
+        missing = client.submit("render", folder="video2")
+        after = client.submit("preview", glb="m.glb")
+    assert not unknown["ok"] and unknown["error"] == "ValueError: Unknown job type: bake"
+    assert not missing["ok"] and missing["error"].startswith("TypeError:")
+    assert "result" not in missing
+    assert after["ok"]
+
+
+def test_reset_error_is_reported():
+    def broken_reset():
+        raise RuntimeError("scene locked")
+
+    server = WorkerServer(stub_handlers(), reset=broken_reset, port=0)
+    response = server.handle({"id": 7, "type": "preview", "params": {"glb": "m.glb"}})
+    assert response == {"id": 7, "type": "preview", "ok": False,
+                        "error": "RuntimeError: scene locked", "elapsed": response["elapsed"]}
+
+
+def test_saved_seconds_uses_measured_startup(stub_server):
+    server, _ = stub_server
+    with WorkerClient(port=server.port, timeout=5) as client:
+        assert client.cold_start_s == 2.5
+        assert client.saved_seconds({"reset_s": 0.5}) == 2.0
+    with WorkerClient(port=server.port, timeout=5, cold_start_s=4.0) as client:
+        assert client.saved_seconds({"reset_s": 0.5}) == 3.5
+        assert client.saved_seconds({"reset_s": 5.0}) == 0.0
+
+
+def test_shutdown_stops_the_server(stub_server):
+    server, _ = stub_server
+    with WorkerClient(port=server.port, timeout=5) as client:
+        assert client.submit("shutdown")["ok"]
+    assert not server.running
+
+
+def test_stub_worker_process():
+    port = free_port()
+    cmd = [sys.executable, blender_worker.__file__, "--port", str(port), "serve", "--stub"]
+    proc, startup = launch_worker(cmd, port=port, timeout=30)
+    try:
+        with WorkerClient(port=port, timeout=10, cold_start_s=startup) as client:
+            assert client.info["stub"] is True
+            assert client.info["startup_s"] > 0
+            response = client.submit("render", folder="video2", model="m.glb", sleep=0)
+            assert response["ok"]
+            assert client.saved_seconds(response) > 0
+            assert client.submit("shutdown")["ok"]
+        assert proc.wait(10) == 0
+    finally:
+        if proc.poll() is None:
+            proc.kill()
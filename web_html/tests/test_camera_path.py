@@ -0,0 +1,101 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from camera_path import (PATH_KINDS, camera_metadata, compare_metadata, look_at_matrices,
+                         matrices_to_euler, orbit_angles, orbit_poses)
+
+VIDEO1_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "video1", "bpyrenderer_output")
+# video1 was rendered at radius 1.5, 15° elevation, starting 90° before each model's offset
+VIDEO1_RADIUS = 1.5
+VIDEO1_ROTATIONS = {"PartCrafter-latest": 300, "SceneGen-latest": 210, "Gen3DSR-latest": 270}
+
+
+def euler_to_matrices(euler):
+    """Rotation matrices (n, 3, 3) of XYZ Euler angles, R = Rz @ Ry @ Rx as Blender applies them."""
+    x, y, z = euler[:, 0], euler[:, 1], euler[:, 2]
+    cx, sx, cy, sy, cz, sz = np.cos(x), np.sin(x), np.cos(y), np.sin(y), np.cos(z), np.sin(z)
+    return np.stack([
+        np.stack([cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx], axis=1),
+        np.stack([sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx], axis=1),
+        np.stack([-sy, cy * sx, cy * cx], axis=1),
+    ], axis=1)
+
+
+@pytest.mark.parametrize("kind", PATH_KINDS)
+def test_frame_count_and_azimuth_step(kind):
+    elevations, azimuths = orbit_angles(kind, 120, azimuth_start=30.0)
+    assert elevations.shape == azimuths.shape == (120,)
+    assert np.degrees(azimuths[0]) == pytest.approx(30.0)
+    np.testing.assert_allclose(np.degrees(np.diff(azimuths)), 3.0)
+    # No repeated first frame: the next step would land back on the start
+    assert np.degrees(azimuths[-1] + np.diff(azimuths)[0]) == pytest.approx(30.0 + 360.0)
+
+
+def test_helix_and_sweep_elevations():
+    helix, _ = orbit_angles("helix", 11, elevation=10.0, elevation_end=40.0)
+    np.testing.assert_allclose(np.degrees(helix), np.linspace(10.0, 40.0, 11))
+    sweep, _ = orbit_angles("sweep", 40, elevation=15.0, sweep_amplitude=10.0)
+    assert np.degrees(sweep).min() == pytest.approx(5.0)
+    assert np.degrees(sweep).max() == pytest.approx(25.0)
+    with pytest.raises(ValueError):
+        orbit_angles("spiral", 10)
+
+
+@pytest.mark.parametrize("kind", PATH_KINDS)
+def test_look_at_is_orthonormal_and_faces_center(kind):
+    center = np.array([0.3, -1.2, 0.5])
+    poses = orbit_poses(kind, 48, radius=2.0, elevation=20.0, center=center)
+    rotations = poses["matrices"][:, :3, :3]
+    np.testing.assert_allclose(rotations.transpose(0, 2, 1) @ rotations, np.broadcast_to(np.eye(3), (48, 3, 3)),
+                               atol=1e-12)
+    np.testing.assert_allclose(np.linalg.det(rotations), 1.0)
+    # The camera looks down -Z at the center, with its right vector horizontal
+    to_center = center - poses["locations"]
+    to_center /= np.linalg.norm(to_center, axis=1, keepdims=True)
+    np.testing.assert_allclose(-rotations[:, :, 2], to_center, atol=1e-12)
+    np.testing.assert_allclose(rotations[:, 2, 0], 0.0, atol=1e-12)
+    np.testing.assert_allclose(poses["matrices"][:, 3], np.broadcast_to([0, 0, 0, 1], (48, 4)))
+
+
+def test_camera_sits_at_radius():
+    center = np.array([1.0, 2.0, -0.5])
+    poses = orbit_poses("sweep", 30, radius=1.8, elevation=15.0, center=center)
+    np.testing.assert_allclose(np.linalg.norm(poses["locations"] - center, axis=1), 1.8)
+    np.testing.assert_allclose(poses["locations"][:, 2] - center[2], 1.8 * np.sin(poses["elevations"]))
+
+
+def test_euler_round_trip():
+    poses = orbit_poses("helix", 90, radius=1.0, elevation=-20.0, elevation_end=60.0, turns=2.0)
+    euler = matrices_to_euler(poses["matrices"])
+    np.testing.assert_allclose(euler_to_matrices(euler), poses["matrices"][:, :3, :3], atol=1e-12)
+    # Unwrapped: no jump of more than a few degrees between consecutive frames
+    assert np.abs(np.diff(euler, axis=0)).max() < np.radians(10.0)
+
+
+def test_matrices_and_metadata_shapes():
+    mats = look_at_matrices(np.zeros(4), np.zeros(4), 2.0)
+    np.testing.assert_allclose(mats[0, :3, 3], [2.0, 0.0, 0.0])
+    info = {"projection_type": "PERSP", "ortho_scale": 1.0, "camera_angle_x": 0.69}
+    meta = camera_metadata(64, 48, "m", orbit_poses("circle", 3, 2.0), info)
+    assert (meta["width"], meta["height"], meta["model"]) == (64, 48, "m")
+    assert [loc["index"] for loc in meta["locations"]] == ["0000", "0001", "0002"]
+    assert np.asarray(meta["locations"][1]["transform_matrix"]).shape == (4, 4)
+
+
+@pytest.mark.parametrize("model,rotation", sorted(VIDEO1_ROTATIONS.items()))
+def test_matches_video1_metadata(model, rotation):
+    path = os.path.join(VIDEO1_OUTPUT, f"{model}_meta.json")
+    if not os.path.exists(path):
+        pytest.skip(f"{path} not present")
+    with open(path) as f:
+        meta_info = json.load(f)
+    poses = orbit_poses("circle", len(meta_info["locations"]), VIDEO1_RADIUS, 15.0, rotation - 90)
+    matrix_err, azimuth_err = compare_metadata(meta_info, poses)
+    assert matrix_err < 1e-6
+    assert azimuth_err < 1e-9
+    elevations = np.array([loc["elevation"] for loc in meta_info["locations"]])
+    np.testing.assert_allclose(elevations, poses["elevations"])
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+import combine_videos
+
+
+@pytest.fixture
+def folders(tmp_path, monkeypatch):
+    """video1..video3 output folders with one dummy RGB video each, under a temp SCRIPT_DIR."""
+    monkeypatch.setattr(combine_videos, "SCRIPT_DIR", str(tmp_path))
+    for name in ("video1", "video2", "video10"):
+        output_dir = tmp_path / name / "bpyrenderer_output"
+        output_dir.mkdir(parents=True)
+        (output_dir / "SceneGen-latest_rgb.mp4").write_bytes(b"")
+    return ["video1", "video2", "video10"]
+
+
+def test_find_video_folders_natural_order(folders):
+    assert combine_videos.find_video_folders() == folders
+
+
+def test_combine_all_survives_a_failing_folder(folders, monkeypatch):
+    combined = []
+
+    def fake_combine(configs, input_dir, outputs, layout, **kwargs):
+        folder = os.path.basename(os.path.dirname(input_dir))
+        if folder == "video2":
+            raise OSError("ffmpeg not executable")
+        combined.append(folder)
+        return True
+
+    monkeypatch.setattr(combine_videos, "combine_layout", fake_combine)
+    assert combine_videos.combine_all(folders, jobs=2) is False
+    assert sorted(combined) == ["video1", "video10"]
+
+
+def test_batch_exits_nonzero_on_failure(folders, monkeypatch):
+    monkeypatch.setattr(combine_videos, "check_ffmpeg", lambda: True)
+    monkeypatch.setattr(combine_videos, "combine_layout", lambda *a, **k: False)
+    monkeypatch.setattr(combine_videos, "SCRIPT_ARGS", combine_videos.parse_args(["--all"]))
+    with pytest.raises(SystemExit) as exc:
+        combine_videos.main()
+    assert exc.value.code == 1
@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from frame_capture import STANDARD_VIEW, LinearToSRGB, frame_difference, use_standard_view
+
+
+def srgb_reference(linear):
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * np.power(linear, 1 / 2.4) - 0.055)
+
+
+def test_use_standard_view_reports_changes():
+    view = SimpleNamespace(view_transform="AgX", look="AgX - Punchy", exposure=0.5, gamma=1.0)
+    previous = use_standard_view(view)
+    assert previous == {"view_transform": "AgX", "look": "AgX - Punchy", "exposure": 0.5}
+    assert vars(view) == STANDARD_VIEW
+    assert use_standard_view(view) == {}
+
+
+def test_conversion_matches_standard_view_curve():
+    h, w = 4, 64
+    rng = np.random.default_rng(0)
+    straight = rng.random((h, w, 3)).astype(np.float32)
+    alpha = rng.random((h, w, 1)).astype(np.float32)
+    alpha[0, :8] = 0.0
+    alpha[1, :8] = 1.0
+    # Blender stores premultiplied RGBA bottom-up
+    pixels = np.concatenate([straight * alpha, alpha], axis=2)[::-1]
+    converter = LinearToSRGB(h, w)
+    converter.pixels[:] = pixels.ravel()
+    out = converter.convert()
+
+    expected = np.round(255 * srgb_reference(straight)).astype(int)
+    covered = alpha[:, :, 0] > 1e-3
+    assert np.abs(out[:, :, :3].astype(int) - expected)[covered].max() <= 1
+    assert np.array_equal(out[:, :, 3], np.rint(alpha[:, :, 0] * 255).astype(np.uint8))
+    assert not out[0, :8, :3].any()
+
+
+def test_frame_difference_ignores_transparent_colour():
+    a = np.zeros((2, 2, 4), dtype=np.uint8)
+    b = a.copy()
+    b[0, 0, :3] = 200          # colour under zero alpha in both: not visible
+    assert frame_difference(a, b) == 0
+    b[1, 1] = (10, 10, 10, 255)
+    a[1, 1] = (13, 10, 10, 255)
+    assert frame_difference(a, b) == 3
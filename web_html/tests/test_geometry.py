@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+
+from geometry import aabb, aabb_corners, bounding_sphere, center_radius, merge_aabbs, transform_points
+
+
+@pytest.fixture
+def points():
+    return np.random.default_rng(3).normal(size=(257, 3)) * [2.0, 0.5, 1.0] + [1.0, -3.0, 0.25]
+
+
+@pytest.fixture
+def matrix():
+    a, b = 0.7, -1.1
+    rz = np.array([[math.cos(a), -math.sin(a), 0], [math.sin(a), math.cos(a), 0], [0, 0, 1]])
+    rx = np.array([[1, 0, 0], [0, math.cos(b), -math.sin(b)], [0, math.sin(b), math.cos(b)]])
+    m = np.eye(4)
+    m[:3, :3] = rz @ rx @ np.diag([1.5, 0.5, 2.0])
+    m[:3, 3] = [0.3, 4.0, -2.0]
+    return m
+
+
+def naive_transform(points, matrix):
+    out = []
+    for x, y, z in points:
+        out.append([sum(matrix[r][c] * v for c, v in enumerate((x, y, z, 1.0))) for r in range(3)])
+    return np.array(out)
+
+
+def naive_aabb(points):
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+    for p in points:
+        for k in range(3):
+            lo[k] = min(lo[k], p[k])
+            hi[k] = max(hi[k], p[k])
+    return np.array(lo), np.array(hi)
+
+
+def test_transform_points_matches_loop(points, matrix):
+    np.testing.assert_allclose(transform_points(points, matrix), naive_transform(points, matrix), atol=1e-12)
+    # Nested lists (e.g. a Blender Matrix converted with list()) work too
+    np.testing.assert_allclose(transform_points(points, matrix.tolist()), naive_transform(points, matrix))
+
+
+def test_aabb_matches_loop(points, matrix):
+    world = transform_points(points, matrix)
+    for got, want in zip(aabb(world), naive_aabb(world)):
+        np.testing.assert_array_equal(got, want)
+
+
+def test_merge_aabbs_matches_loop(points):
+    parts = np.array_split(points, 5)
+    merged = merge_aabbs([aabb(p) for p in parts])
+    for got, want in zip(merged, naive_aabb(points)):
+        np.testing.assert_array_equal(got, want)
+
+
+def test_bounding_sphere_matches_loop(points):
+    center, radius = bounding_sphere(points)
+    lo, hi = naive_aabb(points)
+    np.testing.assert_allclose(center, (lo + hi) / 2)
+    want = max(math.dist(p, center) for p in points)
+    assert radius == pytest.approx(want)
+
+    given = np.array([0.5, 0.5, 0.5])
+    _, radius = bounding_sphere(points, given)
+    assert radius == pytest.approx(max(math.dist(p, given) for p in points))
+
+
+def test_sphere_fits_inside_box_radius(points):
+    center, box_radius = center_radius(*aabb(points))
+    _, sphere_radius = bounding_sphere(points, center)
+    assert sphere_radius <= box_radius + 1e-12
+    corners = aabb_corners(*aabb(points))
+    assert corners.shape == (8, 3)
+    assert bounding_sphere(corners, center)[1] == pytest.approx(box_radius)
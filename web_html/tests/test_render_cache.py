@@ -0,0 +1,68 @@
+import json
+import multiprocessing
+import os
+import time
+
+from render_cache import RenderCache
+
+
+def write_outputs(folder, name, size=100):
+    paths = {}
+    for kind in ("rgb", "meta"):
+        path = os.path.join(folder, f"{name}_{kind}.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        paths[kind] = path
+    return paths
+
+
+def test_concurrent_instances_merge_entries(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first, second = RenderCache(cache_dir), RenderCache(cache_dir)
+    assert first.store("a" * 64, "A", {}, write_outputs(str(tmp_path), "A"))
+    assert second.store("b" * 64, "B", {}, write_outputs(str(tmp_path), "B"))
+
+    with open(os.path.join(cache_dir, "index.json")) as f:
+        assert set(json.load(f)) == {"a" * 64, "b" * 64}
+    assert RenderCache(cache_dir).lookup("a" * 64)["model"] == "A"
+
+
+def _store_in_process(cache_dir, folder, i):
+    key = f"{i:064d}"
+    RenderCache(cache_dir).store(key, f"model{i}", {}, write_outputs(folder, f"m{i}"))
+
+
+def test_parallel_processes_keep_every_entry(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_store_in_process, args=(cache_dir, str(tmp_path), i)) for i in range(8)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    assert len(RenderCache(cache_dir).index) == 8
+
+
+def test_eviction_respects_size_and_prunes_orphans(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    cache = RenderCache(cache_dir, max_size_mb=450 / (1024 * 1024))  # room for two 200-byte entries
+    os.makedirs(os.path.join(cache_dir, "orphan"))
+    for i in range(3):
+        cache.store(f"{i:064d}", f"m{i}", {}, write_outputs(str(tmp_path), f"m{i}"))
+        time.sleep(0.01)
+
+    assert sorted(e["model"] for e in cache.index.values()) == ["m1", "m2"]
+    assert cache.total_size() <= cache.max_bytes
+    dirs = {d for d in os.listdir(cache_dir) if os.path.isdir(os.path.join(cache_dir, d))}
+    assert dirs == set(cache.index)
+
+
+def test_store_refuses_stale_or_missing_outputs(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"))
+    outputs = write_outputs(str(tmp_path), "A")
+    since = time.time() + 10  # the outputs predate this "render"
+    assert not cache.store("a" * 64, "A", {}, outputs, since=since)
+    outputs["rgb"] = str(tmp_path / "missing_rgb.mp4")
+    assert not cache.store("a" * 64, "A", {}, outputs)
+    assert cache.lookup("a" * 64) is None
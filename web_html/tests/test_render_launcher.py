@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+
+import render_launcher
+from render_launcher import parse_worker_log, run_parallel, shard_files
+
+FAKE_WORKER = [sys.executable, os.path.join(os.path.dirname(render_launcher.__file__), "fake_worker.py"), "--"]
+
+
+def make_glbs(folder, sizes):
+    """Dummy GLB files {name: size in bytes}; returns their paths."""
+    paths = []
+    for name, size in sizes.items():
+        path = os.path.join(folder, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        paths.append(path)
+    return paths
+
+
+def test_shard_files_balances_sizes(tmp_path):
+    paths = make_glbs(tmp_path, {"a.glb": 900, "b.glb": 500, "c.glb": 400, "d.glb": 300, "e.glb": 100})
+    shards = shard_files(paths, 2)
+    assert sorted(p for shard in shards for p in shard) == sorted(paths)
+    loads = [sum(os.path.getsize(p) for p in shard) for shard in shards]
+    assert loads == [1200, 1000]
+    # Largest first, each into the lightest shard
+    assert [[os.path.basename(p) for p in shard] for shard in shards] == [["a.glb", "d.glb"],
+                                                                          ["b.glb", "c.glb", "e.glb"]]
+
+
+def test_shard_files_never_returns_empty_shards(tmp_path):
+    paths = make_glbs(tmp_path, {"a.glb": 10, "b.glb": 20})
+    assert len(shard_files(paths, 8)) == 2
+    assert shard_files(paths, 0) == [sorted(paths, key=lambda p: -os.path.getsize(p))]
+    assert shard_files([], 3) == []
+
+
+def test_parse_worker_log(tmp_path):
+    log = tmp_path / "worker_0.log"
+    log.write_text("Processing: /x/a.glb\n"
+                   "ERROR processing /x/b.glb: out of memory\n"
+                   "Done! Processed 1/2 models.\n")
+    assert parse_worker_log(str(log)) == (1, 2, ["/x/b.glb"])
+
+
+def test_parse_worker_log_unfinished(tmp_path):
+    log = tmp_path / "worker_0.log"
+    log.write_text("Processing: /x/a.glb\nSegmentation fault\n")
+    assert parse_worker_log(str(log)) == (None, None, [])
+    assert parse_worker_log(str(tmp_path / "missing.log")) == (None, None, [])
+
+
+def test_run_parallel_with_fake_worker(tmp_path):
+    paths = make_glbs(tmp_path, {"a.glb": 300, "b_fail.glb": 200, "c.glb": 100, "d.glb": 50})
+    summary = run_parallel(str(tmp_path), num_workers=2, worker_cmd=FAKE_WORKER)
+    assert summary["total"] == 4
+    assert summary["processed"] == 3
+    assert summary["failed"] == [paths[1]]
+    logs = tmp_path / "bpyrenderer_output" / "worker_logs"
+    assert sorted(os.listdir(logs)) == ["worker_0.log", "worker_1.log"]
+    # Per-worker temp dirs are cleaned up
+    assert not list((tmp_path / "bpyrenderer_output").glob("worker_*_tmp"))
+
+
+def test_run_parallel_counts_crashed_shard_as_failed(tmp_path):
+    paths = make_glbs(tmp_path, {"a.glb": 300, "b_crash.glb": 200, "c.glb": 150})
+    summary = run_parallel(str(tmp_path), num_workers=2, worker_cmd=FAKE_WORKER)
+    # Shards: [a], [b_crash, c]; the crashing worker never reaches c
+    assert summary["processed"] == 1
+    assert sorted(summary["failed"]) == sorted(paths[1:])
+
+
+def test_run_parallel_without_glbs(tmp_path):
+    assert run_parallel(str(tmp_path), worker_cmd=FAKE_WORKER) is None
+
+
+@pytest.mark.parametrize("args", [["--", "video2", "--models", "a.glb"], ["video2", "--models", "a.glb"]])
+def test_fake_worker_accepts_render_script_args(args, capsys):
+    import fake_worker
+    fake_worker.main(args + ["--temp-dir", "/tmp/w0", "--capture", "memory"])
+    assert parse_worker_log_text(capsys.readouterr().out) == (1, 1)
+
+
+def parse_worker_log_text(text):
+    m = render_launcher.DONE_RE.search(text)
+    return int(m.group(1)), int(m.group(2))
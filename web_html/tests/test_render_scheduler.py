@@ -0,0 +1,89 @@
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+import render_scheduler
+from render_scheduler import discover_jobs, load_state, run_schedule
+
+FAKE_WORKER = [sys.executable, os.path.join(os.path.dirname(render_scheduler.__file__), "fake_worker.py"), "--"]
+# Succeeds for any model, including the ones fake_worker.py fails
+PASSING_WORKER = [sys.executable, "-c", "print('Done! Processed 1/1 models.')"]
+FAILING_WORKER = [sys.executable, "-c", "import sys; sys.exit(1)"]
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    """video1 (2 models, one failing) and video2 (1 model) under a temp SCRIPT_DIR."""
+    monkeypatch.setattr(render_scheduler, "SCRIPT_DIR", str(tmp_path))
+    for folder, models in {"video1": ["a.glb", "b_fail.glb"], "video2": ["c.glb"]}.items():
+        (tmp_path / folder).mkdir()
+        for model in models:
+            (tmp_path / folder / model).write_bytes(b"\0" * 16)
+    (tmp_path / "rotation_config_video1.json").write_text("{}")
+    return tmp_path
+
+
+def statuses(state):
+    return {job_id: record["status"] for job_id, record in state.items()}
+
+
+def test_discover_jobs(tree):
+    jobs = discover_jobs()
+    assert [job["id"] for job in jobs] == ["video1/a.glb", "video1/b_fail.glb", "video2/c.glb"]
+    assert jobs[0]["rotation_config"] == str(tree / "rotation_config_video1.json")
+    assert jobs[2]["rotation_config"] is None
+
+
+def test_state_file_written(tree):
+    state_file = str(tree / "state.json")
+    state = run_schedule(discover_jobs(), 2, FAKE_WORKER, state_file)
+    assert statuses(state) == {"video1/a.glb": "done", "video1/b_fail.glb": "failed", "video2/c.glb": "done"}
+    with open(state_file) as f:
+        assert statuses(json.load(f)) == statuses(state)
+    assert os.path.exists(state["video2/c.glb"]["log"])
+
+
+def test_done_and_failed_jobs_are_skipped(tree):
+    state_file = str(tree / "state.json")
+    first = run_schedule(discover_jobs(), 2, FAKE_WORKER, state_file)
+    # Any re-run would now pass (b_fail) or fail (a, c) and rewrite its record and log
+    os.remove(first["video1/a.glb"]["log"])
+    assert run_schedule(discover_jobs(), 2, PASSING_WORKER, state_file) == first
+    assert run_schedule(discover_jobs(), 2, FAILING_WORKER, state_file) == first
+    assert not os.path.exists(first["video1/a.glb"]["log"])
+
+
+def test_retry_failed_reruns_failed_jobs(tree):
+    state_file = str(tree / "state.json")
+    first = run_schedule(discover_jobs(), 2, FAKE_WORKER, state_file)
+    assert run_schedule(discover_jobs(), 2, PASSING_WORKER, state_file)["video1/b_fail.glb"]["status"] == "failed"
+    second = run_schedule(discover_jobs(), 2, PASSING_WORKER, state_file, retry_failed=True)
+    assert statuses(second) == {"video1/a.glb": "done", "video1/b_fail.glb": "done", "video2/c.glb": "done"}
+    # Done jobs are never re-run, even with --retry-failed
+    assert second["video1/a.glb"] == first["video1/a.glb"]
+    assert second["video2/c.glb"] == first["video2/c.glb"]
+
+
+def test_interrupt_cancels_queue_and_saves_state(tree):
+    for i in range(6):
+        (tree / "video2" / f"slow_{i}.glb").write_bytes(b"\0")
+    state_file = str(tree / "state.json")
+    slow = FAKE_WORKER + ["--sleep", "3"]
+    main_thread = threading.main_thread().ident
+    timer = threading.Timer(0.5, signal.pthread_kill, (main_thread, signal.SIGINT))
+    start = time.time()
+    timer.start()
+    with pytest.raises(KeyboardInterrupt):
+        run_schedule(discover_jobs(), 2, slow, state_file)
+    timer.join()
+    # Running workers were terminated rather than waited for, queued ones never started
+    assert time.time() - start < 3
+    assert len(list(tree.glob("video*/bpyrenderer_output/worker_logs/*.log"))) == 2
+    # The state file exists; interrupted jobs are not recorded so the next run resumes them
+    assert os.path.exists(state_file)
+    assert load_state(state_file) == {}
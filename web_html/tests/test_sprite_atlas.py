@@ -0,0 +1,93 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import sprite_atlas
+from sprite_atlas import AtlasWriter, atlas_files, atlas_layout
+
+
+def frame_color(index):
+    """A distinct solid colour per source frame, far enough apart to survive JPEG/resizing."""
+    return np.array([(index * 40) % 256, (index * 90 + 60) % 256, 255 - (index * 40) % 256], dtype=np.uint8)
+
+
+def synthetic_frames(num_frames, width=64, height=48):
+    for i in range(num_frames):
+        yield i, np.broadcast_to(frame_color(i), (height, width, 3)).copy()
+
+
+def test_atlas_layout():
+    layout = atlas_layout(120, 1024, 512, 256, stride=2, max_page=1024)
+    assert layout == {
+        "source_frames": 120, "stride": 2, "frames": 60,
+        "tile_width": 256, "tile_height": 128,
+        "columns": 4, "rows_per_page": 8, "frames_per_page": 32, "num_pages": 2,
+    }
+    # Few frames: a single row no wider than needed; tiles never exceed a page
+    assert atlas_layout(3, 100, 100, 64)["columns"] == 3
+    assert atlas_layout(10, 100, 100, 8192, max_page=4096)["tile_width"] == 4096
+
+
+@pytest.mark.parametrize("fmt", ["jpeg", "webp"])
+def test_tiles_land_where_the_index_says(tmp_path, fmt):
+    # 96 px pages hold 3x3 tiles of 32 px: 23 frames at stride 2 (12 kept) spill onto a second page
+    layout = atlas_layout(23, 64, 64, 32, stride=2, max_page=96)
+    assert (layout["frames_per_page"], layout["num_pages"]) == (9, 2)
+
+    prefix = str(tmp_path / "model")
+    with AtlasWriter(prefix, 23, 64, 64, tile_width=32, stride=2, fmt=fmt, fps=30, model="model",
+                     max_page=96) as atlas:
+        for i, frame in synthetic_frames(23, 64, 64):
+            atlas.add(i, None, frame)
+
+    with open(prefix + "_atlas.json") as f:
+        index = json.load(f)
+    assert {k: index[k] for k in ("model", "format", "fps", "frames", "stride", "columns",
+                                  "tile_width", "tile_height", "frames_per_page")} == {
+        "model": "model", "format": fmt, "fps": 30, "frames": 12, "stride": 2, "columns": 3,
+        "tile_width": 32, "tile_height": 32, "frames_per_page": 9}
+    ext = sprite_atlas.ATLAS_FORMATS[fmt]
+    assert index["pages"] == [
+        {"src": f"model_atlas_0{ext}", "width": 96, "height": 96, "frames": 9},
+        {"src": f"model_atlas_1{ext}", "width": 96, "height": 32, "frames": 3},
+    ]
+
+    pages = [np.asarray(Image.open(tmp_path / page["src"]).convert("RGB")) for page in index["pages"]]
+    for page, entry in zip(pages, index["pages"]):
+        assert page.shape == (entry["height"], entry["width"], 3)
+    for k in range(index["frames"]):
+        page, j = divmod(k, index["frames_per_page"])
+        row, col = divmod(j, index["columns"])
+        y, x = row * index["tile_height"], col * index["tile_width"]
+        tile = pages[page][y:y + index["tile_height"], x:x + index["tile_width"]].astype(int)
+        # Tile centre: compression only blurs the edges between tiles
+        center = tile[4:-4, 4:-4].reshape(-1, 3).mean(axis=0)
+        np.testing.assert_allclose(center, frame_color(k * index["stride"]), atol=6)
+
+
+def test_atlas_files(tmp_path):
+    prefix = str(tmp_path / "m")
+    with AtlasWriter(prefix, 4, 64, 48, tile_width=32) as atlas:
+        for i, frame in synthetic_frames(4):
+            atlas.add(i, None, frame)
+    assert atlas_files(prefix + "_atlas.json") == {
+        "atlas": prefix + "_atlas.json",
+        "atlas_0": os.path.join(str(tmp_path), "m_atlas_0.jpg"),
+    }
+
+
+def test_failed_pass_writes_no_index(tmp_path):
+    prefix = str(tmp_path / "m")
+    with pytest.raises(RuntimeError):
+        with AtlasWriter(prefix, 4, 64, 48, tile_width=32) as atlas:
+            atlas.add(0, None, next(synthetic_frames(1))[1])
+            raise RuntimeError("render failed")
+    assert not os.path.exists(prefix + "_atlas.json")
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        AtlasWriter(str(tmp_path / "m"), 4, 64, 48, fmt="png")
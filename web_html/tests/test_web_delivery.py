@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+import web_delivery
+from web_delivery import MANIFEST_NAME, WEB_DIR, deliver_all, fit_size, plan_variants
+
+
+def write(path, data=b"x"):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def folders(tmp_path, monkeypatch):
+    """video1 (a, b) and video2 (c) sources under a temp SCRIPT_DIR; ffmpeg calls stubbed out."""
+    monkeypatch.setattr(web_delivery, "SCRIPT_DIR", str(tmp_path))
+    for folder, names in {"video1": ["a_rgb.mp4", "b_rgb.mp4"], "video2": ["c_rgb.mp4"]}.items():
+        output_dir = tmp_path / folder / "bpyrenderer_output"
+        output_dir.mkdir(parents=True)
+        for name in names:
+            write(output_dir / name, name.encode())
+
+    def remux(src, dst):
+        if os.path.basename(src) == "b_rgb.mp4":
+            raise OSError(2, "No such file or directory", "ffmpeg")
+        write(dst)
+
+    monkeypatch.setattr(web_delivery, "probe_video",
+                        lambda path: {"width": 1024, "height": 1024, "fps": 30.0, "duration": 4.0})
+    monkeypatch.setattr(web_delivery, "remux_faststart", remux)
+    monkeypatch.setattr(web_delivery, "extract_poster", lambda src, dst: write(dst))
+    monkeypatch.setattr(web_delivery, "encode_variant", lambda src, dst, *args, **kwargs: write(dst, b"v" * 2048))
+    return tmp_path
+
+
+def manifest(tmp_path, folder):
+    with open(tmp_path / folder / "bpyrenderer_output" / WEB_DIR / MANIFEST_NAME) as f:
+        return json.load(f)
+
+
+def test_failing_source_keeps_other_manifests(folders):
+    assert deliver_all(["video1", "video2"], ["720p"], jobs=2) is False
+    assert sorted(manifest(folders, "video1")["videos"]) == ["a_rgb.mp4"]
+    assert sorted(manifest(folders, "video2")["videos"]) == ["c_rgb.mp4"]
+    entry = manifest(folders, "video2")["videos"]["c_rgb.mp4"]
+    assert entry["variants"]["720p"] == {"src": "c_rgb_720p.mp4", "width": 720, "height": 720,
+                                         "maxrate_kbps": 2500, "bytes": 2048}
+
+
+def test_failed_source_is_retried_next_run(folders, monkeypatch):
+    deliver_all(["video1", "video2"], ["720p"], jobs=2)
+    done = []
+    monkeypatch.setattr(web_delivery, "remux_faststart", lambda src, dst: (done.append(os.path.basename(src)),
+                                                                           write(dst)))
+    assert deliver_all(["video1", "video2"], ["720p"], jobs=2) is True
+    assert done == ["b_rgb.mp4"]
+    assert sorted(manifest(folders, "video1")["videos"]) == ["a_rgb.mp4", "b_rgb.mp4"]
+
+
+def test_sizes_never_upscale():
+    assert fit_size(5120, 1024, (1920, 1080)) == (1920, 384)
+    assert fit_size(640, 480, (1280, 720)) == (640, 480)
+    # A small source resolves 720p and 1080p to the same size: only one variant
+    assert plan_variants({"width": 640, "height": 480}, ["720p", "1080p"]) == {"720p": (640, 480)}
@@ -0,0 +1,374 @@
+"""
+Web delivery encodes for the turntable and combined videos.
+
+The renderers and combine_videos.py write crf-18 archival MP4s with the moov
+atom at the end, so a browser has to fetch the whole file (5120x1024 for a
+combined row) before playback starts. For every *_rgb.mp4 and combined_*.mp4
+in video*/bpyrenderer_output/, this writes to bpyrenderer_output/web/:
+
+    <name>.mp4            stream-copy remux with +faststart (no re-encode)
+    <name>_720p.mp4       bitrate-capped H.264 variants (faststart, keyframes
+    <name>_1080p.mp4      every SEGMENT_SECONDS so they segment cleanly)
+    <name>_poster.jpg     first frame, for <video poster=...>
+    <name>_hls/           optional: HLS variant playlists + master.m3u8
+    <name>_dash/          optional: DASH manifest.mpd
+
+and a local manifest web/delivery.json (relative paths, sizes, source
+fingerprint). Sources are skipped while their size and mtime match the
+manifest; if only the mtime changed, the SHA-256 decides. Sources from all
+folders are encoded concurrently within a thread budget.
+
+Usage:
+    python web_delivery.py                          # every video*/bpyrenderer_output folder
+    python web_delivery.py video2 video5 --hls --dash
+    python web_delivery.py --sizes 720p --threads 16 --force
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from formatting import format_duration
+
+# -------- CONFIG ----------
+SOURCE_PATTERNS = ("*_rgb.mp4", "combined_*.mp4")
+WEB_DIR = "web"
+MANIFEST_NAME = "delivery.json"
+
+# Variants: the video is scaled down (never up) to fit max_size, with a
+# VBV cap so a slow connection never has to absorb a crf spike
+DELIVERY_SIZES = {
+    "720p": {"max_size": (1280, 720), "maxrate": 2500},   # kbit/s
+    "1080p": {"max_size": (1920, 1080), "maxrate": 5000},
+}
+DELIVERY_CRF = 23
+X264_PRESET = "medium"
+SEGMENT_SECONDS = 2
+POSTER_QUALITY = 3  # mjpeg -q:v, 2 (best) .. 31
+# --------------------------
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Faststart remux, capped web variants and posters.")
+    parser.add_argument("folders", nargs="*", help="video folders (default: every video*/bpyrenderer_output)")
+    parser.add_argument("--sizes", nargs="+", choices=list(DELIVERY_SIZES), default=list(DELIVERY_SIZES))
+    parser.add_argument("--hls", action="store_true", help="also segment the variants for HLS")
+    parser.add_argument("--dash", action="store_true", help="also segment the variants for DASH")
+    parser.add_argument("--jobs", type=int, default=None, help="concurrent encodes (default: threads // 4)")
+    parser.add_argument("--threads", type=int, default=None, help="total encoder thread budget (default: all cores)")
+    parser.add_argument("--preset", default=X264_PRESET, help=f"x264 preset (default: {X264_PRESET})")
+    parser.add_argument("--force", action="store_true", help="redo sources that are up to date")
+    return parser.parse_args(argv)
+
+
+def run_ffmpeg(args):
+    """Run ffmpeg quietly; raises with the end of stderr on failure."""
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-nostdin", *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+
+
+def probe_video(path):
+    """{"width", "height", "fps", "duration"} from `ffmpeg -i` (works without ffprobe)."""
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-i", path], capture_output=True, text=True)
+    stream = re.search(r"Stream .*Video: .*?(\d{2,5})x(\d{2,5}).*?([\d.]+) fps", result.stderr)
+    duration = re.search(r"Duration: (\d+):(\d+):([\d.]+)", result.stderr)
+    if not stream:
+        raise RuntimeError(f"Could not read video stream of {path}")
+    h, m, s = duration.groups() if duration else (0, 0, 0)
+    return {
+        "width": int(stream.group(1)),
+        "height": int(stream.group(2)),
+        "fps": float(stream.group(3)),
+        "duration": int(h) * 3600 + int(m) * 60 + float(s),
+    }
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def fingerprint(path, previous=None):
+    """Size, mtime and SHA-256 of path; the hash is reused while size and mtime match previous."""
+    st = os.stat(path)
+    if previous and previous["size"] == st.st_size and previous["mtime_ns"] == st.st_mtime_ns:
+        return dict(previous)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(path)}
+
+
+def fit_size(width, height, max_size):
+    """Largest even size with the source's aspect ratio inside max_size, never upscaling."""
+    scale = min(1.0, max_size[0] / width, max_size[1] / height)
+    return max(2, int(width * scale) // 2 * 2), max(2, int(height * scale) // 2 * 2)
+
+
+def settings_key(sizes, hls, dash, preset):
+    """Output settings as stored in the manifest (JSON round-tripped, so it compares equal to a loaded one)."""
+    settings = {"sizes": {s: DELIVERY_SIZES[s] for s in sizes}, "crf": DELIVERY_CRF, "preset": preset,
+                "segment_seconds": SEGMENT_SECONDS, "poster_quality": POSTER_QUALITY, "hls": hls, "dash": dash}
+    return json.loads(json.dumps(settings))
+
+
+def plan_variants(info, sizes):
+    """{size: (width, height)} for the requested sizes; sizes that resolve to the same resolution are dropped."""
+    plan, seen = {}, set()
+    for size in sizes:
+        dims = fit_size(info["width"], info["height"], DELIVERY_SIZES[size]["max_size"])
+        if dims not in seen:
+            seen.add(dims)
+            plan[size] = dims
+    return plan
+
+
+# -------- encodes ----------
+def remux_faststart(src, dst):
+    """Stream-copy src with the moov atom moved to the front."""
+    tmp = dst + ".part.mp4"
+    run_ffmpeg(["-i", src, "-map", "0", "-c", "copy", "-movflags", "+faststart", "-y", tmp])
+    os.replace(tmp, dst)
+
+
+def encode_variant(src, dst, dims, maxrate, threads=None, preset=X264_PRESET):
+    """Scaled, VBV-capped H.264 with a keyframe every SEGMENT_SECONDS and faststart."""
+    tmp = dst + ".part.mp4"
+    run_ffmpeg([
+        "-i", src,
+        "-vf", f"scale={dims[0]}:{dims[1]}:flags=lanczos",
+        "-c:v", "libx264", "-preset", preset, "-crf", str(DELIVERY_CRF),
+        "-maxrate", f"{maxrate}k", "-bufsize", f"{2 * maxrate}k",
+        "-pix_fmt", "yuv420p", "-profile:v", "high",
+        "-force_key_frames", f"expr:gte(t,n_forced*{SEGMENT_SECONDS})",
+        *(["-threads", str(threads)] if threads else []),
+        "-an", "-movflags", "+faststart", "-y", tmp,
+    ])
+    os.replace(tmp, dst)
+
+
+def extract_poster(src, dst):
+    tmp = dst + ".part.jpg"
+    run_ffmpeg(["-i", src, "-frames:v", "1", "-q:v", str(POSTER_QUALITY), "-y", tmp])
+    os.replace(tmp, dst)
+
+
+def segment_hls(variants, out_dir):
+    """
+    One VOD playlist per variant (stream copy) plus master.m3u8 listing them.
+    variants: [(size, path, (width, height), maxrate)]. Returns the master path.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    lines = ["#EXTM3U"]
+    for size, path, dims, maxrate in variants:
+        run_ffmpeg([
+            "-i", path, "-c", "copy", "-f", "hls",
+            "-hls_time", str(SEGMENT_SECONDS), "-hls_playlist_type", "vod",
+            "-hls_segment_filename", os.path.join(out_dir, f"{size}_%03d.ts"),
+            "-y", os.path.join(out_dir, f"{size}.m3u8"),
+        ])
+        lines += [f"#EXT-X-STREAM-INF:BANDWIDTH={maxrate * 1000},RESOLUTION={dims[0]}x{dims[1]}",
+                  f"{size}.m3u8"]
+    master = os.path.join(out_dir, "master.m3u8")
+    with open(master, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return master
+
+
+def segment_dash(variants, out_dir):
+    """All variants as representations of one adaptation set (stream copy). Returns the .mpd path."""
+    os.makedirs(out_dir, exist_ok=True)
+    cmd = []
+    for _, path, _, _ in variants:
+        cmd += ["-i", path]
+    for i in range(len(variants)):
+        cmd += ["-map", f"{i}:v"]
+    mpd = os.path.join(out_dir, "manifest.mpd")
+    run_ffmpeg([
+        *cmd, "-c", "copy", "-f", "dash",
+        "-seg_duration", str(SEGMENT_SECONDS), "-use_template", "1", "-use_timeline", "1",
+        "-adaptation_sets", "id=0,streams=v",
+        "-init_seg_name", "init_$RepresentationID$.m4s",
+        "-media_seg_name", "chunk_$RepresentationID$_$Number%03d$.m4s",
+        "-y", mpd,
+    ])
+    return mpd
+
+
+def deliver_source(src, web_dir, sizes, hls=False, dash=False, threads=None, preset=X264_PRESET):
+    """Write every delivery output of one source. Returns its manifest entry (paths relative to web_dir)."""
+    name = os.path.splitext(os.path.basename(src))[0]
+    info = probe_video(src)
+    rel = lambda path: os.path.relpath(path, web_dir)
+
+    outputs = {"faststart": os.path.join(web_dir, f"{name}.mp4"),
+               "poster": os.path.join(web_dir, f"{name}_poster.jpg")}
+    remux_faststart(src, outputs["faststart"])
+    extract_poster(src, outputs["poster"])
+
+    variants = []
+    for size, dims in plan_variants(info, sizes).items():
+        path = os.path.join(web_dir, f"{name}_{size}.mp4")
+        maxrate = DELIVERY_SIZES[size]["maxrate"]
+        encode_variant(src, path, dims, maxrate, threads, preset)
+        variants.append((size, path, dims, maxrate))
+    if variants and hls:
+        outputs["hls"] = segment_hls(variants, os.path.join(web_dir, f"{name}_hls"))
+    if variants and dash:
+        outputs["dash"] = segment_dash(variants, os.path.join(web_dir, f"{name}_dash"))
+
+    return {
+        "width": info["width"],
+        "height": info["height"],
+        "fps": info["fps"],
+        "duration": info["duration"],
+        **{key: rel(path) for key, path in outputs.items()},
+        "variants": {size: {"src": rel(path), "width": dims[0], "height": dims[1],
+                            "maxrate_kbps": maxrate, "bytes": os.path.getsize(path)}
+                     for size, path, dims, maxrate in variants},
+    }
+
+
+def outputs_exist(entry, web_dir):
+    paths = [entry[key] for key in ("faststart", "poster", "hls", "dash") if key in entry]
+    paths += [v["src"] for v in entry["variants"].values()]
+    return all(os.path.exists(os.path.join(web_dir, p)) for p in paths)
+
+
+# -------- folders ----------
+def find_sources(folder):
+    output_dir = os.path.join(SCRIPT_DIR, folder, "bpyrenderer_output")
+    paths = set()
+    for pattern in SOURCE_PATTERNS:
+        paths.update(glob(os.path.join(output_dir, pattern)))
+    return sorted(paths)
+
+
+def load_manifest(web_dir):
+    path = os.path.join(web_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(web_dir, manifest):
+    path = os.path.join(web_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def deliver_all(folders, sizes, hls=False, dash=False, jobs=None, threads=None,
+                preset=X264_PRESET, force=False):
+    """
+    Deliver every source of every folder. Up-to-date sources are skipped
+    (size + mtime, then SHA-256); the rest run concurrently, each encode with
+    its share of the thread budget. Each folder's manifest is rewritten at the end.
+    """
+    from combine_videos import thread_budget
+    settings = settings_key(sizes, hls, dash, preset)
+
+    manifests, todo, skipped = {}, [], 0
+    for folder in folders:
+        web_dir = os.path.join(SCRIPT_DIR, folder, "bpyrenderer_output", WEB_DIR)
+        manifest = load_manifest(web_dir)
+        entries = manifest.get("videos", {}) if manifest.get("settings") == settings else {}
+        sources = find_sources(folder)
+        manifests[folder] = (web_dir, {"settings": settings, "videos": {}})
+        for src in sources:
+            name = os.path.basename(src)
+            previous = entries.get(name)
+            source = fingerprint(src, previous["source"] if previous else None)
+            if (not force and previous and previous["source"]["sha256"] == source["sha256"]
+                    and outputs_exist(previous, web_dir)):
+                manifests[folder][1]["videos"][name] = {**previous, "source": source}
+                skipped += 1
+                continue
+            todo.append((folder, src, source))
+
+    if not todo:
+        print(f"All {skipped} videos up to date")
+        for web_dir, manifest in manifests.values():
+            if manifest["videos"]:
+                save_manifest(web_dir, manifest)
+        return True
+
+    num_jobs, job_threads = thread_budget(len(todo), threads, jobs)
+    print(f"{len(todo)} videos to encode ({skipped} up to date), "
+          f"{num_jobs} concurrent jobs x {job_threads} threads, preset {preset}")
+    lock = threading.Lock()
+
+    def run(job):
+        folder, src, source = job
+        web_dir = manifests[folder][0]
+        start = time.time()
+        # One failing source (ffmpeg error, missing binary, unreadable probe, ...)
+        # must not abort the batch and the manifest writes of the others
+        try:
+            os.makedirs(web_dir, exist_ok=True)
+            entry = deliver_source(src, web_dir, sizes, hls, dash, job_threads, preset)
+        except Exception as e:
+            with lock:
+                print(f"  [{folder}] FAILED {os.path.basename(src)}: {type(e).__name__}: {e}")
+            return job, None, time.time() - start
+        entry["source"] = source
+        with lock:
+            print(f"  [{folder}] {os.path.basename(src)} done in {format_duration(time.time() - start)}")
+        return job, entry, time.time() - start
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=num_jobs) as pool:
+        results = list(pool.map(run, todo))
+    wall = time.time() - start
+
+    print(f"\n{'video':48s} {'source':>9s} {'variants':>20s} {'time':>9s}")
+    ok = True
+    for (folder, src, source), entry, seconds in results:
+        label = f"{folder}/{os.path.basename(src)}"
+        if entry is None:
+            ok = False
+            print(f"{label[:48]:48s} {'FAILED':>9s}")
+            continue
+        manifests[folder][1]["videos"][os.path.basename(src)] = entry
+        variants = ", ".join(f"{s} {v['bytes'] / 1024:.0f}K" for s, v in entry["variants"].items())
+        print(f"{label[:48]:48s} {source['size'] / 1024:8.0f}K {variants:>20s} {format_duration(seconds):>9s}")
+    print(f"Total: {len(results)} videos in {format_duration(wall)}")
+
+    for web_dir, manifest in manifests.values():
+        if manifest["videos"]:
+            save_manifest(web_dir, manifest)
+    return ok
+
+
+def main():
+    args = parse_args()
+    from combine_videos import check_ffmpeg, find_video_folders
+    if not check_ffmpeg():
+        return
+    folders = args.folders or find_video_folders()
+    print("=" * 60)
+    print(f"Web delivery: {len(folders)} folders, sizes {', '.join(args.sizes)}"
+          f"{', HLS' if args.hls else ''}{', DASH' if args.dash else ''}")
+    print("=" * 60)
+    if not deliver_all(folders, args.sizes, args.hls, args.dash, args.jobs, args.threads,
+                       args.preset, args.force):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()